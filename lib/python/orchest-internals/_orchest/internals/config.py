@@ -12,6 +12,7 @@ USERDIR_PROJECTS = "/userdir/projects"
 USERDIR_ENV_IMG_BUILDS = "/userdir/.orchest/env-img-builds"
 USERDIR_JUPYTER_IMG_BUILDS = "/userdir/.orchest/jupyter-img-builds"
 USERDIR_JUPYTERLAB = "/userdir/.orchest/user-configurations/jupyterlab"
+USERDIR_SNAPSHOT_STORE = "/userdir/.orchest/snapshot-store"
 
 ALLOWED_FILE_EXTENSIONS = ["ipynb", "py", "R", "sh", "jl", "js"]
 
@@ -23,6 +24,10 @@ ORCHEST_VERSION = os.environ.get("ORCHEST_VERSION")
 DATA_DIR = "/data"
 PROJECT_DIR = "/project-dir"
 PIPELINE_FILE = "/pipeline.json"
+# Memory backed directory that is shared by the steps of a pipeline run
+# when they run in the same pod, used by the SDK to pass data through
+# memory.
+MEMORY_STORE_DIR = "/memory-store"
 PIPELINE_PARAMETERS_RESERVED_KEY = "pipeline_parameters"
 FLASK_ENV = os.environ.get("FLASK_ENV")
 CLOUD = os.environ.get("CLOUD") == "True"
@@ -101,6 +106,8 @@ TRUNCATED_UUID_LENGTH = 18
 
 # Relative to the `project_dir` path.
 LOGS_PATH = ".orchest/pipelines/{pipeline_uuid}/logs"
+DATA_PATH = ".orchest/pipelines/{pipeline_uuid}/data"
+STEP_CACHE_PATH = ".orchest/pipelines/{pipeline_uuid}/cache"
 
 WEBSERVER_LOGS = "/orchest/services/orchest-webserver/app/orchest-webserver.log"
 
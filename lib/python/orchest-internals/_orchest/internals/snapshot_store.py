@@ -0,0 +1,216 @@
+"""Content-addressed store of the files of project snapshots.
+
+A snapshot is a directory with the same structure as the project it
+was taken of, but the files in it are hardlinks to objects in the
+store, which are named after the hash of their content and mode.
+Files that are the same across snapshots, which is most of them,
+are thus only stored once.
+
+The number of links of an object is its refcount: every snapshot
+that contains the object adds a link. Removing a snapshot directory
+therefore decrements the refcounts of its objects, after which
+`collect_garbage` removes the objects that are no longer referenced.
+
+To not read every file of a project on every snapshot, the hashes of
+the files of a project are indexed by their size, mtime, ctime and
+inode, i.e. the same heuristic as git uses to detect changes. The
+ctime catches changes of the mode, which is part of the object name
+but leaves the size and mtime as they are.
+
+Note that the files in a snapshot must never be written to in place,
+since that would alter the content of an object, and, through it, all
+other snapshots that contain it. Objects are thus read-only, and runs
+never link to the files of a snapshot, see
+`_orchest.internals.utils.materialize_run_dir`.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import stat
+import subprocess
+import tempfile
+from typing import Dict, List, Tuple
+
+from _orchest.internals import config as _config
+
+logger = logging.getLogger(__name__)
+
+_OBJECTS_DIR = os.path.join(_config.USERDIR_SNAPSHOT_STORE, "objects")
+_INDEXES_DIR = os.path.join(_config.USERDIR_SNAPSHOT_STORE, "indexes")
+# Objects are written here first, away from the garbage collector.
+_TMP_DIR = os.path.join(_config.USERDIR_SNAPSHOT_STORE, "tmp")
+
+# Relative path -> (size, mtime_ns, ctime_ns, inode, object name).
+_Index = Dict[str, Tuple[int, int, int, int, str]]
+
+
+def _list_files(source: str, use_gitignore: bool) -> List[str]:
+    """Lists the paths, relative to source, to snapshot.
+
+    Uses rsync to list the files so that the top-level `.gitignore` is
+    applied in exactly the same way as `copytree` applies it.
+    Directories have a trailing `/`.
+    """
+    cmd = ["rsync", "-a", "--dry-run", "--out-format=%n"]
+    if use_gitignore and os.path.isfile(os.path.join(source, ".gitignore")):
+        cmd.append(f"--exclude-from={os.path.join(source, '.gitignore')}")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # The target doesn't exist, thus everything is listed.
+        cmd += [source.rstrip("/") + "/", os.path.join(tmp_dir, "target")]
+        output = subprocess.check_output(cmd, stderr=subprocess.DEVNULL)
+
+    return [
+        path
+        for path in output.decode().splitlines()
+        if path and path not in ["./", "."]
+    ]
+
+
+def _hash_file(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _get_object_path(name: str) -> str:
+    return os.path.join(_OBJECTS_DIR, name[:2], name)
+
+
+def _store_object(source_path: str, name: str) -> str:
+    """Stores a copy of the file under the given name, if needed.
+
+    The file is copied rather than linked, the source is a project file
+    that users write to in place. The object is read-only.
+    """
+    object_path = _get_object_path(name)
+    if os.path.exists(object_path):
+        return object_path
+
+    os.makedirs(os.path.dirname(object_path), exist_ok=True)
+    os.makedirs(_TMP_DIR, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=_TMP_DIR)
+    os.close(fd)
+    try:
+        subprocess.check_call(
+            ["cp", "--preserve=mode,timestamps", source_path, tmp_path]
+        )
+        mode = stat.S_IMODE(os.stat(tmp_path).st_mode)
+        os.chmod(tmp_path, mode & ~(stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH))
+        os.replace(tmp_path, object_path)
+    except Exception:
+        os.unlink(tmp_path)
+        raise
+    return object_path
+
+
+def _link(source_path: str, name: str, target_path: str) -> None:
+    for _ in range(2):
+        object_path = _store_object(source_path, name)
+        try:
+            os.link(object_path, target_path)
+            return
+        except FileNotFoundError:
+            # Garbage collected in between storing and linking it.
+            continue
+    raise OSError(f"Failed to link {object_path} to {target_path}.")
+
+
+def _get_index_path(source: str) -> str:
+    key = hashlib.sha256(os.path.realpath(source).encode()).hexdigest()
+    return os.path.join(_INDEXES_DIR, f"{key}.json")
+
+
+def _load_index(source: str) -> _Index:
+    try:
+        with open(_get_index_path(source), "r") as f:
+            return {path: tuple(entry) for path, entry in json.load(f).items()}
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_index(source: str, index: _Index) -> None:
+    index_path = _get_index_path(source)
+    os.makedirs(os.path.dirname(index_path), exist_ok=True)
+    # Unique, snapshots of the same source can be taken concurrently.
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(index_path))
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(index, f)
+        os.replace(tmp_path, index_path)
+    except Exception:
+        os.unlink(tmp_path)
+        raise
+
+
+def create_snapshot(source: str, target: str, use_gitignore: bool = True) -> None:
+    """Creates a snapshot of the source directory at target.
+
+    Args:
+        source: The directory to snapshot, e.g. a project directory.
+        target: The (not yet existing) directory of the snapshot.
+        use_gitignore: If True, the files matching the patterns in the
+            top-level `.gitignore` in `source` are not snapshotted.
+
+    Raises:
+        OSError if it failed to create the snapshot.
+
+    """
+    old_index = _load_index(source)
+    index: _Index = {}
+    n_new = 0
+
+    os.makedirs(target)
+    for rel_path in _list_files(source, use_gitignore):
+        source_path = os.path.join(source, rel_path)
+        target_path = os.path.join(target, rel_path)
+
+        st = os.lstat(source_path)
+        if stat.S_ISDIR(st.st_mode):
+            os.makedirs(target_path, exist_ok=True)
+        elif stat.S_ISLNK(st.st_mode):
+            os.symlink(os.readlink(source_path), target_path)
+        elif stat.S_ISREG(st.st_mode):
+            key = (st.st_size, st.st_mtime_ns, st.st_ctime_ns, st.st_ino)
+            entry = old_index.get(rel_path)
+            if entry is not None and entry[:-1] == key:
+                name = entry[-1]
+            else:
+                name = f"{_hash_file(source_path)}-{stat.S_IMODE(st.st_mode):o}"
+                n_new += 1
+            _link(source_path, name, target_path)
+            index[rel_path] = (*key, name)
+
+    _save_index(source, index)
+    logger.info(
+        f"Snapshotted {len(index)} files of {source}, {n_new} of which changed."
+    )
+
+
+def collect_garbage() -> int:
+    """Removes the objects that are no longer part of any snapshot.
+
+    Returns:
+        The number of removed objects.
+
+    """
+    removed = 0
+    try:
+        prefixes = list(os.scandir(_OBJECTS_DIR))
+    except FileNotFoundError:
+        return removed
+
+    for prefix in prefixes:
+        for entry in os.scandir(prefix.path):
+            try:
+                if entry.stat(follow_symlinks=False).st_nlink == 1:
+                    os.unlink(entry.path)
+                    removed += 1
+            except FileNotFoundError:
+                pass
+    return removed
@@ -343,6 +343,72 @@ def copytree(
         raise OSError(f"Failed to copy {source} to {target}, :{exit_code}.")
 
 
+RUN_DIR_STRATEGIES = ["copy", "reflink"]
+
+
+def materialize_run_dir(source: str, target: str, strategy: str = "reflink") -> None:
+    """Materializes the directory of a run from a (job) snapshot.
+
+    Every run gets its own directory so that it can write its own
+    pipeline file, logs and outputs, but most of the files in it are
+    never written to by a run. Instead of copying the snapshot for every
+    run the following strategies can be used:
+
+    * "copy": a regular recursive copy.
+    * "reflink": a copy in which the files share their data blocks with
+      the snapshot until they are written to, i.e. `cp --reflink=auto`.
+      On file systems without reflink support, e.g. ext4, this falls
+      back to a regular copy, thus it is always safe to use.
+
+    Hardlinking the snapshot is not an option, steps write the files of
+    the project in place, e.g. the notebook runner writes the notebook
+    of the step after every cell, which would write through to the
+    snapshot and all other runs of the job. For the same reason, the
+    files of a run directory are made writable to their owner and
+    group, the files of a snapshot might be read-only, see
+    `_orchest.internals.snapshot_store`.
+
+    Args:
+        source: The directory to materialize, e.g. a job snapshot.
+        target: The (not yet existing) directory of the run.
+        strategy: One of `RUN_DIR_STRATEGIES`.
+
+    Raises:
+        ValueError if the strategy is not known.
+        OSError if it failed to materialize the directory.
+
+    """
+    if strategy not in RUN_DIR_STRATEGIES:
+        raise ValueError(
+            f"Strategy must be one of {RUN_DIR_STRATEGIES}, found: {strategy}."
+        )
+
+    if strategy == "copy":
+        copytree(source, target)
+    else:
+        copy_cmd = ["cp", "-r", "--reflink=auto", source, target]
+        exit_code = subprocess.call(copy_cmd, stderr=subprocess.STDOUT)
+        if exit_code != 0:
+            raise OSError(f"Failed to copy {source} to {target}, :{exit_code}.")
+
+    exit_code = subprocess.call(["chmod", "-R", "ug+w", target])
+    if exit_code != 0:
+        raise OSError(f"Failed to make {target} writable, :{exit_code}.")
+
+
+def replace_file(path: str, content: str) -> None:
+    """Writes a file by replacing it instead of writing it in place.
+
+    Makes sure that writing a file doesn't write through to other files
+    that it shares its inode with, e.g. hardlinks.
+
+    """
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
 def get_userdir_relpath(path):
     return os.path.relpath(path, "/userdir")
 
@@ -32,9 +32,22 @@ class Config:
         "/project-dir/.orchest/pipelines/" + PIPELINE_UUID + "/data/{step_uuid}"
     )
 
-    # Only fill the Plasma store to 95% capacity. Otherwise the
-    # additional messages for eviction cannot be inserted. NOTE:
-    # trying to use 100% might therefore raise a MemoryError.
+    # Directory in which the output of a step is cached under the
+    # fingerprint of the step, so that the orchest-api can skip the
+    # step in later runs. The fingerprint is only set when caching is
+    # enabled in the pipeline settings.
+    STEP_CACHE_DIR = (
+        "/project-dir/.orchest/pipelines/" + PIPELINE_UUID + "/cache/{step_uuid}"
+    )
+    STEP_FINGERPRINT = os.getenv("ORCHEST_STEP_FINGERPRINT")
+
+    # Directory of the in-memory store that is shared by the steps of a
+    # pipeline run. Only set when all steps run on the same node.
+    MEMORY_STORE_DIR = os.getenv("ORCHEST_MEMORY_STORE_DIR")
+
+    # Only fill the in-memory store to 95% capacity, so that there is
+    # room for the bookkeeping of the store. NOTE: trying to use 100%
+    # might therefore raise a MemoryError.
     MAX_RELATIVE_STORE_CAPACITY = 0.95
 
     # Where all the functions will look for the plasma.sock file. Note
@@ -43,6 +56,15 @@ class Config:
     # socket to connect to the plasma store.
     STORE_SOCKET_NAME = "/project-dir/.orchest/plasma.sock"
 
+    # Default compression of data that is output, e.g. "lz4" or "zstd",
+    # see ``orchest.transfer.Compression``. Can be set for an entire
+    # project through a project environment variable.
+    DATA_PASSING_COMPRESSION = os.getenv("ORCHEST_DATA_PASSING_COMPRESSION")
+
+    # Number of seconds for which the notebook path of the Jupyter
+    # kernel is cached when resolving the UUID of the step.
+    KERNEL_NOTEBOOK_PATH_TTL = 5
+
     # For transfer.py
     IDENTIFIER_SERIALIZATION = 1
     IDENTIFIER_EVICTION = 2
@@ -50,6 +72,10 @@ class Config:
     # Separator for the metadata related to stored data, both to disk
     # and to memory.
     __METADATA_SEPARATOR__ = "; "
+    # Directory inside the data directory of a step that keeps track of
+    # the steps that have consumed its output. Keep in sync with the
+    # orchest-api.
+    _CONSUMERS_DIR_NAME = ".consumers"
     # Reserved key of the aggregated unnamed outputs list in the
     # dictionary returned by ``get_inputs()``.
     _RESERVED_UNNAMED_OUTPUTS_STR = "unnamed"
@@ -62,3 +88,7 @@ class Config:
     @classmethod
     def get_step_data_dir(cls, step_uuid):
         return cls.STEP_DATA_DIR.format(step_uuid=step_uuid)
+
+    @classmethod
+    def get_step_cache_dir(cls, step_uuid):
+        return cls.STEP_CACHE_DIR.format(step_uuid=step_uuid)
@@ -0,0 +1,202 @@
+"""Node-local in-memory store to pass data between steps.
+
+The store is a directory on a memory backed filesystem, e.g. ``tmpfs``,
+that is shared by the steps of a pipeline run. Every step gets its own
+directory inside the store which has the same layout as the data
+directory used when outputting to disk, so that the data can be memory
+mapped when it is read.
+
+Bookkeeping of the objects in the store is done through an index file.
+Concurrent access by different steps is synchronized through a lock
+file. The index is used to evict objects:
+
+* Least recently used objects are evicted when new data would otherwise
+  exceed ``Config.MAX_RELATIVE_STORE_CAPACITY`` of the store.
+* When auto eviction is enabled, an object is evicted once all its
+  consuming (child) steps have retrieved it.
+
+"""
+import contextlib
+import json
+import os
+import shutil
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+try:
+    import fcntl
+except ImportError:
+    # The store is only available on POSIX systems.
+    fcntl = None  # type: ignore
+
+from orchest.config import Config
+
+
+class MemoryStore:
+    """Handle to the in-memory store at the given path.
+
+    Args:
+        path: Path to the directory of the store.
+
+    Attributes:
+        path: See ``Args`` section.
+    """
+
+    _INDEX_FILE = "index.json"
+    _LOCK_FILE = "index.lock"
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    @classmethod
+    def get(cls) -> Optional["MemoryStore"]:
+        """Gets the store of the current step.
+
+        Returns:
+            The store if ``Config.MEMORY_STORE_DIR`` is configured and
+            exists, ``None`` otherwise. A store is only available when
+            the steps of a pipeline run share the same node and memory.
+        """
+        if (
+            fcntl is None
+            or Config.MEMORY_STORE_DIR is None
+            or not os.path.isdir(Config.MEMORY_STORE_DIR)
+        ):
+            return None
+        return cls(Config.MEMORY_STORE_DIR)
+
+    @property
+    def capacity(self) -> int:
+        """The number of bytes that can be stored in the store."""
+        stat = os.statvfs(self.path)
+        return int(stat.f_blocks * stat.f_frsize * Config.MAX_RELATIVE_STORE_CAPACITY)
+
+    def get_object_dir(self, step_uuid: str) -> str:
+        """Gets the directory containing the data of the given step."""
+        return os.path.join(self.path, step_uuid)
+
+    def put(
+        self,
+        step_uuid: str,
+        size: int,
+        consumers: List[str],
+        write: Callable[[str], None],
+    ) -> None:
+        """Puts the output data of a step in the store.
+
+        Overwrites any data previously put by the same step. To make
+        room for the data, the least recently used objects are evicted.
+
+        Args:
+            step_uuid: The UUID of the step that outputs the data.
+            size: The size of the data in bytes.
+            consumers: UUIDs of the steps that will consume the data.
+            write: Function that writes the data to the given directory.
+                It is called without holding the lock of the store, so
+                that other steps are not blocked while writing.
+
+        Raises:
+            MemoryError: If the data does not fit in the store.
+        """
+        with self._locked_index() as index:
+            self._delete(index, step_uuid)
+
+            capacity = self.capacity
+            if size > capacity:
+                raise MemoryError(
+                    f"Data of {size} bytes does not fit in the memory store with a "
+                    f"capacity of {capacity} bytes."
+                )
+
+            # Evict the least recently used objects that are not being
+            # written.
+            used = sum(entry["size"] for entry in index.values())
+            evictable = sorted(
+                (uuid for uuid, entry in index.items() if not entry["pending"]),
+                key=lambda uuid: index[uuid]["last_access"],
+            )
+            while used + size > capacity and evictable:
+                uuid = evictable.pop(0)
+                used -= index[uuid]["size"]
+                self._delete(index, uuid)
+
+            if used + size > capacity:
+                raise MemoryError(
+                    f"Data of {size} bytes does not fit in the memory store, "
+                    "other steps are writing to it."
+                )
+
+            # Reserve the capacity while writing.
+            index[step_uuid] = {
+                "size": size,
+                "last_access": time.time(),
+                "consumers": consumers,
+                "pending": True,
+            }
+
+        try:
+            write(self.get_object_dir(step_uuid))
+        except BaseException:
+            with self._locked_index() as index:
+                self._delete(index, step_uuid)
+            raise
+
+        with self._locked_index() as index:
+            if step_uuid in index:
+                index[step_uuid]["pending"] = False
+
+    def consume(self, step_uuid: str, consumer: Optional[str], evict: bool) -> None:
+        """Registers that the data of a step has been retrieved.
+
+        Args:
+            step_uuid: The UUID of the step whose data was retrieved.
+            consumer: The UUID of the step that retrieved the data.
+            evict: If ``True``, then the data is evicted once all its
+                consumers have retrieved it.
+        """
+        with self._locked_index() as index:
+            entry = index.get(step_uuid)
+            if entry is None:
+                return
+
+            entry["last_access"] = time.time()
+            if consumer in entry["consumers"]:
+                entry["consumers"].remove(consumer)
+
+            # NOTE: data that is memory mapped by a consumer stays valid
+            # after its file has been removed.
+            if evict and not entry["consumers"] and not entry["pending"]:
+                self._delete(index, step_uuid)
+
+    def _delete(self, index: Dict[str, Any], step_uuid: str) -> None:
+        index.pop(step_uuid, None)
+        shutil.rmtree(self.get_object_dir(step_uuid), ignore_errors=True)
+
+    @contextlib.contextmanager
+    def _locked_index(self) -> Iterator[Dict[str, Any]]:
+        """Yields the index while holding the lock of the store.
+
+        Changes made to the yielded index are persisted, even if an
+        exception is raised.
+        """
+        index_file = os.path.join(self.path, MemoryStore._INDEX_FILE)
+        with open(os.path.join(self.path, MemoryStore._LOCK_FILE), "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                try:
+                    with open(index_file, "r") as f:
+                        index = json.load(f)
+                except FileNotFoundError:
+                    index = {}
+
+                try:
+                    yield index
+                finally:
+                    # Also persisted on failure, since objects might
+                    # already have been removed from the store.
+                    tmp_index_file = f"{index_file}.tmp"
+                    with open(tmp_index_file, "w") as f:
+                        json.dump(index, f)
+                    os.replace(tmp_index_file, index_file)
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
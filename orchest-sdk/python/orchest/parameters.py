@@ -4,6 +4,7 @@ Handle to parameters that are stored in the corresponding pipeline
 definition file, e.g. ``pipeline.orchest``.
 
 """
+import copy
 from typing import Any, Optional, Tuple
 
 from orchest.error import StepUUIDResolveError
@@ -25,10 +26,12 @@ def get_params() -> Tuple[dict, dict]:
     Returns:
         A tuple of two elements, where the first is the parameters of
         the current step, the second is the parameters of the pipeline.
+        These are copies, modifying them does not change the values
+        returned by later calls.
     """
     pipeline = get_pipeline()
     step = _get_current_step(pipeline)
-    return step.get_params(), pipeline.get_params()
+    return copy.deepcopy(step.get_params()), copy.deepcopy(pipeline.get_params())
 
 
 def get_step_param(name: str, default: Optional[Any] = None) -> Any:
@@ -43,7 +46,7 @@ def get_step_param(name: str, default: Optional[Any] = None) -> Any:
     pipeline = get_pipeline()
     step = _get_current_step(pipeline)
     params = step.get_params()
-    return params.get(name, default)
+    return copy.deepcopy(params.get(name, default))
 
 
 def get_pipeline_param(name: str, default: Optional[Any] = None) -> Any:
@@ -57,4 +60,4 @@ def get_pipeline_param(name: str, default: Optional[Any] = None) -> Any:
     """
     pipeline = get_pipeline()
     params = pipeline.get_params()
-    return params.get(name, default)
+    return copy.deepcopy(params.get(name, default))
@@ -22,6 +22,8 @@ class PipelineStepProperties(TypedDict):
 class PipelineSettings(TypedDict):
     auto_eviction: bool
     data_passing_memory_size: str  # 1GB and similar.
+    data_retention_keep_last_n: Optional[int]
+    data_retention_max_bytes: Optional[int]
 
 
 class ServiceDefinition(TypedDict):
@@ -97,6 +99,7 @@ class Pipeline:
     def __init__(self, steps: List[PipelineStep], properties: Dict[str, Any]) -> None:
         self.steps = steps
         self.properties = properties
+        self._steps_by_uuid = {step.properties["uuid"]: step for step in steps}
 
     @classmethod
     def from_json(cls, description: PipelineDefinition) -> "Pipeline":
@@ -147,13 +150,12 @@ class Pipeline:
                 thus it cannot determine where to output data to.
 
         """
-        for step in self.steps:
-            if step.properties["uuid"] == uuid:
-                return step
-
-        raise error.StepUUIDResolveError(
-            f"Step does not exist in the pipeline with UUID: {uuid}."
-        )
+        try:
+            return self._steps_by_uuid[uuid]
+        except KeyError:
+            raise error.StepUUIDResolveError(
+                f"Step does not exist in the pipeline with UUID: {uuid}."
+            )
 
     def get_params(self) -> Dict[str, Any]:
         return self.properties.get("parameters", {})
@@ -1,19 +1,40 @@
 """Transfer mechanisms to output data and get data."""
 import json
+import mmap
 import os
 import pickle
+import shutil
+import struct
+import sys
 import warnings
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
 from enum import Enum
-from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from itertools import chain
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
 
 from orchest import error
 from orchest.config import Config
-from orchest.pipeline import Pipeline
-from orchest.utils import get_step_uuid
+from orchest.memory_store import MemoryStore
+from orchest.pipeline import PipelineStep
+from orchest.utils import get_pipeline, get_step_uuid
 
 
 class Serialization(Enum):
@@ -24,12 +45,43 @@ class Serialization(Enum):
         * ``ARROW_TABLE``
         * ``ARROW_BATCH``
         * ``PICKLE``
+        * ``PICKLE_OOB``: pickle protocol 5 where large buffers, e.g.
+          the data of NumPy arrays, are stored out-of-band so that they
+          can be memory mapped when deserializing.
+        * ``ARROW_PANDAS``: a ``pd.DataFrame`` or ``pd.Series`` that is
+          stored as an Arrow table and converted back when
+          deserializing.
+        * ``PARQUET``: a Parquet dataset, i.e. a directory of Parquet
+          files, which supports reading a subset of the columns and
+          rows without reading the entire data.
 
     """
 
     ARROW_TABLE = 0
     ARROW_BATCH = 1
     PICKLE = 2
+    PICKLE_OOB = 3
+    ARROW_PANDAS = 4
+    PARQUET = 5
+
+
+class Compression(Enum):
+    """Possible compression codecs of serialized data.
+
+    Arrow data uses Arrow IPC body compression, pickled data is wrapped
+    in a compressed frame.
+
+    Types are:
+
+        * ``NONE``
+        * ``LZ4``
+        * ``ZSTD``
+
+    """
+
+    NONE = 0
+    LZ4 = 1
+    ZSTD = 2
 
 
 _MULTIPLE_DATA_TRANSFER_CALLS_WARNING_DOCS_REFERENCE = (
@@ -115,29 +167,60 @@ def _check_data_name_validity(name: Optional[str]):
         )
 
 
-def _interpret_metadata(metadata: str) -> Tuple[str, str, str]:
+def _get_compression(compression: Optional[Any]) -> Compression:
+    """Gets the :class:`Compression` to use given a user specification.
+
+    Args:
+        compression: Either a member of :class:`Compression`, its name
+            (case insensitive) or ``None``, in which case
+            ``Config.DATA_PASSING_COMPRESSION`` is used.
+
+    Raises:
+        ValueError: If the specified compression is not supported.
+    """
+    if compression is None:
+        compression = Config.DATA_PASSING_COMPRESSION
+        if compression is None:
+            return Compression.NONE
+
+    if isinstance(compression, Compression):
+        return compression
+
+    if isinstance(compression, str) and compression.upper() in Compression.__members__:
+        return Compression[compression.upper()]
+
+    raise ValueError(
+        f"Unsupported compression '{compression}', choose one of: "
+        f"{[c.name.lower() for c in Compression]}."
+    )
+
+
+def _interpret_metadata(metadata: str) -> Tuple[str, str, str, str]:
     """Interpret and return Orchest SDK metadata.
 
     Args:
         metadata: A string that can be interpreted as Orchest SDK
             metadata. To be considered valid, it must contain the string
             ``Config.__METADATA__SEPARATOR`` in a way that splitting the
-            string through the separator would result in 3 or 4 elements
-            , in the case of 4 elements, only the last 3 elements are
-            considered. Those three strings must be, in order: a valid
-            string representing a datetime (utc, ISO format), the string
+            string through the separator would result in 3 or 4
+            elements. Three elements must be, in order: a valid string
+            representing a datetime (utc, ISO format), the string
             representation of a member of the Serialization enum, any
-            string.
+            string. In the case of 4 elements, either the first element
+            is an internal flag (metadata stored in memory) which is
+            ignored, or the 4th element is the string representation of
+            a member of the Compression enum.
 
     Raises:
         InvalidMetaDataError: If the input string is invalid.
 
     Returns:
-        A tuple of 3 strings. The first is the timestamp of when the
+        A tuple of 4 strings. The first is the timestamp of when the
         data related to the metadata was produced (utc, ISO format).
         The second string is the type of serialization used (See the
         Serialization enum). The third string is the name with which the
-        data was output.
+        data was output. The fourth string is the compression used (See
+        the Compression enum).
     """
 
     if Config.__METADATA_SEPARATOR__ not in metadata:
@@ -148,9 +231,16 @@ def _interpret_metadata(metadata: str) -> Tuple[str, str, str]:
 
     # Metadata that was stored in memory has 4 elements, first is
     # ignored because it's an internal flag.
-    # Metadata that was stored on disk has 3 elements.
+    # Metadata that was stored on disk has 3 elements, or 4 elements
+    # when the data is compressed, in which case the last element is
+    # the compression. Since a timestamp is never a valid serialization
+    # the two cases of 4 elements can be told apart.
     if len(metadata) in [3, 4]:
-        timestamp, serialization, name = metadata[-3:]
+        if len(metadata) == 4 and metadata[1] in Serialization.__members__:
+            timestamp, serialization, name, compression = metadata
+        else:
+            timestamp, serialization, name = metadata[-3:]
+            compression = Compression.NONE.name
 
         # check timestamp for validity
         try:
@@ -172,34 +262,237 @@ def _interpret_metadata(metadata: str) -> Tuple[str, str, str]:
             Serialization.ARROW_TABLE.name,
             Serialization.ARROW_BATCH.name,
             Serialization.PICKLE.name,
+            Serialization.PICKLE_OOB.name,
+            Serialization.ARROW_PANDAS.name,
+            Serialization.PARQUET.name,
         ]:
             raise error.InvalidMetaDataError(
                 f"Metadata {metadata} has an "
                 f"invalid serialization ({serialization})."
             )
 
-        return timestamp, serialization, name
+        if compression not in Compression.__members__:
+            raise error.InvalidMetaDataError(
+                f"Metadata {metadata} has an invalid compression ({compression})."
+            )
+
+        return timestamp, serialization, name, compression
     else:
         raise error.InvalidMetaDataError(
             f"Metadata {metadata} has an invalid number of elements."
         )
 
 
+# Buffers smaller than this size are pickled in-band, since storing them
+# out-of-band would mostly add alignment padding.
+_PICKLE_OOB_MIN_BUFFER_SIZE = 1 << 16
+# Out-of-band buffers are page aligned within the file so that they can
+# be memory mapped efficiently.
+_PICKLE_OOB_ALIGNMENT = 4096
+# Pickle protocol 5 supports out-of-band buffers, added in Python 3.8.
+_PICKLE_OOB_PROTOCOL = 5
+
+
+def _serialize_pickle_oob(data: Any) -> Optional[List[pa.Buffer]]:
+    """Pickles an object storing its large buffers out-of-band.
+
+    The resulting file layout is: a header containing the size of the
+    pickled data, the number of buffers and the ``(offset, size)`` of
+    every buffer in the file, followed by the pickled data and finally
+    the page aligned buffers.
+
+    Args:
+        data: The object/data to be pickled.
+
+    Returns:
+        The buffers that together make up the serialized data, to be
+        written consecutively. ``None`` if the object has no large
+        buffers that can be stored out-of-band, in which case it is
+        better to use regular pickling.
+
+    Raises:
+        PicklingError: If the data could not be pickled.
+    """
+    if pickle.HIGHEST_PROTOCOL < _PICKLE_OOB_PROTOCOL:
+        return None
+
+    oob_buffers = []
+
+    def buffer_callback(buffer: pickle.PickleBuffer) -> bool:
+        # Returning a false value makes the buffer out-of-band.
+        if buffer.raw().nbytes < _PICKLE_OOB_MIN_BUFFER_SIZE:
+            return True
+        oob_buffers.append(buffer)
+        return False
+
+    pickled = pickle.dumps(
+        data, protocol=_PICKLE_OOB_PROTOCOL, buffer_callback=buffer_callback
+    )
+    if not oob_buffers:
+        return None
+
+    header_size = struct.calcsize("<QQ") * (len(oob_buffers) + 1)
+    offset = header_size + len(pickled)
+    chunks = [pickled]
+    buffer_positions = []
+    for buffer in oob_buffers:
+        raw = buffer.raw()
+        padding = -offset % _PICKLE_OOB_ALIGNMENT
+        offset += padding
+        buffer_positions.extend([offset, raw.nbytes])
+        # NOTE: zero-copy view on the buffer.
+        chunks.extend([bytes(padding), raw])
+        offset += raw.nbytes
+
+    header = struct.pack(
+        f"<{2 * (len(oob_buffers) + 1)}Q",
+        len(pickled),
+        len(oob_buffers),
+        *buffer_positions,
+    )
+    return [pa.py_buffer(chunk) for chunk in [header, *chunks]]
+
+
+def _deserialize_pickle_oob(file_path: str) -> Any:
+    """Unpickles an object stored by :func:`_serialize_pickle_oob`.
+
+    The out-of-band buffers are not read, instead the object is
+    reconstructed on top of a copy-on-write memory map of the file. Only
+    the pages that are accessed are loaded and only the pages that are
+    written to are copied, the file itself is never modified.
+    """
+    with open(file_path, "rb") as f:
+        # NOTE: the mapping stays valid after the file is closed and is
+        # kept alive by the objects that reference its memory.
+        mapped_file = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+
+    view = memoryview(mapped_file)
+    pickled_size, num_buffers = struct.unpack_from("<QQ", view, 0)
+    positions = struct.unpack_from(f"<{2 * num_buffers}Q", view, struct.calcsize("<QQ"))
+    header_size = struct.calcsize("<QQ") * (num_buffers + 1)
+    buffers = [
+        view[offset : offset + size]
+        for offset, size in zip(positions[::2], positions[1::2])
+    ]
+    return pickle.loads(view[header_size : header_size + pickled_size], buffers=buffers)
+
+
+# Key in the Arrow schema metadata of ``ARROW_PANDAS`` data that stores
+# the name of the ``pd.Series`` (JSON encoded) in case the data is a
+# series instead of a data frame.
+_ARROW_PANDAS_SERIES_NAME_KEY = b"orchest.series_name"
+_ARROW_PANDAS_SERIES_COLUMN = "series"
+# Schema metadata key marking Parquet data that was a pandas object.
+_PARQUET_PANDAS_KEY = b"orchest.pandas"
+
+
+def _is_arrow_convertible_pandas_dtype(dtype: Any) -> bool:
+    """Returns whether a pandas dtype round trips through Arrow as is.
+
+    Only dtypes for which ``pa.Table.from_pandas`` followed by
+    ``to_pandas`` is known to reconstruct the exact same data are
+    considered. Notably the ``object`` dtype is excluded, since it can
+    contain arbitrary (mixed) Python objects.
+    """
+    pd = sys.modules["pandas"]
+    np = sys.modules["numpy"]
+    if isinstance(dtype, np.dtype):
+        return dtype.kind in "biufmM"
+    return isinstance(dtype, (pd.CategoricalDtype, pd.DatetimeTZDtype, pd.StringDtype))
+
+
+def _pandas_to_arrow(data: Any, strict: bool = True) -> Optional[pa.Table]:
+    """Converts a ``pd.DataFrame`` or ``pd.Series`` to a ``pa.Table``.
+
+    Args:
+        data: The data to convert.
+        strict: If ``False``, then columns of other than Arrow
+            compatible dtypes, e.g. ``object`` columns, are converted as
+            well if Arrow can infer their type. Converting them back
+            might not result in the exact same object.
+
+    Returns:
+        The converted table, or ``None`` if the data is not a pandas
+        object or cannot be converted without loss of information, in
+        which case it should be pickled instead.
+    """
+    # If pandas has not been imported, then the data cannot be a pandas
+    # object. This way pandas is not a dependency of the SDK.
+    pd = sys.modules.get("pandas")
+    if pd is None or not isinstance(data, (pd.DataFrame, pd.Series)):
+        return None
+
+    schema_metadata = {}
+    if isinstance(data, pd.Series):
+        if not isinstance(data.name, (str, type(None))):
+            return None
+        schema_metadata[_ARROW_PANDAS_SERIES_NAME_KEY] = json.dumps(data.name)
+        data = data.to_frame(name=_ARROW_PANDAS_SERIES_COLUMN)
+
+    if (
+        isinstance(data.columns, pd.MultiIndex)
+        or isinstance(data.index, pd.MultiIndex)
+        or not data.columns.is_unique
+        or not all(isinstance(column, str) for column in data.columns)
+    ):
+        return None
+
+    if strict and not (
+        all(_is_arrow_convertible_pandas_dtype(d) for d in data.dtypes)
+        and (
+            isinstance(data.index, pd.RangeIndex)
+            or _is_arrow_convertible_pandas_dtype(data.index.dtype)
+        )
+    ):
+        return None
+
+    try:
+        table = pa.Table.from_pandas(data)
+    except (pa.ArrowException, TypeError, ValueError):
+        return None
+
+    return table.replace_schema_metadata(
+        {**(table.schema.metadata or {}), **schema_metadata}
+    )
+
+
+def _arrow_to_pandas(table: pa.Table) -> Any:
+    """Converts a table created by :func:`_pandas_to_arrow` back."""
+    data = table.to_pandas()
+
+    metadata = table.schema.metadata or {}
+    if _ARROW_PANDAS_SERIES_NAME_KEY in metadata:
+        data = data[_ARROW_PANDAS_SERIES_COLUMN].rename(
+            json.loads(metadata[_ARROW_PANDAS_SERIES_NAME_KEY])
+        )
+    return data
+
+
+def _get_ipc_write_options(compression: Compression) -> pa.ipc.IpcWriteOptions:
+    if compression is Compression.NONE:
+        return pa.ipc.IpcWriteOptions()
+    return pa.ipc.IpcWriteOptions(compression=compression.name.lower())
+
+
 def _serialize(
     data: Any,
+    compression: Compression = Compression.NONE,
 ) -> Tuple[bytes, Serialization]:
     """Serializes an object to a ``pa.Buffer``.
 
     The way the object is serialized depends on the nature of the
     object: ``pa.RecordBatch`` and ``pa.Table`` are serialized using
-    ``pyarrow`` functions. All other cases are serialized through the
-    ``pickle`` library.
+    ``pyarrow`` functions. A ``pd.DataFrame`` or ``pd.Series`` is
+    converted to a ``pa.Table`` first, if its dtypes allow for it. All
+    other cases are serialized through the ``pickle`` library.
 
     Args:
         data: The object/data to be serialized.
+        compression: The compression to apply to the serialized data.
 
     Returns:
-        Tuple of the serialized data (in ``pa.Buffer`` format) and the
+        Tuple of the serialized data (in ``pa.Buffer`` format, or a list
+        of ``pa.Buffer`` for ``Serialization.PICKLE_OOB``) and the
         :class:`Serialization` that was used.
 
     Raises:
@@ -215,16 +508,26 @@ def _serialize(
         otherwise an exception will be raised."
 
     """
+    pandas_table = _pandas_to_arrow(data)
+    if pandas_table is not None:
+        data = pandas_table
+
     if isinstance(data, (pa.RecordBatch, pa.Table)):
         # Use the intended pyarrow functionalities when possible.
-        if isinstance(data, pa.Table):
+        if pandas_table is not None:
+            serialization = Serialization.ARROW_PANDAS
+        elif isinstance(data, pa.Table):
             serialization = Serialization.ARROW_TABLE
         else:
             serialization = Serialization.ARROW_BATCH
 
         output_buffer = pa.BufferOutputStream()
         try:
-            writer = pa.RecordBatchStreamWriter(output_buffer, data.schema)
+            writer = pa.RecordBatchStreamWriter(
+                output_buffer,
+                data.schema,
+                options=_get_ipc_write_options(compression),
+            )
             writer.write(data)
             writer.close()
         except pa.ArrowSerializationError:
@@ -238,6 +541,20 @@ def _serialize(
         # All other cases use the pickle library.
         serialization = Serialization.PICKLE
 
+        # Large buffers are stored out-of-band so that they can be
+        # memory mapped, which defeats the purpose of compression.
+        serialized = None
+        if compression is Compression.NONE:
+            try:
+                serialized = _serialize_pickle_oob(data)
+            except pickle.PicklingError:
+                raise error.SerializationError(
+                    f"Could not pickle data of type {type(data)}."
+                )
+
+        if serialized is not None:
+            return serialized, Serialization.PICKLE_OOB
+
         # Use the best protocol possible, for reference see:
         # https://docs.python.org/3/library/pickle.html#pickle-protocols
         try:
@@ -250,16 +567,215 @@ def _serialize(
         # NOTE: zero-copy view on the bytes.
         serialized = pa.py_buffer(serialized)
 
+        if compression is not Compression.NONE:
+            output_buffer = pa.BufferOutputStream()
+            with pa.CompressedOutputStream(
+                output_buffer, compression.name.lower()
+            ) as compressed_stream:
+                compressed_stream.write(serialized)
+            serialized = output_buffer.getvalue()
+
     return serialized, serialization
 
 
+def _prepare_record_batch_stream(
+    data: Iterator[Any],
+) -> Tuple[Iterator[pa.RecordBatch], Serialization]:
+    """Prepares an iterator of ``pa.RecordBatch`` for streaming to disk.
+
+    The first batch is consumed to make sure the iterator indeed yields
+    record batches, after which it is put back in front of the stream.
+    The batches together make up a table, thus the stream is stored
+    using the ``ARROW_TABLE`` serialization.
+
+    Args:
+        data: Iterator (or generator) yielding ``pa.RecordBatch``
+            objects that all share the same schema.
+
+    Returns:
+        Tuple of an iterator yielding all the record batches of `data`
+        and the :class:`Serialization` that is to be used.
+
+    Raises:
+        SerializationError: If the iterator is empty or does not yield
+            ``pa.RecordBatch`` objects.
+
+    """
+    try:
+        first_batch = next(data)
+    except StopIteration:
+        raise error.SerializationError(
+            "Could not serialize an empty iterator, it should yield at least one "
+            "pa.RecordBatch."
+        )
+
+    if not isinstance(first_batch, pa.RecordBatch):
+        raise error.SerializationError(
+            "Could not serialize an iterator yielding data of type "
+            f"{type(first_batch)}, only iterators of pa.RecordBatch are supported."
+        )
+
+    return chain([first_batch], data), Serialization.ARROW_TABLE
+
+
+@contextmanager
+def _replace_on_disk(path: str) -> Iterator[str]:
+    """Yields a temporary path that replaces ``path`` once written to.
+
+    The files of an output are never written to in place since they
+    can be hardlinked by the cache of the step, see
+    :func:`_cache_output`. If writing fails, ``path`` is left untouched.
+
+    Args:
+        path: Path of the file or directory to write.
+    """
+    tmp_path = f"{path}.tmp"
+    try:
+        yield tmp_path
+    except BaseException:
+        if os.path.isdir(tmp_path):
+            shutil.rmtree(tmp_path, ignore_errors=True)
+        elif os.path.lexists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    # A directory can not replace a non-empty directory.
+    if os.path.isdir(tmp_path) and os.path.isdir(path):
+        shutil.rmtree(path)
+    os.replace(tmp_path, path)
+
+
+def _output_record_batches_to_disk(
+    batches: Iterator[pa.RecordBatch],
+    full_path: str,
+    serialization: Serialization,
+    compression: Compression = Compression.NONE,
+) -> None:
+    """Streams record batches to disk batch by batch.
+
+    Only a single batch is kept in memory at a time, which allows
+    outputting data that is larger than the available memory.
+
+    Args:
+        batches: Iterator yielding the ``pa.RecordBatch`` objects to
+            write. All batches must share the schema of the first one.
+        full_path: Full path to save the data to.
+        serialization: Serialization of the stream. For possible values
+            see :class:`Serialization`.
+        compression: The compression to apply to the record batches.
+
+    Raises:
+        SerializationError: If a batch could not be written, e.g.
+            because its schema differs from the schema of the first
+            batch.
+    """
+    first_batch = next(batches)
+    with _replace_on_disk(f"{full_path}.{serialization.name}") as path, pa.OSFile(
+        path, "wb"
+    ) as f:
+        try:
+            with pa.RecordBatchStreamWriter(
+                f, first_batch.schema, options=_get_ipc_write_options(compression)
+            ) as writer:
+                for batch in chain([first_batch], batches):
+                    writer.write_batch(batch)
+        except (pa.ArrowInvalid, pa.ArrowSerializationError, TypeError) as e:
+            raise error.SerializationError(
+                f"Could not serialize stream of record batches: {e}"
+            )
+
+
+def _get_output_format(format: Optional[str]) -> Optional[Serialization]:
+    """Gets the :class:`Serialization` given a user specified format.
+
+    Args:
+        format: Either ``None``, in which case the serialization is
+            inferred from the data, or ``"parquet"``.
+
+    Raises:
+        ValueError: If the specified format is not supported.
+    """
+    if format is None:
+        return None
+    if isinstance(format, str) and format.lower() == "parquet":
+        return Serialization.PARQUET
+
+    raise ValueError(f"Unsupported format '{format}', choose one of: ['parquet'].")
+
+
+def _output_parquet_to_disk(
+    data: Any, full_path: str, compression: Compression = Compression.NONE
+) -> None:
+    """Outputs data as a Parquet dataset.
+
+    The dataset is a directory containing a single Parquet file. Every
+    record batch of the data becomes a row group, which allows readers
+    to skip row groups based on their statistics when filtering.
+    The dataset replaces a previous one only once it is fully written.
+
+    Args:
+        data: A ``pa.Table``, ``pa.RecordBatch``, ``pd.DataFrame``,
+            ``pd.Series`` or an iterator of ``pa.RecordBatch`` objects,
+            which is written batch by batch.
+        full_path: Full path to save the data to.
+        compression: The compression codec of the Parquet file.
+
+    Raises:
+        SerializationError: If the data could not be written as
+            Parquet.
+    """
+    if isinstance(data, Iterator):
+        batches, _ = _prepare_record_batch_stream(data)
+        first_batch = next(batches)
+        schema = first_batch.schema
+        batches = chain([first_batch], batches)
+    else:
+        if isinstance(data, pa.Table):
+            table = data
+        elif isinstance(data, pa.RecordBatch):
+            table = pa.Table.from_batches([data])
+        else:
+            table = _pandas_to_arrow(data, strict=False)
+            if table is None:
+                raise error.SerializationError(
+                    f"Could not serialize data of type {type(data)} as Parquet, "
+                    "only Arrow data and pandas objects with string column names "
+                    "are supported."
+                )
+            table = table.replace_schema_metadata(
+                {**table.schema.metadata, _PARQUET_PANDAS_KEY: b"1"}
+            )
+        schema = table.schema
+        batches = iter(table.to_batches())
+
+    with _replace_on_disk(f"{full_path}.{Serialization.PARQUET.name}") as dataset_dir:
+        shutil.rmtree(dataset_dir, ignore_errors=True)
+        os.makedirs(dataset_dir)
+
+        writer = pq.ParquetWriter(
+            os.path.join(dataset_dir, "part-0.parquet"),
+            schema,
+            compression=compression.name,
+        )
+        try:
+            for batch in batches:
+                writer.write_table(pa.Table.from_batches([batch], schema))
+        except (pa.ArrowInvalid, TypeError, ValueError) as e:
+            raise error.SerializationError(f"Could not serialize data as Parquet: {e}")
+        finally:
+            writer.close()
+
+
 def _output_to_disk(
-    obj: pa.Buffer, full_path: str, serialization: Serialization
+    obj: Union[pa.Buffer, List[pa.Buffer]],
+    full_path: str,
+    serialization: Serialization,
 ) -> None:
     """Outputs a serialized object to disk to the specified path.
 
     Args:
-        obj: Object to output to disk.
+        obj: Object to output to disk. In case of a list of buffers,
+            the buffers are written consecutively.
         full_path: Full path to save the data to.
         serialization: Serialization of the `obj`. For possible values
             see :class:`Serialization`.
@@ -268,18 +784,46 @@ def _output_to_disk(
         ValueError: If the specified serialization is not valid.
     """
     if isinstance(serialization, Serialization):
-        with pa.OSFile(f"{full_path}.{serialization.name}", "wb") as f:
-            f.write(obj)
+        buffers = obj if isinstance(obj, list) else [obj]
+        with _replace_on_disk(f"{full_path}.{serialization.name}") as path, pa.OSFile(
+            path, "wb"
+        ) as f:
+            for buffer in buffers:
+                f.write(buffer)
     else:
         raise ValueError("Function not defined for specified 'serialization'")
 
     return
 
 
+def _write_head_file(
+    data_dir: str, serialization: Serialization, name: str, compression: Compression
+) -> None:
+    """Writes the HEAD file describing the most recent output.
+
+    The HEAD file contains the metadata that is interpreted by
+    :func:`_interpret_metadata`.
+    """
+    metadata = [
+        datetime.utcnow().isoformat(timespec="seconds"),
+        serialization.name,
+        name,
+    ]
+    # Uncompressed data is described by 3 elements so that it stays
+    # readable by older versions of the SDK.
+    if compression is not Compression.NONE:
+        metadata.append(compression.name)
+
+    with _replace_on_disk(os.path.join(data_dir, "HEAD")) as path, open(path, "w") as f:
+        f.write(Config.__METADATA_SEPARATOR__.join(metadata))
+
+
 def output_to_disk(
     data: Any,
     name: Optional[str],
     serialization: Optional[Serialization] = None,
+    compression: Optional[Any] = None,
+    format: Optional[str] = None,
 ) -> None:
     """Outputs data to disk.
 
@@ -296,14 +840,26 @@ def output_to_disk(
       serves as a protocol that returns the timestamp of the latest
       write to disk via this function alongside the used serialization.
 
+    When auto eviction is enabled in the pipeline settings, which is
+    always the case for jobs, the data is removed from disk once all
+    the child steps have retrieved it through :func:`get_inputs`.
+
     Args:
-        data: Data to output to disk.
+        data: Data to output to disk. An iterator (or generator) of
+            ``pa.RecordBatch`` objects is streamed to disk batch by
+            batch.
         name: Name of the output data. As a string, it becomes the name
             of the data, when ``None``, the data is considered nameless.
             This affects the way the data can be later retrieved using
             :func:`get_inputs`.
         serialization: Serialization of the `data` in case it is already
             serialized. For possible values see :class:`Serialization`.
+        compression: Compression codec to compress the data with, either
+            a member of :class:`Compression` or its name, e.g.
+            ``"zstd"``. Defaults to ``Config.DATA_PASSING_COMPRESSION``.
+            In case the `data` is already serialized, this is the
+            compression that was used to serialize it.
+        format: See :func:`output`.
 
     Raises:
         DataInvalidNameError: The name of the output data is invalid,
@@ -311,8 +867,11 @@ def output_to_disk(
             it contains a reserved substring.
         PipelineDefinitionNotFoundError: If the pipeline definition file
             could not be found.
+        SerializationError: If the data could not be serialized.
         StepUUIDResolveError: The step's UUID cannot be resolved and
             thus it cannot determine where to output data to.
+        ValueError: If the specified compression or format is not
+            supported.
 
     Example:
         >>> data = "Data I would like to use in my next step"
@@ -328,65 +887,231 @@ def output_to_disk(
     if name is None:
         name = Config._RESERVED_UNNAMED_OUTPUTS_STR
 
+    compression = _get_compression(compression)
+    if serialization is None:
+        serialization = _get_output_format(format)
+
     try:
-        with open(Config.PIPELINE_DEFINITION_PATH, "r") as f:
-            pipeline_definition = json.load(f)
+        pipeline = get_pipeline()
     except FileNotFoundError:
         raise error.PipelineDefinitionNotFoundError(
             f"Could not open {Config.PIPELINE_DEFINITION_PATH}."
         )
 
-    pipeline = Pipeline.from_json(pipeline_definition)
-
     try:
         step_uuid = get_step_uuid(pipeline)
     except error.StepUUIDResolveError:
         raise error.StepUUIDResolveError("Failed to determine where to output data to.")
 
     # In case the data is not already serialized, then we need to
-    # serialize it.
-    if serialization is None:
-        data, serialization = _serialize(data)
+    # serialize it. Iterators of record batches are not serialized up
+    # front, instead they are streamed to disk batch by batch.
+    # Parquet data is serialized while it is written.
+    is_stream = serialization is None and isinstance(data, Iterator)
+    if is_stream:
+        data, serialization = _prepare_record_batch_stream(data)
+    elif serialization is None:
+        data, serialization = _serialize(data, compression=compression)
 
     # Recursively create any directories if they do not already exists.
     step_data_dir = Config.get_step_data_dir(step_uuid)
     os.makedirs(step_data_dir, exist_ok=True)
 
-    # The HEAD file serves to resolve the transfer method.
-    head_file = os.path.join(step_data_dir, "HEAD")
-    with open(head_file, "w") as f:
-        metadata = [
-            datetime.utcnow().isoformat(timespec="seconds"),
-            serialization.name,
-            name,
-        ]
-        metadata = Config.__METADATA_SEPARATOR__.join(metadata)
-        f.write(metadata)
-
     # Full path to write the actual data to.
     full_path = os.path.join(step_data_dir, step_uuid)
 
-    return _output_to_disk(data, full_path, serialization=serialization)
+    # The data is written before the HEAD file and the consumers are
+    # reset, so that if writing fails, e.g. halfway through a stream,
+    # the previous output is still the one that is resolved.
+    if serialization is Serialization.PARQUET:
+        _output_parquet_to_disk(data, full_path, compression=compression)
+    elif is_stream:
+        _output_record_batches_to_disk(
+            data, full_path, serialization=serialization, compression=compression
+        )
+    else:
+        _output_to_disk(data, full_path, serialization=serialization)
+
+    # The new output has not been consumed by any step yet.
+    shutil.rmtree(
+        os.path.join(step_data_dir, Config._CONSUMERS_DIR_NAME), ignore_errors=True
+    )
+
+    # The HEAD file serves to resolve the transfer method.
+    _write_head_file(step_data_dir, serialization, name, compression)
+
+    if Config.STEP_FINGERPRINT is not None:
+        _cache_output(step_uuid, Config.STEP_FINGERPRINT)
+
+
+def _cache_output(step_uuid: str, fingerprint: str) -> None:
+    """Links the output of the step into its cache.
+
+    The files of the output are hardlinked rather than copied, which is
+    safe since the next output of the step replaces the files instead
+    of writing to them in place, see :func:`_replace_on_disk`. Files
+    are copied if they can not be linked. Only the most recent output
+    of a step is kept. Failing to cache the output does not fail the
+    step, it is only not skipped in later runs.
+
+    Args:
+        step_uuid: The UUID of the step.
+        fingerprint: The fingerprint of the step, passed by Orchest.
+    """
+    step_data_dir = Config.get_step_data_dir(step_uuid)
+    step_cache_dir = Config.get_step_cache_dir(step_uuid)
+    tmp_dir = os.path.join(step_cache_dir, f".tmp-{fingerprint}")
+    try:
+        os.makedirs(step_cache_dir, exist_ok=True)
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        shutil.copytree(
+            step_data_dir,
+            tmp_dir,
+            ignore=shutil.ignore_patterns(Config._CONSUMERS_DIR_NAME, "*.tmp"),
+            copy_function=_link_or_copy,
+        )
+        for entry in os.listdir(step_cache_dir):
+            if entry != os.path.basename(tmp_dir):
+                shutil.rmtree(os.path.join(step_cache_dir, entry))
+        os.rename(tmp_dir, os.path.join(step_cache_dir, fingerprint))
+    except OSError as e:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        _print_warning_message(f"Failed to cache the output of the step: {e}")
 
 
-def _deserialize_output_disk(full_path: str, serialization: str) -> Any:
+def _link_or_copy(src: str, dst: str) -> None:
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+def _project_table(
+    table: pa.Table,
+    columns: Optional[List[str]] = None,
+    filter: Optional[ds.Expression] = None,
+) -> pa.Table:
+    """Selects the given columns and rows of the filter from a table."""
+    if columns is None and filter is None:
+        return table
+    return ds.dataset(table).to_table(columns=columns, filter=filter)
+
+
+def _project_record_batches(
+    reader: pa.RecordBatchStreamReader,
+    columns: Optional[List[str]] = None,
+    filter: Optional[ds.Expression] = None,
+) -> Iterator[pa.RecordBatch]:
+    """Lazily selects the given columns and rows of a batch stream."""
+    for batch in reader:
+        yield from _project_table(
+            pa.Table.from_batches([batch]), columns, filter
+        ).to_batches()
+
+
+def _deserialize_output_disk(
+    full_path: str,
+    serialization: str,
+    stream: bool = False,
+    compression: str = Compression.NONE.name,
+    columns: Optional[List[str]] = None,
+    filter: Optional[ds.Expression] = None,
+) -> Any:
     """Gets data from disk.
 
+    Args:
+        full_path: Full path of the data, without the serialization
+            extension.
+        serialization: The serialization of the data. For possible
+            values see :class:`Serialization`.
+        stream: If ``True``, then Arrow data is returned as a lazy
+            ``pa.RecordBatchStreamReader`` over the memory mapped file
+            instead of being read in its entirety. Parquet data and
+            projected Arrow data is returned as an iterator of
+            ``pa.RecordBatch`` objects.
+        compression: The compression of the data. For possible values
+            see :class:`Compression`. Compressed Arrow data is
+            decompressed by the Arrow IPC reader itself.
+        columns: Names of the columns to read, only supported for
+            Arrow and Parquet data. Reading a subset of the columns of
+            Parquet data skips reading the other columns altogether.
+        filter: Expression to select rows with, e.g.
+            ``pyarrow.dataset.field("x") > 3``, only supported for Arrow
+            and Parquet data. For Parquet data, the filter is pushed
+            down to the reader to skip row groups.
+
     Raises:
-        ValueError: If the serialization argument is unsupported.
+        ValueError: If the serialization argument is unsupported or if
+            a projection is requested on data that is not Arrow data.
     """
     file_path = f"{full_path}.{serialization}"
-    if serialization == Serialization.ARROW_TABLE.name:
+    is_projected = columns is not None or filter is not None
+    if is_projected and serialization not in [
+        Serialization.ARROW_TABLE.name,
+        Serialization.ARROW_BATCH.name,
+        Serialization.ARROW_PANDAS.name,
+        Serialization.PARQUET.name,
+    ]:
+        raise ValueError(
+            "Selecting columns or rows is only supported for Arrow data and data "
+            'that was output with format="parquet".'
+        )
+
+    if serialization == Serialization.PARQUET.name:
+        dataset = ds.dataset(file_path, format="parquet")
+        if _PARQUET_PANDAS_KEY in (dataset.schema.metadata or {}):
+            table = dataset.to_table(columns=columns, filter=filter)
+            return _arrow_to_pandas(table)
+        if stream:
+            return dataset.to_batches(columns=columns, filter=filter)
+        return dataset.to_table(columns=columns, filter=filter)
+    elif stream and serialization in [
+        Serialization.ARROW_TABLE.name,
+        Serialization.ARROW_BATCH.name,
+    ]:
+        # NOTE: the memory map is not closed explicitly, the reader
+        # keeps a reference to it so that it stays open for as long as
+        # the reader is in use.
+        reader = pa.ipc.open_stream(pa.memory_map(file_path, "rb"))
+        if is_projected:
+            return _project_record_batches(reader, columns, filter)
+        return reader
+    elif serialization == Serialization.ARROW_TABLE.name:
         # pa.memory_map is for reading (zero-copy)
         with pa.memory_map(file_path, "rb") as input_file:
             # read all batches as a table
             stream = pa.ipc.open_stream(input_file)
-            return stream.read_all()
+            return _project_table(stream.read_all(), columns, filter)
+    elif serialization == Serialization.ARROW_PANDAS.name:
+        with pa.memory_map(file_path, "rb") as input_file:
+            stream = pa.ipc.open_stream(input_file)
+            return _arrow_to_pandas(_project_table(stream.read_all(), columns, filter))
     elif serialization == Serialization.ARROW_BATCH.name:
         with pa.memory_map(file_path, "rb") as input_file:
             # return the first batch (the only one)
             stream = pa.ipc.open_stream(input_file)
-            return [b for b in stream][0]
+            batch = [b for b in stream][0]
+            if not is_projected:
+                return batch
+
+            table = _project_table(pa.Table.from_batches([batch]), columns, filter)
+            batches = table.combine_chunks().to_batches()
+            if not batches:
+                return pa.RecordBatch.from_arrays(
+                    [pa.array([], type=field.type) for field in table.schema],
+                    schema=table.schema,
+                )
+            return batches[0]
+    elif (
+        serialization == Serialization.PICKLE.name
+        and compression != Compression.NONE.name
+    ):
+        with pa.CompressedInputStream(
+            pa.OSFile(file_path, "rb"), compression.lower()
+        ) as input_file:
+            return pickle.loads(input_file.read_buffer())
+    elif serialization == Serialization.PICKLE_OOB.name:
+        return _deserialize_pickle_oob(file_path)
     elif serialization == Serialization.PICKLE.name:
         # https://docs.python.org/3/library/pickle.html
         # The argument file must have three methods:
@@ -408,13 +1133,66 @@ def _deserialize_output_disk(full_path: str, serialization: str) -> Any:
         )
 
 
-def _get_output_disk(step_uuid: str, serialization: str) -> Any:
+def _consume_output_disk(step_uuid: str, consumer: str) -> None:
+    """Registers that the output of a step has been retrieved.
+
+    Every consumer is recorded by an (empty) file in the data directory
+    of the step, which is also used by the orchest-api to clean up data
+    at the end of a pipeline run. When auto eviction is enabled and all
+    the child steps have consumed the output, then it is removed. Only
+    in job runs, since the steps of an interactive run can be rerun and
+    then need the output again.
+
+    Args:
+        step_uuid: The UUID of the step whose output was retrieved.
+        consumer: The UUID of the step that retrieved the output.
+    """
+    step_data_dir = Config.get_step_data_dir(step_uuid)
+    consumers_dir = os.path.join(step_data_dir, Config._CONSUMERS_DIR_NAME)
+    os.makedirs(consumers_dir, exist_ok=True)
+    with open(os.path.join(consumers_dir, consumer), "w"):
+        pass
+
+    if Config.SESSION_TYPE != "noninteractive":
+        return
+
+    pipeline = get_pipeline()
+    settings = pipeline.properties.get("settings") or {}
+    if not settings.get("auto_eviction", False):
+        return
+
+    consumed = set(os.listdir(consumers_dir))
+    children = pipeline.get_step_by_uuid(step_uuid).children
+    if all(child.properties["uuid"] in consumed for child in children):
+        # NOTE: data that is memory mapped by a consumer stays valid
+        # after its file has been removed.
+        shutil.rmtree(step_data_dir, ignore_errors=True)
+
+
+def _get_output_disk(
+    step_uuid: str,
+    serialization: str,
+    stream: bool = False,
+    compression: str = Compression.NONE.name,
+    consumer: Optional[str] = None,
+    columns: Optional[List[str]] = None,
+    filter: Optional[ds.Expression] = None,
+) -> Any:
     """Gets data from disk.
 
     Args:
         step_uuid: The UUID of the step to get output data from.
         serialization: The serialization for the output. For possible
             values see :class:`Serialization`.
+        stream: If ``True``, then Arrow data is returned as a lazy
+            reader of record batches. See
+            :func:`_deserialize_output_disk`.
+        compression: The compression of the output. For possible values
+            see :class:`Compression`.
+        consumer: The UUID of the step that consumes the data, see
+            :func:`_consume_output_disk`.
+        columns: See :func:`_deserialize_output_disk`.
+        filter: See :func:`_deserialize_output_disk`.
 
     Returns:
         Data from the step identified by `step_uuid`.
@@ -428,7 +1206,14 @@ def _get_output_disk(step_uuid: str, serialization: str) -> Any:
     full_path = os.path.join(step_data_dir, step_uuid)
 
     try:
-        return _deserialize_output_disk(full_path, serialization=serialization)
+        data = _deserialize_output_disk(
+            full_path,
+            serialization=serialization,
+            stream=stream,
+            compression=compression,
+            columns=columns,
+            filter=filter,
+        )
     except FileNotFoundError:
         # TODO: Ideally we want to provide the user with the step's
         #       name instead of UUID.
@@ -437,14 +1222,18 @@ def _get_output_disk(step_uuid: str, serialization: str) -> Any:
             "Try rerunning it."
         )
     # IOError is to try to catch pyarrow failures on opening the file.
-    except (pickle.UnpicklingError, IOError):
+    except (pickle.UnpicklingError, IOError, struct.error):
         raise error.DeserializationError(
             f'Output from incoming step "{step_uuid}" ({full_path}) '
             "could not be deserialized."
         )
 
+    if consumer is not None:
+        _consume_output_disk(step_uuid, consumer)
+    return data
+
 
-def _resolve_disk(step_uuid: str) -> Dict[str, Any]:
+def _resolve_disk(step_uuid: str, consumer: Optional[str] = None) -> Dict[str, Any]:
     """Returns information of the most recent write to disk.
 
     Resolves via the HEAD file the timestamp (that is used to determine
@@ -454,6 +1243,7 @@ def _resolve_disk(step_uuid: str) -> Dict[str, Any]:
     Args:
         step_uuid: The UUID of the step to resolve its most recent write
             to disk.
+        consumer: The UUID of the step that consumes the data.
 
     Returns:
         Dictionary containing the information of the function to be
@@ -470,7 +1260,7 @@ def _resolve_disk(step_uuid: str) -> Dict[str, Any]:
 
     try:
         with open(head_file, "r") as f:
-            timestamp, serialization, name = _interpret_metadata(f.read())
+            timestamp, serialization, name, compression = _interpret_metadata(f.read())
 
     except FileNotFoundError:
         # TODO: Ideally we want to provide the user with the step's
@@ -483,16 +1273,136 @@ def _resolve_disk(step_uuid: str) -> Dict[str, Any]:
     res = {
         "method_to_call": _get_output_disk,
         "method_args": (step_uuid,),
-        "method_kwargs": {"serialization": serialization},
+        "method_kwargs": {
+            "serialization": serialization,
+            "compression": compression,
+            "consumer": consumer,
+        },
         "metadata": {
             "timestamp": timestamp,
             "serialization": serialization,
             "name": name,
+            "compression": compression,
         },
     }
     return res
 
 
+def _get_output_memory(
+    step_uuid: str,
+    serialization: str,
+    stream: bool = False,
+    compression: str = Compression.NONE.name,
+    consumer: Optional[str] = None,
+    columns: Optional[List[str]] = None,
+    filter: Optional[ds.Expression] = None,
+) -> Any:
+    """Gets data from the in-memory store.
+
+    Args:
+        step_uuid: The UUID of the step to get output data from.
+        serialization: The serialization for the output. For possible
+            values see :class:`Serialization`.
+        stream: See :func:`_get_output_disk`.
+        compression: The compression of the output. For possible values
+            see :class:`Compression`.
+        consumer: The UUID of the step that consumes the data. Once all
+            consumers have retrieved the data it is evicted, given that
+            auto eviction is enabled for the pipeline.
+        columns: See :func:`_deserialize_output_disk`.
+        filter: See :func:`_deserialize_output_disk`.
+
+    Returns:
+        Data from the step identified by `step_uuid`.
+
+    Raises:
+        MemoryOutputNotFoundError: If output from `step_uuid` cannot be
+            found.
+        DeserializationError: If the data could not be deserialized.
+    """
+    store = MemoryStore.get()
+    if store is None:
+        raise error.MemoryOutputNotFoundError("No in-memory store is available.")
+
+    full_path = os.path.join(store.get_object_dir(step_uuid), step_uuid)
+    try:
+        data = _deserialize_output_disk(
+            full_path,
+            serialization=serialization,
+            stream=stream,
+            compression=compression,
+            columns=columns,
+            filter=filter,
+        )
+    except FileNotFoundError:
+        # The data might have been evicted in the meantime.
+        raise error.MemoryOutputNotFoundError(
+            f'Output from incoming step "{step_uuid}" cannot be found in memory. '
+            "Try rerunning it."
+        )
+    except (pickle.UnpicklingError, IOError, struct.error):
+        raise error.DeserializationError(
+            f'Output from incoming step "{step_uuid}" ({full_path}) '
+            "could not be deserialized."
+        )
+
+    settings = get_pipeline().properties.get("settings") or {}
+    store.consume(step_uuid, consumer, evict=settings.get("auto_eviction", False))
+    return data
+
+
+def _resolve_memory(step_uuid: str, consumer: Optional[str] = None) -> Dict[str, Any]:
+    """Returns information of the most recent write to memory.
+
+    Resolves via the HEAD file inside the in-memory store the timestamp
+    (that is used to determine the most recent write) and arguments to
+    call the :meth:`_get_output_memory` method.
+
+    Args:
+        step_uuid: The UUID of the step to resolve its most recent write
+            to memory.
+        consumer: The UUID of the step that consumes the data.
+
+    Returns:
+        Dictionary containing the information of the function to be
+        called to get the most recent data from the step. Additionally,
+        returns fill-in arguments for the function and metadata related
+        to the data that would be retrieved.
+
+    Raises:
+        MemoryOutputNotFoundError: If no in-memory store is available or
+            output from `step_uuid` cannot be found in it.
+    """
+    store = MemoryStore.get()
+    if store is None:
+        raise error.MemoryOutputNotFoundError("No in-memory store is available.")
+
+    head_file = os.path.join(store.get_object_dir(step_uuid), "HEAD")
+    try:
+        with open(head_file, "r") as f:
+            timestamp, serialization, name, compression = _interpret_metadata(f.read())
+    except FileNotFoundError:
+        raise error.MemoryOutputNotFoundError(
+            f'Output from incoming step "{step_uuid}" cannot be found in memory.'
+        )
+
+    return {
+        "method_to_call": _get_output_memory,
+        "method_args": (step_uuid,),
+        "method_kwargs": {
+            "serialization": serialization,
+            "compression": compression,
+            "consumer": consumer,
+        },
+        "metadata": {
+            "timestamp": timestamp,
+            "serialization": serialization,
+            "name": name,
+            "compression": compression,
+        },
+    }
+
+
 def output_to_memory(
     data: Any,
     name: Optional[str],
@@ -500,9 +1410,11 @@ def output_to_memory(
 ) -> None:
     """Outputs data to memory.
 
-    Warning:
-        Memory passing is not supported in this version of Orchest, this
-        function will output to disk.
+    The data is put in an in-memory store that is shared by the steps
+    of the pipeline run, which is only available when all steps run on
+    the same node, i.e. in single-node deployments when steps are not
+    limited in their parallelism. Otherwise, this function will output
+    to disk.
 
     Note:
         Calling :meth:`output_to_memory` multiple times within the same
@@ -510,11 +1422,15 @@ def output_to_memory(
         output ``name``. You therefore want to be only calling the
         function once.
 
-    To manage outputing the data to memory for the user, this function
-    uses metadata to add info to objects inside the plasma store.
+    To manage the capacity of the store, the least recently used data
+    is evicted when the store would otherwise exceed
+    ``Config.MAX_RELATIVE_STORE_CAPACITY``. Additionally, when auto
+    eviction is enabled in the pipeline settings, data is evicted once
+    all the child steps have retrieved it through :func:`get_inputs`.
 
     Args:
-        data: Data to output.
+        data: Data to output. Iterators of ``pa.RecordBatch`` are always
+            streamed to disk, see :func:`output`.
         name: Name of the output data. As a string, it becomes the name
             of the data, when ``None``, the data is considered nameless.
             This affects the way the data can be later retrieved using
@@ -529,10 +1445,6 @@ def output_to_memory(
             it contains a reserved substring.
         MemoryError: If the `data` does not fit in memory and
             ``disk_fallback=False``.
-        OrchestNetworkError: Could not connect to the
-            ``Config.STORE_SOCKET_NAME``, because it does not exist.
-            Which might be because the specified value was wrong or the
-            store died.
         PipelineDefinitionNotFoundError: If the pipeline definition file
             could not be found.
         StepUUIDResolveError: The step's UUID cannot be resolved and
@@ -543,13 +1455,69 @@ def output_to_memory(
         >>> data = "Data I would like to use in my next step"
         >>> output_to_memory(data, name="my_data")
     """
-    msg = (
-        "Memory passing is not supported in this version of Orchest. This function "
-        "will output to disk. No changes to your code are required."
-    )
-    _print_warning_message(msg)
-    output(data, name)
-    return
+    try:
+        _check_data_name_validity(name)
+    except (ValueError, TypeError) as e:
+        raise error.DataInvalidNameError(e)
+
+    store = MemoryStore.get()
+    if store is None or isinstance(data, Iterator):
+        msg = (
+            "Memory passing is not available for this step. This function will "
+            "output to disk. No changes to your code are required."
+        )
+        _print_warning_message(msg)
+        return output_to_disk(data, name)
+
+    _warn_multiple_data_output_if_necessary(name)
+
+    try:
+        pipeline = get_pipeline()
+    except FileNotFoundError:
+        raise error.PipelineDefinitionNotFoundError(
+            f"Could not open {Config.PIPELINE_DEFINITION_PATH}."
+        )
+
+    try:
+        step_uuid = get_step_uuid(pipeline)
+    except error.StepUUIDResolveError:
+        raise error.StepUUIDResolveError("Failed to determine where to output data to.")
+
+    serialized, serialization = _serialize(data)
+    buffers = serialized if isinstance(serialized, list) else [serialized]
+    consumers = [
+        child.properties["uuid"]
+        for child in pipeline.get_step_by_uuid(step_uuid).children
+    ]
+
+    def write(object_dir: str) -> None:
+        os.makedirs(object_dir, exist_ok=True)
+        _output_to_disk(serialized, os.path.join(object_dir, step_uuid), serialization)
+        # Written last so that consumers never resolve incomplete data.
+        _write_head_file(
+            object_dir,
+            serialization,
+            Config._RESERVED_UNNAMED_OUTPUTS_STR if name is None else name,
+            Compression.NONE,
+        )
+
+    try:
+        store.put(
+            step_uuid,
+            size=sum(buffer.size for buffer in buffers),
+            consumers=consumers,
+            write=write,
+        )
+    except MemoryError:
+        if not disk_fallback:
+            raise
+
+        output_to_disk(
+            serialized,
+            name,
+            serialization=serialization,
+            compression=Compression.NONE,
+        )
 
 
 def _resolve(
@@ -562,10 +1530,9 @@ def _resolve(
 
     Args:
         step_uuid: UUID of the step to resolve its most recent write.
-        consumer: The consumer of the output data. This is put inside
-            the metadata of an empty object to trigger a notification in
-            the plasma store, which is then used to manage eviction of
-            objects.
+        consumer: The consumer of the output data. It is used to manage
+            the eviction of the data once all its consumers have
+            retrieved it.
 
     Returns:
         Tuple containing the information of the function to be called
@@ -581,16 +1548,13 @@ def _resolve(
     # NOTE: All "resolve_{method}" functions have to be included in this
     # list. It is used to resolve what what "get_output_..." method to
     # invoke.
-    resolve_methods: List[Callable] = [_resolve_disk]
+    resolve_methods: List[Callable] = [_resolve_memory, _resolve_disk]
 
     method_infos = []
     method_infos_exceptions = []
     for method in resolve_methods:
         try:
-            if method.__name__ == "_resolve_memory":
-                method_info = method(step_uuid, consumer=consumer)
-            else:
-                method_info = method(step_uuid)
+            method_info = method(step_uuid, consumer=consumer)
         except (
             # Might happen in the case a user has metadata produced by a
             # version of the Orchest-SDK that is incompatible with this
@@ -628,10 +1592,147 @@ def _resolve(
     )
 
 
+def _load_input(
+    parent: PipelineStep,
+    get_output_method: Callable,
+    args: Sequence[Any],
+    kwargs: Dict[str, Any],
+    metadata: Dict[str, Any],
+    ignore_failure: bool = False,
+    verbose: bool = False,
+    stream: bool = False,
+) -> Any:
+    """Gets the output data of a single parent step.
+
+    Args:
+        parent: The parent step to get the output data of.
+        get_output_method: The method to get the output data with, as
+            resolved by :func:`_resolve`.
+        args: The ``*args`` to call the `get_output_method` with.
+        kwargs: The ``**kwargs`` to call the `get_output_method` with.
+        metadata: Metadata of the output data.
+        ignore_failure: See :func:`get_inputs`.
+        verbose: See :func:`get_inputs`.
+        stream: See :func:`get_inputs`.
+
+    Returns:
+        The output data of the parent step, ``None`` if the data could
+        not be retrieved and ``ignore_failure=True``.
+
+    Raises:
+        OutputNotFoundError: If the output data could not be retrieved
+            and ``ignore_failure=False``.
+    """
+    # Either raise an error on failure of getting output or continue
+    # with other steps.
+    try:
+        incoming_step_data = get_output_method(*args, stream=stream, **kwargs)
+    except error.OutputNotFoundError as e:
+        if not ignore_failure:
+            raise error.OutputNotFoundError(e)
+
+        incoming_step_data = None
+
+    if verbose:
+        parent_title = parent.properties["title"]
+        if incoming_step_data is None:
+            print(f'Failed to retrieve input from step: "{parent_title}"')
+        else:
+            print(f'Retrieved input from step: "{parent_title}"')
+
+    return incoming_step_data
+
+
+class _LazyInput:
+    """Loads the output data of a parent step on first access.
+
+    The loaded data is memoized, so that subsequent accesses do not
+    deserialize the data again.
+    """
+
+    _NOT_LOADED = object()
+
+    def __init__(self, get_output_method_info: Tuple, **load_input_kwargs) -> None:
+        self._get_output_method_info = get_output_method_info
+        self._load_input_kwargs = load_input_kwargs
+        self._data = _LazyInput._NOT_LOADED
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        return self._get_output_method_info[-1]
+
+    def load(self) -> Any:
+        if self._data is _LazyInput._NOT_LOADED:
+            self._data = _load_input(
+                *self._get_output_method_info, **self._load_input_kwargs
+            )
+        return self._data
+
+
+class _LazyUnnamedInputs(Sequence):
+    """Ordered sequence of unnamed inputs that are loaded on access."""
+
+    def __init__(self, lazy_inputs: List[_LazyInput]) -> None:
+        self._lazy_inputs = lazy_inputs
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [lazy_input.load() for lazy_input in self._lazy_inputs[index]]
+        return self._lazy_inputs[index].load()
+
+    def __len__(self) -> int:
+        return len(self._lazy_inputs)
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__}: {len(self)} inputs>"
+
+
+class _LazyInputs(Mapping):
+    """Input data of a step that is deserialized on access.
+
+    Behaves like the dictionary returned by :func:`get_inputs`, but the
+    data of a parent step is only retrieved and deserialized once it is
+    accessed by name (or by index in the ``"unnamed"`` list).
+    """
+
+    def __init__(self, get_output_methods: List[Tuple], **load_input_kwargs) -> None:
+        unnamed = []
+        self._named: Dict[str, _LazyInput] = {}
+        for get_output_method_info in get_output_methods:
+            lazy_input = _LazyInput(get_output_method_info, **load_input_kwargs)
+            name = lazy_input.metadata["name"]
+            if name == Config._RESERVED_UNNAMED_OUTPUTS_STR:
+                unnamed.append(lazy_input)
+            else:
+                self._named[name] = lazy_input
+        self._unnamed = _LazyUnnamedInputs(unnamed)
+
+    def __getitem__(self, name: str) -> Any:
+        if name == Config._RESERVED_UNNAMED_OUTPUTS_STR:
+            return self._unnamed
+        return self._named[name].load()
+
+    def __iter__(self):
+        yield Config._RESERVED_UNNAMED_OUTPUTS_STR
+        yield from self._named
+
+    def __len__(self) -> int:
+        return len(self._named) + 1
+
+    def __repr__(self) -> str:
+        names = [Config._RESERVED_UNNAMED_OUTPUTS_STR, *self._named]
+        return f"<{self.__class__.__name__}: {names}>"
+
+
 def get_inputs(
     ignore_failure: bool = False,
     verbose: bool = False,
-) -> Dict[str, Any]:
+    stream: bool = False,
+    lazy: bool = False,
+    max_workers: Optional[int] = None,
+    columns: Optional[Mapping[str, List[str]]] = None,
+    filter: Optional[Mapping[str, ds.Expression]] = None,
+) -> Mapping[str, Any]:
     """Gets all data sent from incoming steps.
 
     Warning:
@@ -648,6 +1749,38 @@ def get_inputs(
             :exc:`OutputNotFoundError`
         verbose: If ``True`` print all the steps from which the current
             step has retrieved data.
+        stream: If ``True``, then data that was outputted as a
+            ``pa.Table``, ``pa.RecordBatch`` or an iterator of
+            ``pa.RecordBatch`` is returned as a lazy
+            ``pa.RecordBatchStreamReader`` over the memory mapped data.
+            Iterating over the reader yields the record batches one by
+            one, so that the data never has to be loaded in its
+            entirety. Data outputted with ``format="parquet"`` or of
+            which the `columns` or rows are selected is returned as an
+            iterator of ``pa.RecordBatch`` instead. Other data is
+            returned as usual.
+        lazy: If ``True``, then the data of a parent step is only
+            retrieved once it is accessed, e.g. through
+            ``get_inputs(lazy=True)["my_name"]``, after which it is
+            cached. Useful when a step has many incoming steps but only
+            uses some of their data. Name collisions are still detected
+            when calling this function, but errors related to getting
+            the data itself are raised on access.
+        max_workers: The maximum number of threads to use to get the
+            data of the incoming steps concurrently. When ``None`` or
+            ``1``, the data is retrieved one step at a time. Has no
+            effect when ``lazy=True``.
+        columns: Mapping from the name of an input to the names of the
+            columns to read from it, e.g. ``{"features": ["a", "b"]}``.
+            Only supported for Arrow data and pandas objects stored as
+            Arrow data. When the data was outputted with
+            ``format="parquet"``, the other columns are never read.
+        filter: Mapping from the name of an input to an expression to
+            select its rows with, e.g.
+            ``{"features": pyarrow.dataset.field("a") > 3}``. Supported
+            for the same data as `columns`. When the data was outputted
+            with ``format="parquet"``, the filter is pushed down to the
+            reader so that row groups that cannot match are skipped.
 
     Returns:
         Dictionary with input data for this step. We differentiate
@@ -685,6 +1818,8 @@ def get_inputs(
             object store died (and therefore lost all its data).
         StepUUIDResolveError: The step's UUID cannot be resolved and
             thus it cannot determine what inputs to get.
+        ValueError: If `columns` or `filter` is given for an input that
+            does not support it.
     """
     global _get_inputs_called
     if not Config.silence_multiple_data_transfer_calls_warning and _get_inputs_called:
@@ -692,14 +1827,11 @@ def get_inputs(
     _get_inputs_called = True
 
     try:
-        with open(Config.PIPELINE_DEFINITION_PATH, "r") as f:
-            pipeline_definition = json.load(f)
+        pipeline = get_pipeline()
     except FileNotFoundError:
         raise error.PipelineDefinitionNotFoundError(
             f"Could not open {Config.PIPELINE_DEFINITION_PATH}."
         )
-
-    pipeline = Pipeline.from_json(pipeline_definition)
     try:
         step_uuid = get_step_uuid(pipeline)
     except error.StepUUIDResolveError:
@@ -727,6 +1859,12 @@ def get_inputs(
             )
             raise error.OutputNotFoundError(msg)
 
+        # Projections are pushed down to the reader of the data.
+        if columns is not None and metadata["name"] in columns:
+            kwargs = {**kwargs, "columns": columns[metadata["name"]]}
+        if filter is not None and metadata["name"] in filter:
+            kwargs = {**kwargs, "filter": filter[metadata["name"]]}
+
         # Maintain the output methods in order, but wait with calling
         # them so that we can first check for collisions.
         get_output_methods.append((parent, get_output_method, args, kwargs, metadata))
@@ -747,36 +1885,36 @@ def get_inputs(
             f"Name collisions between input data coming from different steps: {msg}"
         )
 
-    # TODO: maybe instead of for loop we could first get the receive
-    #       method and then do batch receive. For example memory allows
-    #       to do get_buffers which operates in batch.
     # NOTE: the order in which the `parents` list is traversed is
     # indirectly set in the UI. The order is important since it
     # determines the order in which unnamed inputs are received in
     # the next step.
-    data = {Config._RESERVED_UNNAMED_OUTPUTS_STR: []}  # type: Dict[str, Any]
-    for parent, get_output_method, args, kwargs, metadata in get_output_methods:
-
-        # Either raise an error on failure of getting output or
-        # continue with other steps.
-        try:
-            incoming_step_data = get_output_method(*args, **kwargs)
-        except error.OutputNotFoundError as e:
-            if not ignore_failure:
-                raise error.OutputNotFoundError(e)
+    load_input_kwargs = {
+        "ignore_failure": ignore_failure,
+        "verbose": verbose,
+        "stream": stream,
+    }
+    if lazy:
+        return _LazyInputs(get_output_methods, **load_input_kwargs)
 
-            incoming_step_data = None
+    def load_input(get_output_method_info: Tuple) -> Any:
+        return _load_input(*get_output_method_info, **load_input_kwargs)
 
-        if verbose:
-            parent_title = parent.properties["title"]
-            if incoming_step_data is None:
-                print(f'Failed to retrieve input from step: "{parent_title}"')
-            else:
-                print(f'Retrieved input from step: "{parent_title}"')
+    if max_workers is not None and max_workers > 1 and len(get_output_methods) > 1:
+        # NOTE: `map` returns the results in the order of the given
+        # iterable, thus the order of the unnamed inputs is preserved.
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            incoming_data = list(executor.map(load_input, get_output_methods))
+    else:
+        incoming_data = [load_input(info) for info in get_output_methods]
 
+    data = {Config._RESERVED_UNNAMED_OUTPUTS_STR: []}  # type: Dict[str, Any]
+    for get_output_method_info, incoming_step_data in zip(
+        get_output_methods, incoming_data
+    ):
         # Populate the return dictionary, where nameless data gets
         # appended to a list and named data becomes a (name, data) pair.
-        name = metadata["name"]
+        name = get_output_method_info[-1]["name"]
         if name == Config._RESERVED_UNNAMED_OUTPUTS_STR:
             data[Config._RESERVED_UNNAMED_OUTPUTS_STR].append(incoming_step_data)
         else:
@@ -788,6 +1926,8 @@ def get_inputs(
 def output(
     data: Any,
     name: Optional[str],
+    compression: Optional[Any] = None,
+    format: Optional[str] = None,
 ) -> None:
     """Outputs data so that it can be retrieved by the next step.
 
@@ -798,11 +1938,23 @@ def output(
         once.
 
     Args:
-        data: Data to output.
+        data: Data to output. An iterator (or generator) of
+            ``pa.RecordBatch`` objects is written to disk batch by
+            batch, without ever holding all the data in memory.
         name: Name of the output data. As a string, it becomes the name
             of the data, when ``None``, the data is considered nameless.
             This affects the way the data can be later retrieved using
             :func:`get_inputs`.
+        compression: Compression codec to compress the data with, either
+            a member of :class:`Compression` or its name, e.g.
+            ``"zstd"``. Defaults to ``Config.DATA_PASSING_COMPRESSION``.
+            Decompression is taken care of by :func:`get_inputs`.
+        format: Format to output the data in. By default, it is
+            inferred from the `data`. With ``"parquet"``, Arrow data,
+            pandas objects and iterators of ``pa.RecordBatch`` are
+            written as a Parquet dataset, which allows the receiving
+            steps to only read the columns and rows they need, see the
+            `columns` and `filter` arguments of :func:`get_inputs`.
 
     Raises:
         DataInvalidNameError: The name of the output data is invalid,
@@ -814,6 +1966,10 @@ def output(
             store died.
         StepUUIDResolveError: The step's UUID cannot be resolved and
             thus data cannot be outputted.
+        SerializationError: If the data could not be serialized, e.g.
+            because it cannot be written as Parquet.
+        ValueError: If the specified compression or format is not
+            supported.
 
     Example:
         >>> data = "Data I would like to use in my next step"
@@ -827,6 +1983,8 @@ def output(
     return output_to_disk(
         data,
         name,
+        compression=compression,
+        format=format,
     )
 
 
@@ -1,7 +1,8 @@
 import json
 import os
+import time
 import urllib
-from typing import Any, Dict
+from typing import Any, Dict, Optional, Tuple
 
 from orchest.config import Config
 from orchest.error import OrchestNetworkError, StepUUIDResolveError
@@ -55,9 +56,50 @@ def get_step_uuid(pipeline: Pipeline) -> str:
             " executing Pipeline Steps in Environment shells."
         )
 
+    notebook_path = _get_kernel_notebook_path(kernel_id, pipeline)
+
+    for step in pipeline.steps:
+        # Compare basenames, one pipeline can not have duplicate
+        # notebook names, so this should work
+        if os.path.basename(step.properties["file_path"]) == os.path.basename(
+            notebook_path
+        ):
+            # NOTE: the UUID cannot be cached here. Because if the
+            # notebook is assigned to a different step, then the env
+            # variable does not change and thus the notebooks wrongly
+            # thinks it is a different step. Only the notebook path of
+            # the kernel is cached, the pipeline is always consulted.
+            return step.properties["uuid"]
+
+    raise StepUUIDResolveError(f'No step with "notebook_path": {notebook_path}.')
+
+
+# Maps (kernel id, session uuid) to (notebook path, time of caching).
+_kernel_notebook_path_cache: Dict[Tuple[str, str], Tuple[str, float]] = {}
+
+
+def _get_kernel_notebook_path(kernel_id: str, pipeline: Pipeline) -> str:
+    """Gets the path of the notebook the given kernel is running for.
+
+    The path is resolved through the JupyterLab sessions of the
+    interactive session and is cached for
+    ``Config.KERNEL_NOTEBOOK_PATH_TTL`` seconds, so that repeated calls
+    do not each make a request.
+
+    Raises:
+        StepUUIDResolveError: No Jupyter session has a kernel with the
+            given id.
+    """
+    session_uuid = Config.PROJECT_UUID[:18] + pipeline.properties["uuid"][:18]
+
+    cached = _kernel_notebook_path_cache.get((kernel_id, session_uuid))
+    if cached is not None:
+        notebook_path, cached_at = cached
+        if time.monotonic() - cached_at < Config.KERNEL_NOTEBOOK_PATH_TTL:
+            return notebook_path
+
     # Get JupyterLab sessions to resolve the step's UUID via the id of
     # the running kernel and the step's associated file path.
-    session_uuid = Config.PROJECT_UUID[:18] + pipeline.properties["uuid"][:18]
     jupyter_sessions = _request_json(
         f"http://jupyter-server-{session_uuid}/jupyter-server-{session_uuid}/"
         "api/sessions"
@@ -73,25 +115,43 @@ def get_step_uuid(pipeline: Pipeline) -> str:
             f'"KERNEL_ID" of this step: {kernel_id}.'
         )
 
-    for step in pipeline.steps:
-        # Compare basenames, one pipeline can not have duplicate
-        # notebook names, so this should work
-        if os.path.basename(step.properties["file_path"]) == os.path.basename(
-            notebook_path
-        ):
-            # NOTE: the UUID cannot be cached here. Because if the
-            # notebook is assigned to a different step, then the env
-            # variable does not change and thus the notebooks wrongly
-            # thinks it is a different step.
-            return step.properties["uuid"]
+    _kernel_notebook_path_cache[(kernel_id, session_uuid)] = (
+        notebook_path,
+        time.monotonic(),
+    )
+    return notebook_path
 
-    raise StepUUIDResolveError(f'No step with "notebook_path": {notebook_path}.')
+
+# Maps the path of a pipeline definition file to the (mtime, size,
+# inode) of the file and the pipeline parsed from it.
+_pipeline_cache: Dict[str, Tuple[Tuple[int, int, int], Pipeline]] = {}
 
 
 def get_pipeline() -> Pipeline:
-    with open(Config.PIPELINE_DEFINITION_PATH, "r") as f:
+    """Gets the pipeline of ``Config.PIPELINE_DEFINITION_PATH``.
+
+    The parsed pipeline is cached for as long as the file does not
+    change, i.e. as long as its modification time, size and inode stay
+    the same. Thus the returned pipeline should not be modified.
+
+    Raises:
+        FileNotFoundError: If the pipeline definition file does not
+            exist.
+    """
+    path = Config.PIPELINE_DEFINITION_PATH
+    stat = os.stat(path)
+    file_id = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+    cached: Optional[Tuple[Tuple[int, int, int], Pipeline]] = _pipeline_cache.get(path)
+    if cached is not None and cached[0] == file_id:
+        return cached[1]
+
+    with open(path, "r") as f:
         pipeline_definition = json.load(f)
-    return Pipeline.from_json(pipeline_definition)
+    pipeline = Pipeline.from_json(pipeline_definition)
+
+    _pipeline_cache[path] = (file_id, pipeline)
+    return pipeline
 
 
 def _request_json(url: str) -> Dict[Any, Any]:
@@ -0,0 +1,26 @@
+import json
+import os
+from unittest.mock import patch
+
+import orchest
+from orchest import parameters
+
+
+@patch.dict(os.environ, {"ORCHEST_STEP_UUID": "uuid-1______________"})
+def test_params_are_copies(tmp_path):
+    with open("tests/userdir/pipeline-basic.json", "r") as f:
+        pipeline_definition = json.load(f)
+    pipeline_definition["parameters"] = {"y": {"nested": 1}}
+    pipeline_definition["steps"]["uuid-1______________"]["parameters"] = {"x": 1}
+    path = str(tmp_path / "pipeline.json")
+    with open(path, "w") as f:
+        json.dump(pipeline_definition, f)
+    orchest.Config.PIPELINE_DEFINITION_PATH = path
+
+    step_params, pipeline_params = parameters.get_params()
+    step_params["x"] = 999
+    pipeline_params["y"]["nested"] = 999
+    parameters.get_pipeline_param("y")["nested"] = 999
+
+    assert parameters.get_step_param("x") == 1
+    assert parameters.get_pipeline_param("y") == {"nested": 1}
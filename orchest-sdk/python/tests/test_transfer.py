@@ -1,16 +1,19 @@
 """
 uuid-1, uuid-3 --> uuid-2
 """
+import os
 import time
 from unittest.mock import patch
 
 import numpy as np
 import pandas as pd
 import pyarrow as pa
+import pyarrow.dataset as ds
 import pytest
 
 import orchest
 from orchest import transfer
+from orchest.memory_store import MemoryStore
 
 KILOBYTE = 1 << 10
 MEGABYTE = KILOBYTE * KILOBYTE
@@ -20,6 +23,14 @@ PLASMA_KILOBYTES = 10
 PLASMA_STORE_CAPACITY = PLASMA_KILOBYTES * KILOBYTE
 
 
+@pytest.fixture
+def memory_store(tmp_path):
+    with patch("orchest.Config.MEMORY_STORE_DIR", str(tmp_path)), patch(
+        "orchest.memory_store.MemoryStore.capacity", PLASMA_STORE_CAPACITY
+    ):
+        yield MemoryStore(str(tmp_path))
+
+
 def generate_data(total_size):
     nrows = int(total_size / np.dtype("float64").itemsize)
     return np.random.randn(nrows)
@@ -95,11 +106,11 @@ class CustomClass:
 )
 @patch("orchest.transfer.get_step_uuid")
 @patch("orchest.Config.STEP_DATA_DIR", "tests/userdir/.data/{step_uuid}")
-def test_disk(mock_get_step_uuid, data_1, test_transfer, plasma_store):
+def test_disk(mock_get_step_uuid, data_1, test_transfer, memory_store):
     orchest.Config.PIPELINE_DEFINITION_PATH = "tests/userdir/pipeline-basic.json"
 
     # Do as if we are uuid-1. Note the trailing underscores. This is to
-    # make the plasma.ObjectID the required 20 characters.
+    # keep the UUIDs in line with the other tests.
     mock_get_step_uuid.return_value = "uuid-1______________"
 
     test_transfer["method"](data_1, **test_transfer["kwargs"])
@@ -158,11 +169,11 @@ def test_disk(mock_get_step_uuid, data_1, test_transfer, plasma_store):
 )
 @patch("orchest.transfer.get_step_uuid")
 @patch("orchest.Config.STEP_DATA_DIR", "tests/userdir/.data/{step_uuid}")
-def test_memory(mock_get_step_uuid, data_1, test_transfer, plasma_store):
+def test_memory(mock_get_step_uuid, data_1, test_transfer, memory_store):
     orchest.Config.PIPELINE_DEFINITION_PATH = "tests/userdir/pipeline-basic.json"
 
     # Do as if we are uuid-1. Note the trailing underscores. This is to
-    # make the plasma.ObjectID the required 20 characters.
+    # keep the UUIDs in line with the other tests.
     mock_get_step_uuid.return_value = "uuid-1______________"
     test_transfer["method"](data_1, **test_transfer["kwargs"])
 
@@ -187,7 +198,7 @@ def test_memory(mock_get_step_uuid, data_1, test_transfer, plasma_store):
 
 @patch("orchest.transfer.get_step_uuid")
 @patch("orchest.Config.STEP_DATA_DIR", "tests/userdir/.data/{step_uuid}")
-def test_memory_out_of_memory(mock_get_step_uuid, plasma_store):
+def test_memory_out_of_memory(mock_get_step_uuid, memory_store):
     data_1 = generate_data((PLASMA_KILOBYTES + 1) * KILOBYTE)
     ser_data, _ = transfer._serialize(data_1)
     data_size = ser_data.size
@@ -208,7 +219,7 @@ def test_memory_out_of_memory(mock_get_step_uuid, plasma_store):
 
 @patch("orchest.transfer.get_step_uuid")
 @patch("orchest.Config.STEP_DATA_DIR", "tests/userdir/.data/{step_uuid}")
-def test_memory_disk_fallback(mock_get_step_uuid, plasma_store):
+def test_memory_disk_fallback(mock_get_step_uuid, memory_store):
     orchest.Config.PIPELINE_DEFINITION_PATH = "tests/userdir/pipeline-basic.json"
 
     # Do as if we are uuid-1
@@ -231,9 +242,30 @@ def test_memory_disk_fallback(mock_get_step_uuid, plasma_store):
     assert (input_data == data_1).all()
 
 
+@pytest.mark.parametrize("compression", ["lz4", "zstd"])
+@patch("orchest.transfer.get_step_uuid")
+@patch("orchest.Config.STEP_DATA_DIR", "tests/userdir/.data/{step_uuid}")
+def test_memory_disk_fallback_with_compression(
+    mock_get_step_uuid, memory_store, compression
+):
+    orchest.Config.PIPELINE_DEFINITION_PATH = "tests/userdir/pipeline-basic.json"
+
+    # Do as if we are uuid-1
+    data_1 = generate_data((PLASMA_KILOBYTES + 1) * KILOBYTE)
+    mock_get_step_uuid.return_value = "uuid-1______________"
+    with patch("orchest.Config.DATA_PASSING_COMPRESSION", compression):
+        transfer.output_to_memory(data_1, name=None, disk_fallback=True)
+
+    # Do as if we are uuid-2
+    mock_get_step_uuid.return_value = "uuid-2______________"
+    input_data = transfer.get_inputs()
+    input_data = input_data[orchest.Config._RESERVED_UNNAMED_OUTPUTS_STR][0]
+    assert (input_data == data_1).all()
+
+
 @patch("orchest.transfer.get_step_uuid")
 @patch("orchest.Config.STEP_DATA_DIR", "tests/userdir/.data/{step_uuid}")
-def test_memory_pickle_fallback_and_disk_fallback(mock_get_step_uuid, plasma_store):
+def test_memory_pickle_fallback_and_disk_fallback(mock_get_step_uuid, memory_store):
     data_1 = [CustomClass(generate_data(KILOBYTE)) for _ in range(PLASMA_KILOBYTES + 1)]
     serialized, _ = transfer._serialize(data_1)
     assert serialized.size > PLASMA_STORE_CAPACITY
@@ -257,7 +289,7 @@ def test_memory_pickle_fallback_and_disk_fallback(mock_get_step_uuid, plasma_sto
 
 @patch("orchest.transfer.get_step_uuid")
 @patch("orchest.Config.STEP_DATA_DIR", "tests/userdir/.data/{step_uuid}")
-def test_resolve_disk_then_memory(mock_get_step_uuid, plasma_store):
+def test_resolve_disk_then_memory(mock_get_step_uuid, memory_store):
     orchest.Config.PIPELINE_DEFINITION_PATH = "tests/userdir/pipeline-basic.json"
 
     # Do as if we are uuid-1.
@@ -288,7 +320,7 @@ def test_resolve_disk_then_memory(mock_get_step_uuid, plasma_store):
 
 @patch("orchest.transfer.get_step_uuid")
 @patch("orchest.Config.STEP_DATA_DIR", "tests/userdir/.data/{step_uuid}")
-def test_resolve_memory_then_disk(mock_get_step_uuid, plasma_store):
+def test_resolve_memory_then_disk(mock_get_step_uuid, memory_store):
     orchest.Config.PIPELINE_DEFINITION_PATH = "tests/userdir/pipeline-basic.json"
 
     # Do as if we are uuid-1.
@@ -318,7 +350,7 @@ def test_resolve_memory_then_disk(mock_get_step_uuid, plasma_store):
 
 @patch("orchest.transfer.get_step_uuid")
 @patch("orchest.Config.STEP_DATA_DIR", "tests/userdir/.data/{step_uuid}")
-def test_receive_input_order(mock_get_step_uuid, plasma_store):
+def test_receive_input_order(mock_get_step_uuid, memory_store):
     """Test the order of the inputs of the receiving step.
 
     Note that the order in which the data is output does not determine
@@ -347,7 +379,7 @@ def test_receive_input_order(mock_get_step_uuid, plasma_store):
 
 @patch("orchest.transfer.get_step_uuid")
 @patch("orchest.Config.STEP_DATA_DIR", "tests/userdir/.data/{step_uuid}")
-def test_receive_multiple_named_inputs(mock_get_step_uuid, plasma_store):
+def test_receive_multiple_named_inputs(mock_get_step_uuid, memory_store):
     """Test receiving multiple named inputs."""
     orchest.Config.PIPELINE_DEFINITION_PATH = "tests/userdir/pipeline-order.json"
 
@@ -393,3 +425,479 @@ def test_output_no_memory_store(mock_get_step_uuid):
     input_data = transfer.get_inputs()
     input_data = input_data[orchest.Config._RESERVED_UNNAMED_OUTPUTS_STR][0]
     assert (input_data == data_1).all()
+
+
+@patch("orchest.transfer.get_step_uuid")
+@patch("orchest.Config.STEP_DATA_DIR", "tests/userdir/.data/{step_uuid}")
+def test_output_record_batch_stream(mock_get_step_uuid):
+    orchest.Config.PIPELINE_DEFINITION_PATH = "tests/userdir/pipeline-basic.json"
+
+    def batches():
+        for _ in range(3):
+            yield get_test_record_batch()
+
+    # Do as if we are uuid-1
+    mock_get_step_uuid.return_value = "uuid-1______________"
+    transfer.output(batches(), name="stream")
+
+    # Do as if we are uuid-2
+    mock_get_step_uuid.return_value = "uuid-2______________"
+    input_data = transfer.get_inputs()["stream"]
+    assert input_data.equals(pa.Table.from_batches(list(batches())))
+
+    reader = transfer.get_inputs(stream=True)["stream"]
+    assert isinstance(reader, pa.RecordBatchStreamReader)
+    assert [batch.equals(get_test_record_batch()) for batch in reader] == [True] * 3
+
+
+@patch("orchest.transfer.get_step_uuid")
+@patch("orchest.Config.STEP_DATA_DIR", "tests/userdir/.data/{step_uuid}")
+def test_output_record_batch_stream_invalid(mock_get_step_uuid):
+    orchest.Config.PIPELINE_DEFINITION_PATH = "tests/userdir/pipeline-basic.json"
+    mock_get_step_uuid.return_value = "uuid-1______________"
+
+    with pytest.raises(orchest.error.SerializationError):
+        transfer.output(iter([]), name=None)
+
+    with pytest.raises(orchest.error.SerializationError):
+        transfer.output(iter([1, 2, 3]), name=None)
+
+
+@patch("orchest.transfer.get_step_uuid")
+def test_output_record_batch_stream_failure_keeps_output(mock_get_step_uuid, tmp_path):
+    orchest.Config.PIPELINE_DEFINITION_PATH = "tests/userdir/pipeline-basic.json"
+
+    def batches():
+        yield get_test_record_batch()
+        yield pa.RecordBatch.from_pydict({"other": [1]})
+
+    with patch("orchest.Config.STEP_DATA_DIR", str(tmp_path / "{step_uuid}")):
+        mock_get_step_uuid.return_value = "uuid-1______________"
+        transfer.output("previous", name="data")
+        with pytest.raises(orchest.error.SerializationError):
+            transfer.output(batches(), name="data")
+
+        mock_get_step_uuid.return_value = "uuid-2______________"
+        assert transfer.get_inputs()["data"] == "previous"
+
+
+@patch(
+    "orchest.transfer._deserialize_output_disk", wraps=transfer._deserialize_output_disk
+)
+@patch("orchest.transfer.get_step_uuid")
+@patch("orchest.Config.STEP_DATA_DIR", "tests/userdir/.data/{step_uuid}")
+def test_get_inputs_lazy(mock_get_step_uuid, mock_deserialize):
+    orchest.Config.PIPELINE_DEFINITION_PATH = "tests/userdir/pipeline-order.json"
+
+    # Do as if we are uuid-3
+    data_3 = generate_data(KILOBYTE)
+    mock_get_step_uuid.return_value = "uuid-3______________"
+    transfer.output(data_3, name=None)
+
+    # Do as if we are uuid-1
+    data_1 = generate_data(KILOBYTE)
+    mock_get_step_uuid.return_value = "uuid-1______________"
+    transfer.output(data_1, name="output1")
+
+    # Do as if we are uuid-2
+    mock_get_step_uuid.return_value = "uuid-2______________"
+    input_data = transfer.get_inputs(lazy=True)
+    assert set(input_data) == {orchest.Config._RESERVED_UNNAMED_OUTPUTS_STR, "output1"}
+    assert not mock_deserialize.called
+
+    assert (input_data["output1"] == data_1).all()
+    assert (input_data["output1"] == data_1).all()
+    assert mock_deserialize.call_count == 1
+
+    unnamed = input_data[orchest.Config._RESERVED_UNNAMED_OUTPUTS_STR]
+    assert len(unnamed) == 1
+    assert mock_deserialize.call_count == 1
+    assert (unnamed[0] == data_3).all()
+    assert mock_deserialize.call_count == 2
+
+
+@patch("orchest.transfer.get_step_uuid")
+@patch("orchest.Config.STEP_DATA_DIR", "tests/userdir/.data/{step_uuid}")
+def test_get_inputs_max_workers(mock_get_step_uuid):
+    orchest.Config.PIPELINE_DEFINITION_PATH = "tests/userdir/pipeline-order.json"
+
+    # Do as if we are uuid-3
+    data_3 = generate_data(KILOBYTE)
+    mock_get_step_uuid.return_value = "uuid-3______________"
+    transfer.output(data_3, name=None)
+
+    # Do as if we are uuid-1
+    data_1 = generate_data(KILOBYTE)
+    mock_get_step_uuid.return_value = "uuid-1______________"
+    transfer.output(data_1, name=None)
+
+    # Do as if we are uuid-2
+    mock_get_step_uuid.return_value = "uuid-2______________"
+    input_data = transfer.get_inputs(max_workers=2)
+    input_data = input_data[orchest.Config._RESERVED_UNNAMED_OUTPUTS_STR]
+    assert (input_data[0] == data_1).all()
+    assert (input_data[1] == data_3).all()
+
+
+@pytest.mark.parametrize("compression", ["lz4", "zstd"])
+@pytest.mark.parametrize(
+    "data_1",
+    [generate_data(KILOBYTE), get_test_record_batch(), get_test_table()],
+    ids=["basic", "record_batch", "table"],
+)
+@patch("orchest.transfer.get_step_uuid")
+@patch("orchest.Config.STEP_DATA_DIR", "tests/userdir/.data/{step_uuid}")
+def test_disk_compression(mock_get_step_uuid, data_1, compression):
+    orchest.Config.PIPELINE_DEFINITION_PATH = "tests/userdir/pipeline-basic.json"
+
+    # Do as if we are uuid-1
+    mock_get_step_uuid.return_value = "uuid-1______________"
+    transfer.output(data_1, name="compressed", compression=compression)
+
+    # Do as if we are uuid-2
+    mock_get_step_uuid.return_value = "uuid-2______________"
+    input_data = transfer.get_inputs()["compressed"]
+
+    if isinstance(data_1, (pa.RecordBatch, pa.Table)):
+        assert input_data.equals(data_1)
+    else:
+        assert (input_data == data_1).all()
+
+
+def test_interpret_metadata():
+    sep = orchest.Config.__METADATA_SEPARATOR__
+    timestamp = "2021-01-01T00:00:00"
+
+    # Metadata written to disk by previous versions of the SDK.
+    metadata = sep.join([timestamp, "PICKLE", "name"])
+    assert transfer._interpret_metadata(metadata) == (
+        timestamp,
+        "PICKLE",
+        "name",
+        "NONE",
+    )
+
+    metadata = sep.join([timestamp, "PICKLE", "name", "ZSTD"])
+    assert transfer._interpret_metadata(metadata)[-1] == "ZSTD"
+
+    # Metadata stored in memory, starting with an internal flag.
+    metadata = sep.join(["1", timestamp, "PICKLE", "name"])
+    assert transfer._interpret_metadata(metadata) == (
+        timestamp,
+        "PICKLE",
+        "name",
+        "NONE",
+    )
+
+    with pytest.raises(orchest.error.InvalidMetaDataError):
+        transfer._interpret_metadata(sep.join([timestamp, "PICKLE", "name", "GZIP"]))
+
+
+@pytest.mark.parametrize(
+    "data_1",
+    [
+        generate_data(MEGABYTE),
+        {"a": generate_data(MEGABYTE), "b": generate_data(KILOBYTE)},
+        # Data frames that cannot be converted to Arrow are pickled.
+        pd.DataFrame({"C1": generate_data(MEGABYTE), "C2": [{}] * (MEGABYTE // 8)}),
+    ],
+    ids=["ndarray", "dict", "pandas-objects"],
+)
+@patch("orchest.transfer.get_step_uuid")
+@patch("orchest.Config.STEP_DATA_DIR", "tests/userdir/.data/{step_uuid}")
+def test_disk_pickle_oob(mock_get_step_uuid, data_1):
+    _, serialization = transfer._serialize(data_1)
+    assert serialization == transfer.Serialization.PICKLE_OOB
+
+    orchest.Config.PIPELINE_DEFINITION_PATH = "tests/userdir/pipeline-basic.json"
+
+    # Do as if we are uuid-1
+    mock_get_step_uuid.return_value = "uuid-1______________"
+    transfer.output(data_1, name=None)
+
+    # Do as if we are uuid-2
+    mock_get_step_uuid.return_value = "uuid-2______________"
+    input_data = transfer.get_inputs()
+    input_data = input_data[orchest.Config._RESERVED_UNNAMED_OUTPUTS_STR][0]
+
+    if isinstance(data_1, pd.DataFrame):
+        assert input_data.equals(data_1)
+    elif isinstance(data_1, dict):
+        assert all((input_data[k] == data_1[k]).all() for k in data_1)
+    else:
+        assert (input_data == data_1).all()
+        # The data is memory mapped copy-on-write, thus writable.
+        input_data[0] = 0
+        assert input_data[0] == 0
+
+
+@pytest.mark.parametrize(
+    "data_1",
+    [
+        pd.DataFrame({"C1": np.arange(10), "C2": np.random.randn(10)}),
+        pd.DataFrame(
+            {"C1": pd.Categorical(["a", "b"] * 5)}, index=pd.Index(range(10, 20))
+        ),
+        pd.Series(np.random.randn(10), name="my-series"),
+        pd.Series(np.random.randn(10)),
+    ],
+    ids=["dataframe", "categorical", "series", "series-unnamed"],
+)
+@patch("orchest.transfer.get_step_uuid")
+@patch("orchest.Config.STEP_DATA_DIR", "tests/userdir/.data/{step_uuid}")
+def test_disk_arrow_pandas(mock_get_step_uuid, data_1):
+    _, serialization = transfer._serialize(data_1)
+    assert serialization == transfer.Serialization.ARROW_PANDAS
+
+    orchest.Config.PIPELINE_DEFINITION_PATH = "tests/userdir/pipeline-basic.json"
+
+    # Do as if we are uuid-1
+    mock_get_step_uuid.return_value = "uuid-1______________"
+    transfer.output(data_1, name=None)
+
+    # Do as if we are uuid-2
+    mock_get_step_uuid.return_value = "uuid-2______________"
+    input_data = transfer.get_inputs()
+    input_data = input_data[orchest.Config._RESERVED_UNNAMED_OUTPUTS_STR][0]
+
+    assert type(input_data) is type(data_1)
+    assert input_data.equals(data_1)
+    if isinstance(data_1, pd.Series):
+        assert input_data.name == data_1.name
+
+
+def test_serialize_pandas_fallback():
+    _, serialization = transfer._serialize(generate_pandas_df(20))
+    assert serialization == transfer.Serialization.PICKLE
+
+
+@patch("orchest.transfer.get_step_uuid")
+@patch("orchest.Config.STEP_DATA_DIR", "tests/userdir/.data/{step_uuid}")
+@pytest.mark.parametrize("auto_eviction", [True, False])
+def test_memory_eviction(mock_get_step_uuid, memory_store, auto_eviction):
+    orchest.Config.PIPELINE_DEFINITION_PATH = "tests/userdir/pipeline-basic.json"
+    pipeline = orchest.utils.get_pipeline()
+    settings = {"auto_eviction": auto_eviction}
+
+    # Do as if we are uuid-1
+    data_1 = generate_data(KILOBYTE)
+    mock_get_step_uuid.return_value = "uuid-1______________"
+    transfer.output_to_memory(data_1, name=None)
+    object_dir = memory_store.get_object_dir("uuid-1______________")
+    assert os.path.isdir(object_dir)
+
+    # Do as if we are uuid-2, which is the only consumer of uuid-1.
+    mock_get_step_uuid.return_value = "uuid-2______________"
+    with patch.dict(pipeline.properties, {"settings": settings}):
+        input_data = transfer.get_inputs()
+
+    input_data = input_data[orchest.Config._RESERVED_UNNAMED_OUTPUTS_STR][0]
+    assert (input_data == data_1).all()
+    assert os.path.isdir(object_dir) != auto_eviction
+
+
+@patch("orchest.transfer.get_step_uuid")
+@patch("orchest.Config.STEP_DATA_DIR", "tests/userdir/.data/{step_uuid}")
+def test_memory_lru_eviction(mock_get_step_uuid, memory_store):
+    orchest.Config.PIPELINE_DEFINITION_PATH = "tests/userdir/pipeline-order.json"
+
+    # Together the outputs exceed the capacity of the store.
+    data_size = PLASMA_STORE_CAPACITY * 2 // 3
+    for step_uuid in ["uuid-3______________", "uuid-1______________"]:
+        mock_get_step_uuid.return_value = step_uuid
+        transfer.output_to_memory(generate_data(data_size), name=None)
+
+    assert not os.path.isdir(memory_store.get_object_dir("uuid-3______________"))
+    assert os.path.isdir(memory_store.get_object_dir("uuid-1______________"))
+
+
+@patch("orchest.transfer.get_step_uuid")
+@patch("orchest.Config.STEP_DATA_DIR", "tests/userdir/.data/{step_uuid}")
+@pytest.mark.parametrize(
+    "auto_eviction, session_type, evicted",
+    [
+        (True, "noninteractive", True),
+        (False, "noninteractive", False),
+        # Steps of interactive runs can be rerun.
+        (True, "interactive", False),
+    ],
+)
+def test_disk_eviction(mock_get_step_uuid, auto_eviction, session_type, evicted):
+    orchest.Config.PIPELINE_DEFINITION_PATH = "tests/userdir/pipeline-basic.json"
+    pipeline = orchest.utils.get_pipeline()
+    settings = {"auto_eviction": auto_eviction}
+
+    # Do as if we are uuid-1
+    data_1 = generate_data(KILOBYTE)
+    mock_get_step_uuid.return_value = "uuid-1______________"
+    transfer.output_to_disk(data_1, name=None)
+    step_data_dir = orchest.Config.get_step_data_dir("uuid-1______________")
+
+    # Do as if we are uuid-2, which is the only consumer of uuid-1.
+    mock_get_step_uuid.return_value = "uuid-2______________"
+    with patch.dict(pipeline.properties, {"settings": settings}), patch(
+        "orchest.Config.SESSION_TYPE", session_type
+    ):
+        input_data = transfer.get_inputs()
+
+    input_data = input_data[orchest.Config._RESERVED_UNNAMED_OUTPUTS_STR][0]
+    assert (input_data == data_1).all()
+    consumer_file = os.path.join(
+        step_data_dir, orchest.Config._CONSUMERS_DIR_NAME, "uuid-2______________"
+    )
+    assert os.path.isfile(consumer_file) != evicted
+    assert os.path.isdir(step_data_dir) != evicted
+
+    # Outputting again resets the consumers.
+    mock_get_step_uuid.return_value = "uuid-1______________"
+    transfer.output_to_disk(data_1, name=None)
+    assert not os.path.exists(consumer_file)
+
+
+@pytest.mark.parametrize(
+    "data_1",
+    [
+        get_test_table(),
+        get_test_record_batch(),
+        get_test_table().to_pandas(),
+        iter([get_test_record_batch(), get_test_record_batch()]),
+    ],
+    ids=["pa.Table", "pa.RecordBatch", "pd.DataFrame", "stream"],
+)
+@patch("orchest.transfer.get_step_uuid")
+@patch("orchest.Config.STEP_DATA_DIR", "tests/userdir/.data/{step_uuid}")
+def test_disk_parquet(mock_get_step_uuid, data_1):
+    orchest.Config.PIPELINE_DEFINITION_PATH = "tests/userdir/pipeline-basic.json"
+
+    # Do as if we are uuid-1
+    mock_get_step_uuid.return_value = "uuid-1______________"
+    transfer.output(data_1, name="features", format="parquet")
+
+    # Do as if we are uuid-2
+    mock_get_step_uuid.return_value = "uuid-2______________"
+    input_data = transfer.get_inputs(
+        columns={"features": ["f0", "f1"]},
+        filter={"features": ds.field("f0") > 2},
+    )["features"]
+
+    if isinstance(data_1, pd.DataFrame):
+        # Filtering rows does not preserve a RangeIndex.
+        expected = data_1.loc[data_1["f0"] > 2, ["f0", "f1"]].reset_index(drop=True)
+        assert input_data.equals(expected)
+    else:
+        assert input_data.column_names == ["f0", "f1"]
+        assert input_data.column("f0").to_pylist()[:2] == [3, 4]
+
+
+@pytest.mark.parametrize(
+    "previous, format",
+    [("previous", None), (get_test_table(), "parquet")],
+    ids=["pickle", "parquet"],
+)
+@patch("orchest.transfer.get_step_uuid")
+def test_disk_parquet_failure_keeps_output(
+    mock_get_step_uuid, previous, format, tmp_path
+):
+    orchest.Config.PIPELINE_DEFINITION_PATH = "tests/userdir/pipeline-basic.json"
+
+    def batches():
+        yield get_test_record_batch()
+        yield pa.RecordBatch.from_pydict({"other": [1]})
+
+    with patch("orchest.Config.STEP_DATA_DIR", str(tmp_path / "{step_uuid}")):
+        mock_get_step_uuid.return_value = "uuid-1______________"
+        transfer.output(previous, name="data", format=format)
+        with pytest.raises(orchest.error.SerializationError):
+            transfer.output(batches(), name="data", format="parquet")
+
+        mock_get_step_uuid.return_value = "uuid-2______________"
+        input_data = transfer.get_inputs()["data"]
+        if isinstance(previous, str):
+            assert input_data == previous
+        else:
+            assert input_data.equals(previous)
+
+
+@patch("orchest.transfer.get_step_uuid")
+@patch("orchest.Config.STEP_DATA_DIR", "tests/userdir/.data/{step_uuid}")
+def test_disk_projection(mock_get_step_uuid):
+    orchest.Config.PIPELINE_DEFINITION_PATH = "tests/userdir/pipeline-basic.json"
+
+    # Do as if we are uuid-1
+    mock_get_step_uuid.return_value = "uuid-1______________"
+    transfer.output(get_test_table(), name="table")
+
+    # Do as if we are uuid-2
+    mock_get_step_uuid.return_value = "uuid-2______________"
+    input_data = transfer.get_inputs(
+        columns={"table": ["f1"]}, filter={"table": ds.field("f0") < 3}
+    )["table"]
+    assert input_data.equals(pa.table({"f1": ["foo", "bar"]}))
+
+    batches = transfer.get_inputs(columns={"table": ["f2"]}, stream=True)["table"]
+    assert pa.Table.from_batches(list(batches)).equals(get_test_table().select(["f2"]))
+
+    # Projections are not supported for pickled data.
+    mock_get_step_uuid.return_value = "uuid-1______________"
+    transfer.output({"f0": [1, 2]}, name="table")
+    mock_get_step_uuid.return_value = "uuid-2______________"
+    with pytest.raises(ValueError):
+        transfer.get_inputs(columns={"table": ["f0"]})
+
+
+@patch("orchest.transfer.get_step_uuid")
+@patch("orchest.Config.STEP_DATA_DIR", "tests/userdir/.data/{step_uuid}")
+@patch("orchest.Config.STEP_CACHE_DIR", "tests/userdir/.cache/{step_uuid}")
+def test_disk_cache(mock_get_step_uuid):
+    orchest.Config.PIPELINE_DEFINITION_PATH = "tests/userdir/pipeline-basic.json"
+    mock_get_step_uuid.return_value = "uuid-1______________"
+    cache_dir = "tests/userdir/.cache/uuid-1______________"
+
+    with patch("orchest.Config.STEP_FINGERPRINT", "fingerprint-1"):
+        transfer.output_to_disk("old", name="data")
+    with patch("orchest.Config.STEP_FINGERPRINT", "fingerprint-2"):
+        transfer.output_to_disk("new", name="data")
+
+    # Only the most recent output is kept.
+    assert os.listdir(cache_dir) == ["fingerprint-2"]
+    cached = os.path.join(cache_dir, "fingerprint-2")
+    assert sorted(os.listdir(cached)) == sorted(
+        os.listdir("tests/userdir/.data/uuid-1______________")
+    )
+
+    # The output in the data directory is untouched by the cache.
+    mock_get_step_uuid.return_value = "uuid-2______________"
+    assert transfer.get_inputs()["data"] == "new"
+    assert os.listdir(cache_dir) == ["fingerprint-2"]
+
+
+@patch("orchest.transfer.get_step_uuid")
+def test_disk_cache_is_not_overwritten(mock_get_step_uuid, tmp_path):
+    orchest.Config.PIPELINE_DEFINITION_PATH = "tests/userdir/pipeline-basic.json"
+    mock_get_step_uuid.return_value = "uuid-1______________"
+    data_dir = str(tmp_path / "data" / "uuid-1______________")
+    cached = str(tmp_path / "cache" / "uuid-1______________" / "fingerprint-1")
+
+    with patch(
+        "orchest.Config.STEP_DATA_DIR", str(tmp_path / "data" / "{step_uuid}")
+    ), patch("orchest.Config.STEP_CACHE_DIR", str(tmp_path / "cache" / "{step_uuid}")):
+        with patch("orchest.Config.STEP_FINGERPRINT", "fingerprint-1"):
+            transfer.output_to_disk("old", name="data")
+
+        # The files of the output are linked into the cache.
+        contents = {}
+        for name in os.listdir(cached):
+            path = os.path.join(cached, name)
+            assert os.path.samefile(path, os.path.join(data_dir, name))
+            with open(path, "rb") as f:
+                contents[name] = f.read()
+
+        with patch("orchest.Config.STEP_FINGERPRINT", None):
+            transfer.output_to_disk("new", name="data")
+
+        for name, content in contents.items():
+            with open(os.path.join(cached, name), "rb") as f:
+                assert f.read() == content
+
+        mock_get_step_uuid.return_value = "uuid-2______________"
+        assert transfer.get_inputs()["data"] == "new"
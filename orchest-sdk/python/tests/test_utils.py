@@ -0,0 +1,45 @@
+import json
+import os
+import shutil
+from unittest.mock import patch
+
+import orchest
+from orchest import utils
+from orchest.pipeline import Pipeline
+
+
+def test_get_pipeline_cache(tmp_path):
+    path = str(tmp_path / "pipeline.json")
+    shutil.copy("tests/userdir/pipeline-basic.json", path)
+    orchest.Config.PIPELINE_DEFINITION_PATH = path
+
+    pipeline = utils.get_pipeline()
+    assert utils.get_pipeline() is pipeline
+
+    # Changing the file invalidates the cache.
+    shutil.copy("tests/userdir/pipeline-order.json", path)
+    os.utime(path, ns=(0, 0))
+    pipeline = utils.get_pipeline()
+    assert pipeline.get_step_by_uuid("uuid-3______________") is not None
+
+
+@patch("orchest.utils._request_json")
+@patch.dict(os.environ, {"KERNEL_ID": "kernel-1"})
+def test_get_step_uuid_caches_kernel_notebook_path(mock_request_json):
+    orchest.Config.PIPELINE_DEFINITION_PATH = "tests/userdir/pipeline-basic.json"
+    orchest.Config.PROJECT_UUID = "project-uuid"
+    os.environ.pop("ORCHEST_STEP_UUID", None)
+
+    with open(orchest.Config.PIPELINE_DEFINITION_PATH, "r") as f:
+        pipeline_definition = json.load(f)
+    for step in pipeline_definition["steps"].values():
+        step["file_path"] = step["title"] + ".ipynb"
+    pipeline = Pipeline.from_json(pipeline_definition)
+
+    mock_request_json.return_value = [
+        {"kernel": {"id": "kernel-1"}, "notebook": {"path": "step-2.ipynb"}}
+    ]
+
+    assert utils.get_step_uuid(pipeline) == "uuid-2______________"
+    assert utils.get_step_uuid(pipeline) == "uuid-2______________"
+    assert mock_request_json.call_count == 1
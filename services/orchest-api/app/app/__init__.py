@@ -33,6 +33,7 @@ from app.apis import namespace_ctl
 from app.apis.namespace_jupyter_image_builds import CreateJupyterEnvironmentBuild
 from app.celery_app import make_celery
 from app.connections import db, k8s_core_api
+from app.core.job_scheduler import JobScheduler
 from app.core.notifications import analytics as api_analytics
 from app.core.scheduler import add_recurring_jobs_to_scheduler
 from app.models import Job, JupyterImageBuild, Setting
@@ -160,6 +161,9 @@ def create_app(
         add_recurring_jobs_to_scheduler(scheduler, app, run_on_add=True)
         scheduler.start()
 
+        # Job runs are scheduled by the one elected job scheduler.
+        JobScheduler(app).start()
+
         if not _utils.is_running_from_reloader():
             with app.app_context():
                 trigger_conditional_jupyter_image_build(app)
@@ -206,6 +210,7 @@ def create_required_directories() -> None:
         _config.USERDIR_ENV_IMG_BUILDS,
         _config.USERDIR_JUPYTER_IMG_BUILDS,
         _config.USERDIR_JUPYTERLAB,
+        _config.USERDIR_SNAPSHOT_STORE,
         os.path.join(_config.USERDIR_JUPYTERLAB, "user-settings"),
         os.path.join(_config.USERDIR_JUPYTERLAB, "lab"),
     ]:
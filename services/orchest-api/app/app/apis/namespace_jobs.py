@@ -1,7 +1,7 @@
 import copy
 import uuid
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Set, Tuple
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 import requests
 from celery.contrib.abortable import AbortableAsyncResult
@@ -20,8 +20,9 @@ from app import types as app_types
 from app.apis.namespace_runs import AbortPipelineRun
 from app.connections import db
 from app.core import environments, events
-from app.core.pipelines import Pipeline, construct_pipeline
+from app.core.pipelines import construct_pipeline
 from app.utils import (
+    bulk_insert,
     fuzzy_filter_non_interactive_pipeline_runs,
     get_env_vars_update,
     get_proj_pip_env_variables,
@@ -196,6 +197,7 @@ class Job(Resource):
         next_scheduled_time = job_update.get("next_scheduled_time")
         strategy_json = job_update.get("strategy_json")
         max_retained_pipeline_runs = job_update.get("max_retained_pipeline_runs")
+        catch_up_policy = job_update.get("catch_up_policy")
         confirm_draft = "confirm_draft" in job_update
 
         try:
@@ -210,6 +212,7 @@ class Job(Resource):
                     strategy_json,
                     max_retained_pipeline_runs,
                     confirm_draft,
+                    catch_up_policy,
                 )
         except Exception as e:
             current_app.logger.error(e)
@@ -845,7 +848,19 @@ def _delete_non_retained_pipeline_runs(job_uuid: str) -> None:
 class RunJob(TwoPhaseFunction):
     """Start the pipeline runs related to a job"""
 
-    def _transaction(self, job_uuid: str, triggered_by_user: bool = False):
+    def _transaction(
+        self, job_uuid: str, triggered_by_user: bool = False, executions: int = 1
+    ):
+        """Starts the pipeline runs of the job.
+
+        Args:
+            job_uuid: UUID of the job.
+            triggered_by_user: Whether the job is run by the user rather
+                than by the scheduler.
+            executions: Number of times the job is run, e.g. to catch up
+                on the runs of a cron job that were missed. The runs of
+                all executions are launched at once.
+        """
 
         # with_entities is so that we do not retrieve the interactive
         # runs of the job, since we do not need those.
@@ -880,85 +895,79 @@ class RunJob(TwoPhaseFunction):
             job.status = "STARTED"
             events.register_job_started(job.project_uuid, job.uuid)
 
-        if job.schedule is not None:
-            events.register_cron_job_run_started(
-                job.project_uuid, job.uuid, job.total_scheduled_executions
-            )
+        # The steps of the runs are the same for all runs, only the
+        # parameters differ. The pipeline of a run is constructed by the
+        # task that starts the run, given the parameters of the run.
+        pipeline_run_spec = copy.copy(job.pipeline_run_spec)
+        pipeline_run_spec["pipeline_definition"] = job.pipeline_definition
+        step_uuids = [
+            s.properties["uuid"] for s in construct_pipeline(**pipeline_run_spec).steps
+        ]
 
         # To be later used by the collateral effect function.
         tasks_to_launch = []
 
-        # run_index is the index of the run within the runs of this job
-        # scheduling/execution.
-        for run_index, run_parameters in enumerate(job.parameters):
-            pipeline_def = copy.deepcopy(job.pipeline_definition)
-
-            # Set the pipeline parameters:
-            pipeline_def["parameters"] = run_parameters.get(
-                _config.PIPELINE_PARAMETERS_RESERVED_KEY, {}
-            )
-
-            # Set the steps parameters in the pipeline definition.
-            for step_uuid, step_parameters in run_parameters.items():
-                # One of the entries is not actually a step_uuid.
-                if step_uuid != _config.PIPELINE_PARAMETERS_RESERVED_KEY:
-                    pipeline_def["steps"][step_uuid]["parameters"] = step_parameters
-
-            # Instantiate a pipeline object given the specs, definition
-            # and parameters.
-            pipeline_run_spec = copy.deepcopy(job.pipeline_run_spec)
-            pipeline_run_spec["pipeline_definition"] = pipeline_def
-            pipeline = construct_pipeline(**pipeline_run_spec)
-
-            # Specify the task_id beforehand to avoid race conditions
-            # between the task and its presence in the db.
-            task_id = str(uuid.uuid4())
-            tasks_to_launch.append((task_id, pipeline))
-
-            non_interactive_run = {
-                "job_uuid": job.uuid,
-                "uuid": task_id,
-                "pipeline_uuid": job.pipeline_uuid,
-                "project_uuid": job.project_uuid,
-                "status": "PENDING",
-                "parameters": run_parameters,
-                "parameters_text_search_values": list(run_parameters.values()),
-                "job_run_index": job.total_scheduled_executions,
-                "job_run_pipeline_run_index": run_index,
-                "pipeline_run_index": job.total_scheduled_pipeline_runs,
-                "env_variables": job.env_variables,
-            }
-            job.total_scheduled_pipeline_runs += 1
-
-            db.session.add(models.NonInteractivePipelineRun(**non_interactive_run))
-            # Need to flush because otherwise the bulk insertion of
-            # pipeline steps will lead to foreign key errors.
-            # https://docs.sqlalchemy.org/en/13/orm/persistence_techniques.html#bulk-operations-caveats
-            db.session.flush()
+        # All runs and their steps are inserted at once, runs of jobs
+        # with many parameter combinations would otherwise take long.
+        non_interactive_runs = []
+        pipeline_steps = []
 
-            events.register_job_pipeline_run_created(
-                job.project_uuid, job.uuid, task_id
-            )
+        for _ in range(executions):
+            if job.schedule is not None:
+                events.register_cron_job_run_started(
+                    job.project_uuid, job.uuid, job.total_scheduled_executions
+                )
 
-            # TODO: this code is also in `namespace_runs`. Could
-            #       potentially be put in a function for modularity.
-            # Set an initial value for the status of the pipeline
-            # steps that will be run.
-            step_uuids = [s.properties["uuid"] for s in pipeline.steps]
-            pipeline_steps = []
-            for step_uuid in step_uuids:
-                pipeline_steps.append(
-                    models.PipelineRunStep(
-                        **{
+            # run_index is the index of the run within the runs of this
+            # job scheduling/execution.
+            for run_index, run_parameters in enumerate(job.parameters):
+                # Specify the task_id beforehand to avoid race
+                # conditions between the task and its presence in the
+                # db.
+                task_id = str(uuid.uuid4())
+                tasks_to_launch.append((task_id, run_parameters))
+
+                non_interactive_runs.append(
+                    {
+                        # Needed since the run is not inserted through
+                        # the ORM.
+                        "type": "NonInteractivePipelineRun",
+                        "job_uuid": job.uuid,
+                        "uuid": task_id,
+                        "pipeline_uuid": job.pipeline_uuid,
+                        "project_uuid": job.project_uuid,
+                        "status": "PENDING",
+                        "parameters": run_parameters,
+                        "parameters_text_search_values": list(run_parameters.values()),
+                        "job_run_index": job.total_scheduled_executions,
+                        "job_run_pipeline_run_index": run_index,
+                        "pipeline_run_index": job.total_scheduled_pipeline_runs,
+                        "env_variables": job.env_variables,
+                    }
+                )
+                job.total_scheduled_pipeline_runs += 1
+
+                # TODO: this code is also in `namespace_runs`. Could
+                #       potentially be put in a function for modularity.
+                # Set an initial value for the status of the pipeline
+                # steps that will be run.
+                for step_uuid in step_uuids:
+                    pipeline_steps.append(
+                        {
                             "run_uuid": task_id,
                             "step_uuid": step_uuid,
                             "status": "PENDING",
                         }
                     )
-                )
-            db.session.bulk_save_objects(pipeline_steps)
 
-        job.total_scheduled_executions += 1
+            job.total_scheduled_executions += 1
+
+        bulk_insert(models.NonInteractivePipelineRun, non_interactive_runs)
+        bulk_insert(models.PipelineRunStep, pipeline_steps)
+        events.register_job_pipeline_runs_created(
+            job.project_uuid, job.uuid, [task_id for task_id, _ in tasks_to_launch]
+        )
+
         # Must run after total_scheduled_executions has been updated.
         DeleteNonRetainedJobPipelineRuns(self.tpe).transaction(job.uuid)
 
@@ -985,7 +994,7 @@ class RunJob(TwoPhaseFunction):
         self,
         job: Dict[str, Any],
         run_config: Dict[str, Any],
-        tasks_to_launch: Tuple[str, Pipeline],
+        tasks_to_launch: List[Tuple[str, Dict[str, Any]]],
     ):
         # Safety check in case the job has no runs.
         if not tasks_to_launch:
@@ -994,29 +1003,37 @@ class RunJob(TwoPhaseFunction):
         # Launch each task through celery.
         celery = current_app.config["CELERY"]
 
-        for task_id, pipeline in tasks_to_launch:
-            celery_job_kwargs = {
-                "job_uuid": job["uuid"],
-                "project_uuid": job["project_uuid"],
-                "pipeline_definition": pipeline.to_dict(),
-                "run_config": run_config,
-            }
-
-            # Due to circular imports we use the task name instead of
-            # importing the function directly.
-            task_args = {
-                "name": "app.core.tasks.start_non_interactive_pipeline_run",
-                "kwargs": celery_job_kwargs,
-                "task_id": task_id,
-            }
-            res = celery.send_task(**task_args)
-            # NOTE: this is only if a backend is configured. The task
-            # does not return anything. Therefore we can forget its
-            # result and make sure that the Celery backend releases
-            # recourses (for storing and transmitting results)
-            # associated to the task. Uncomment the line below if
-            # applicable.
-            res.forget()
+        # Publish all tasks through the same connection instead of
+        # acquiring one from the pool for every task.
+        with celery.producer_or_acquire() as producer:
+            for task_id, run_parameters in tasks_to_launch:
+                # Only the parameters of the run are sent, the task
+                # constructs the pipeline from the definition of the
+                # job to not send the entire definition for every run.
+                celery_job_kwargs = {
+                    "job_uuid": job["uuid"],
+                    "project_uuid": job["project_uuid"],
+                    "pipeline_definition": None,
+                    "run_parameters": run_parameters,
+                    "run_config": run_config,
+                }
+
+                # Due to circular imports we use the task name instead
+                # of importing the function directly.
+                task_args = {
+                    "name": "app.core.tasks.start_non_interactive_pipeline_run",
+                    "kwargs": celery_job_kwargs,
+                    "task_id": task_id,
+                    "producer": producer,
+                }
+                res = celery.send_task(**task_args)
+                # NOTE: this is only if a backend is configured. The
+                # task does not return anything. Therefore we can forget
+                # its result and make sure that the Celery backend
+                # releases recourses (for storing and transmitting
+                # results) associated to the task. Uncomment the line
+                # below if applicable.
+                res.forget()
 
     def _revert(self):
         job = self.collateral_kwargs["job"]
@@ -1194,6 +1211,12 @@ class CreateJob(TwoPhaseFunction):
         else:
             raise ValueError("Can't define both cron_schedule and scheduled_start.")
 
+        catch_up_policy = job_spec.get(
+            "catch_up_policy", app_types.CatchUpPolicy.COALESCE.value
+        )
+        # Raises a ValueError if the policy is invalid.
+        app_types.CatchUpPolicy(catch_up_policy)
+
         if not job_spec.get("parameters", []):
             raise ValueError(
                 (
@@ -1233,6 +1256,7 @@ class CreateJob(TwoPhaseFunction):
             "max_retained_pipeline_runs": job_spec.get(
                 "max_retained_pipeline_runs", -1
             ),
+            "catch_up_policy": catch_up_policy,
             "snapshot_uuid": job_spec["snapshot_uuid"],
         }
         db.session.add(models.Job(**job))
@@ -1276,6 +1300,7 @@ class UpdateJobParameters(TwoPhaseFunction):
         strategy_json: Dict[str, Any],
         max_retained_pipeline_runs: int,
         confirm_draft,
+        catch_up_policy: Optional[str] = None,
     ):
         job = (
             models.Job.query.with_for_update()
@@ -1402,6 +1427,25 @@ class UpdateJobParameters(TwoPhaseFunction):
 
             job.max_retained_pipeline_runs = max_retained_pipeline_runs
 
+        if catch_up_policy is not None:
+            if job.schedule is None and job.status != "DRAFT":
+                raise ValueError(
+                    (
+                        "Failed update operation. Cannot update the catch_up_policy "
+                        "of a job which is not a draft nor a cron job."
+                    )
+                )
+
+            try:
+                app_types.CatchUpPolicy(catch_up_policy)
+            except ValueError:
+                raise ValueError(
+                    "Failed update operation. Invalid catch_up_policy: "
+                    f"{catch_up_policy}."
+                )
+
+            job.catch_up_policy = catch_up_policy
+
         update_already_registered = False
         if confirm_draft:
             if job.status != "DRAFT":
@@ -1478,6 +1522,7 @@ class UpdateJobParameters(TwoPhaseFunction):
             ("parameters", False),
             ("strategy_json", False),
             ("max_retained_pipeline_runs", True),
+            ("catch_up_policy", True),
             ("next_scheduled_time", True),
             ("status", True),
         ]
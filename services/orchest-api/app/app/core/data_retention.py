@@ -0,0 +1,199 @@
+"""Module to clean up the data that steps pass to each other.
+
+Steps output data to disk, through the SDK, to the data directory of
+the pipeline, i.e. `.orchest/pipelines/<pipeline_uuid>/data` relative
+to the project directory of the run. Every step has its own directory
+in there. When `auto_eviction` is enabled, the SDK already removes an
+output of a job run once all the child steps have consumed it.
+
+Without cleaning up, this data stays on disk forever and, for jobs, is
+duplicated in every job run directory. At the end of a pipeline run the
+following is applied, depending on the pipeline settings:
+
+* `auto_eviction`: outputs of steps of which all child steps have
+  finished are removed. Since no step of a job run is ever rerun, this
+  is all the data that is consumed by other steps. Only applies to job
+  runs, interactive runs might partially rerun the pipeline.
+* `data_retention_max_bytes`: the least recently written outputs are
+  removed until the data directory is at most this size.
+* `data_retention_keep_last_n`: only the data directories of the N most
+  recently finished runs of a job are kept.
+
+"""
+import os
+from typing import List, NamedTuple, Optional
+
+from _orchest.internals import config as _config
+from _orchest.internals import utils as _utils
+from app import models, utils
+from app.connections import db
+from app.core.pipelines import Pipeline
+from app.types import RunConfig
+
+logger = utils.get_logger()
+
+
+class _StepOutput(NamedTuple):
+    path: str
+    last_modified: float
+    size: int
+
+
+def get_data_dir(project_dir: str, pipeline_uuid: str) -> str:
+    """Gets the directory the steps of a pipeline output data to."""
+    return os.path.join(
+        project_dir, _config.DATA_PATH.format(pipeline_uuid=pipeline_uuid)
+    )
+
+
+def _get_dir_size(path: str) -> int:
+    size = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                size += os.lstat(os.path.join(root, name)).st_size
+            except FileNotFoundError:
+                pass
+    return size
+
+
+def _get_step_outputs(data_dir: str) -> List[_StepOutput]:
+    """Gets the outputs, one per step, in the data directory."""
+    outputs = []
+    try:
+        entries = list(os.scandir(data_dir))
+    except FileNotFoundError:
+        return outputs
+
+    for entry in entries:
+        if not entry.is_dir(follow_symlinks=False):
+            continue
+        try:
+            # The HEAD file is written on every output.
+            last_modified = os.stat(os.path.join(entry.path, "HEAD")).st_mtime
+        except FileNotFoundError:
+            last_modified = entry.stat(follow_symlinks=False).st_mtime
+        outputs.append(
+            _StepOutput(entry.path, last_modified, _get_dir_size(entry.path))
+        )
+    return outputs
+
+
+def remove_consumed_outputs(data_dir: str, pipeline: Pipeline) -> None:
+    """Removes the outputs of steps of which all children finished.
+
+    Must only be called once none of the steps of the pipeline is
+    running anymore.
+
+    Args:
+        data_dir: The data directory of the pipeline run.
+        pipeline: The pipeline that was run.
+    """
+    to_remove = [
+        os.path.join(data_dir, step.properties["uuid"])
+        for step in pipeline.steps
+        if step._children
+    ]
+    to_remove = [path for path in to_remove if os.path.isdir(path)]
+    if to_remove:
+        _utils.rmtree(to_remove, ignore_errors=True)
+
+
+def enforce_max_bytes(data_dir: str, max_bytes: int) -> None:
+    """Removes the least recently written outputs exceeding max_bytes.
+
+    Args:
+        data_dir: The data directory of the pipeline.
+        max_bytes: The maximum size of the data directory in bytes.
+    """
+    outputs = sorted(_get_step_outputs(data_dir), key=lambda o: o.last_modified)
+    total = sum(output.size for output in outputs)
+
+    to_remove = []
+    for output in outputs:
+        if total <= max_bytes:
+            break
+        to_remove.append(output.path)
+        total -= output.size
+
+    if to_remove:
+        logger.info(f"Removing {len(to_remove)} outputs from {data_dir}.")
+        _utils.rmtree(to_remove, ignore_errors=True)
+
+
+def enforce_job_keep_last_n(
+    project_uuid: str, pipeline_uuid: str, job_uuid: str, keep_last_n: int
+) -> None:
+    """Removes the data directories of all but the last N job runs.
+
+    Args:
+        project_uuid: UUID of the project of the job.
+        pipeline_uuid: UUID of the pipeline of the job.
+        job_uuid: UUID of the job.
+        keep_last_n: The number of most recently finished runs of the
+            job for which the data directory is kept.
+    """
+    runs = (
+        db.session.query(models.NonInteractivePipelineRun.uuid)
+        .filter(
+            models.NonInteractivePipelineRun.job_uuid == job_uuid,
+            models.NonInteractivePipelineRun.status.in_(
+                ["SUCCESS", "FAILURE", "ABORTED"]
+            ),
+        )
+        .order_by(models.NonInteractivePipelineRun.finished_time.desc())
+        .offset(keep_last_n)
+        .all()
+    )
+    data_dirs = [
+        get_data_dir(
+            utils.get_job_run_dir_path(project_uuid, pipeline_uuid, job_uuid, run.uuid),
+            pipeline_uuid,
+        )
+        for run in runs
+    ]
+    data_dirs = [path for path in data_dirs if os.path.isdir(path)]
+    if data_dirs:
+        logger.info(f"Removing data of {len(data_dirs)} runs of job {job_uuid}.")
+        _utils.rmtree(data_dirs, ignore_errors=True)
+
+
+def _get_int_setting(pipeline: Pipeline, name: str) -> Optional[int]:
+    value = pipeline.properties.get("settings", {}).get(name)
+    if not isinstance(value, int) or isinstance(value, bool):
+        return None
+    return value if value >= 0 else None
+
+
+def apply_run_retention(pipeline: Pipeline, run_config: RunConfig) -> None:
+    """Applies the data retention policy at the end of a pipeline run.
+
+    Args:
+        pipeline: The pipeline that was run.
+        run_config: The configuration of the pipeline run.
+    """
+    data_dir = get_data_dir(run_config["project_dir"], run_config["pipeline_uuid"])
+
+    if run_config["session_type"] == "noninteractive" and pipeline.properties.get(
+        "settings", {}
+    ).get("auto_eviction", False):
+        remove_consumed_outputs(data_dir, pipeline)
+
+    max_bytes = _get_int_setting(pipeline, "data_retention_max_bytes")
+    if max_bytes is not None:
+        enforce_max_bytes(data_dir, max_bytes)
+
+
+def apply_job_retention(pipeline: Pipeline, project_uuid: str, job_uuid: str) -> None:
+    """Applies the data retention policy at the end of a job run.
+
+    Args:
+        pipeline: The pipeline of the job.
+        project_uuid: UUID of the project of the job.
+        job_uuid: UUID of the job.
+    """
+    keep_last_n = _get_int_setting(pipeline, "data_retention_keep_last_n")
+    if keep_last_n is not None:
+        enforce_job_keep_last_n(
+            project_uuid, pipeline.properties["uuid"], job_uuid, keep_last_n
+        )
@@ -4,22 +4,36 @@ Upon the registration of an event in the db, deliveries are created
 accordingly based on any subscribers subscribed to the event type that
 happened.
 """
+from typing import List
+
 from app import models
 from app import types as app_types
 from app import utils as app_utils
 from app.connections import db
-from app.core import notifications
+from app.core.notifications import subscription_index
 
 _logger = app_utils.get_logger()
 
 
 def _register_event(ev: models.Event) -> None:
+    _register_events([ev])
+
+
+def _register_events(evs: List[models.Event]) -> None:
+    """Adds events of the same type, project and job to the db.
+
+    The subscribers to the events are queried once for all events.
+    """
+    if not evs:
+        return
+
     # So that any FK created in the same transaction and referenced by
     # the event is visible to the event.
     db.session.flush()
 
-    db.session.add(ev)
+    db.session.add_all(evs)
 
+    ev = evs[0]
     project_uuid = None
     job_uuid = None
     if isinstance(ev, models.ProjectEvent):
@@ -30,34 +44,36 @@ def _register_event(ev: models.Event) -> None:
 
     # So that the event.uuid is generated and visible as a FK.
     db.session.flush()
-    _logger.info(ev)
+    for ev in evs:
+        _logger.info(ev)
 
-    subscribers = notifications.get_subscribers_subscribed_to_event(
+    index = subscription_index.get()
+    subscribers = index.get_subscribers(
         ev.type, project_uuid=project_uuid, job_uuid=job_uuid
     )
     for sub in subscribers:
-        if isinstance(sub, models.AnalyticsSubscriber):
-            if app_utils.OrchestSettings()["TELEMETRY_DISABLED"]:
-                _logger.info(
-                    "Telemetry is disabled, skipping event delivery to analytics."
-                )
-                continue
-            payload = ev.to_telemetry_payload()
-        else:
-            payload = ev.to_notification_payload()
-
-        _logger.info(
-            f"Scheduling delivery for event {ev.uuid}, event type: {ev.type} for "
-            f"deliveree {sub.uuid} of type {sub.type}."
-        )
-
-        delivery = models.Delivery(
-            event=ev.uuid,
-            deliveree=sub.uuid,
-            status="SCHEDULED",
-            notification_payload=payload,
-        )
-        db.session.add(delivery)
+        if sub.is_analytics and index.telemetry_disabled:
+            _logger.info("Telemetry is disabled, skipping event delivery to analytics.")
+            continue
+
+        for ev in evs:
+            if sub.is_analytics:
+                payload = ev.to_telemetry_payload()
+            else:
+                payload = ev.to_notification_payload()
+
+            _logger.info(
+                f"Scheduling delivery for event {ev.uuid}, event type: {ev.type} for "
+                f"deliveree {sub.uuid} of type {sub.type}."
+            )
+
+            delivery = models.Delivery(
+                event=ev.uuid,
+                deliveree=sub.uuid,
+                status="SCHEDULED",
+                notification_payload=payload,
+            )
+            db.session.add(delivery)
 
 
 def _register_one_off_job_event(type: str, project_uuid: str, job_uuid: str) -> None:
@@ -255,23 +271,46 @@ def register_cron_job_run_failed(
 def _register_one_off_job_pipeline_run_event(
     type: str, project_uuid: str, job_uuid: str, pipeline_run_uuid: str
 ):
-    ev = models.OneOffJobPipelineRunEvent(
-        type=type,
-        project_uuid=project_uuid,
-        job_uuid=job_uuid,
-        pipeline_run_uuid=pipeline_run_uuid,
+    _register_one_off_job_pipeline_run_events(
+        type, project_uuid, job_uuid, [pipeline_run_uuid]
     )
-    _register_event(ev)
+
+
+def _register_one_off_job_pipeline_run_events(
+    type: str, project_uuid: str, job_uuid: str, pipeline_run_uuids: List[str]
+):
+    evs = [
+        models.OneOffJobPipelineRunEvent(
+            type=type,
+            project_uuid=project_uuid,
+            job_uuid=job_uuid,
+            pipeline_run_uuid=pipeline_run_uuid,
+        )
+        for pipeline_run_uuid in pipeline_run_uuids
+    ]
+    _register_events(evs)
 
 
 def _register_cron_job_run_pipeline_run_event(
     type: str, project_uuid: str, job_uuid: str, pipeline_run_uuid: str
 ):
+    _register_cron_job_run_pipeline_run_events(
+        type, project_uuid, job_uuid, [pipeline_run_uuid]
+    )
+
+
+def _register_cron_job_run_pipeline_run_events(
+    type: str, project_uuid: str, job_uuid: str, pipeline_run_uuids: List[str]
+):
+    """Registers events for pipeline runs of the same job run."""
+    if not pipeline_run_uuids:
+        return
+
     run_index = (
         db.session.query(models.NonInteractivePipelineRun.job_run_index)
         .filter(
             models.NonInteractivePipelineRun.job_uuid == job_uuid,
-            models.NonInteractivePipelineRun.uuid == pipeline_run_uuid,
+            models.NonInteractivePipelineRun.uuid == pipeline_run_uuids[0],
         )
         .one()
     ).job_run_index
@@ -286,15 +325,18 @@ def _register_cron_job_run_pipeline_run_event(
     total_pipeline_runs = (
         run_started_event.total_pipeline_runs if run_started_event is not None else None
     )
-    ev = models.CronJobRunPipelineRunEvent(
-        type=type,
-        project_uuid=project_uuid,
-        job_uuid=job_uuid,
-        pipeline_run_uuid=pipeline_run_uuid,
-        run_index=run_index,
-        total_pipeline_runs=total_pipeline_runs,
-    )
-    _register_event(ev)
+    evs = [
+        models.CronJobRunPipelineRunEvent(
+            type=type,
+            project_uuid=project_uuid,
+            job_uuid=job_uuid,
+            pipeline_run_uuid=pipeline_run_uuid,
+            run_index=run_index,
+            total_pipeline_runs=total_pipeline_runs,
+        )
+        for pipeline_run_uuid in pipeline_run_uuids
+    ]
+    _register_events(evs)
 
 
 def register_job_pipeline_run_created(
@@ -317,6 +359,29 @@ def register_job_pipeline_run_created(
         )
 
 
+def register_job_pipeline_runs_created(
+    project_uuid: str, job_uuid: str, pipeline_run_uuids: List[str]
+) -> None:
+    """Adds job ppl run created events to the db, doesn't commit.
+
+    The pipeline runs must belong to the same job run.
+    """
+    if _is_cron_job(job_uuid):
+        _register_cron_job_run_pipeline_run_events(
+            "project:cron-job:run:pipeline-run:created",
+            project_uuid,
+            job_uuid,
+            pipeline_run_uuids,
+        )
+    else:
+        _register_one_off_job_pipeline_run_events(
+            "project:one-off-job:pipeline-run:created",
+            project_uuid,
+            job_uuid,
+            pipeline_run_uuids,
+        )
+
+
 def register_job_pipeline_run_started(
     project_uuid: str, job_uuid: str, pipeline_run_uuid: str
 ) -> None:
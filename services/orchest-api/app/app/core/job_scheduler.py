@@ -0,0 +1,300 @@
+"""Schedules the runs of jobs at their next_scheduled_time.
+
+Instead of polling the database for due jobs, the scheduler keeps a
+heap of the next_scheduled_time of all jobs that are to be run and
+sleeps until the earliest one is due. A trigger on the jobs table
+notifies the `JOB_SCHEDULE_CHANNEL` channel whenever a job is created,
+deleted or its status, schedule or next_scheduled_time is changed,
+e.g. when a job is paused, at which point the scheduler wakes up and
+refreshes the entry of the job.
+
+Only one scheduler is active at a time, the leader, which is the one
+that holds the `JOB_SCHEDULER_LOCK` advisory lock. The lock is held by
+the connection the leader listens on, thus, if the leader dies, the
+lock is released and another scheduler takes over. The other
+schedulers periodically try to acquire the lock.
+
+The heap is entirely reloaded from the database every
+`JOB_SCHEDULER_RESYNC_INTERVAL` seconds and once a scheduler becomes
+the leader, so that a lost notification does not lose a job.
+
+The database remains the ground truth: a due job is locked and checked
+to be due again before it is run, see `schedule_job_run`. Runs of cron
+jobs that were missed, e.g. because Orchest was not running, are
+handled according to the catch up policy of the job.
+"""
+import datetime
+import heapq
+import logging
+import select
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from croniter import croniter
+from flask.app import Flask
+from sqlalchemy.orm import load_only
+
+from _orchest.internals.two_phase_executor import TwoPhaseExecutor
+from app import models, utils
+from app.apis.namespace_jobs import RunJob
+from app.connections import db
+from app.types import CatchUpPolicy
+from config import CONFIG_CLASS
+
+logger = logging.getLogger("job-scheduler")
+
+# Keep in sync with the trigger on the jobs table.
+JOB_SCHEDULE_CHANNEL = "job_schedule_changed"
+# Key of the advisory lock held by the leader.
+JOB_SCHEDULER_LOCK = 24_318_001
+
+
+def _get_query():
+    return models.Job.query.options(
+        load_only("uuid", "schedule", "next_scheduled_time", "catch_up_policy")
+    ).filter(
+        models.Job.status.in_(["PENDING", "STARTED"]),
+        models.Job.next_scheduled_time.isnot(None),
+    )
+
+
+def get_fire_times(
+    schedule: str, next_scheduled_time: datetime.datetime, now: datetime.datetime
+) -> Tuple[List[datetime.datetime], datetime.datetime]:
+    """Gets the times a cron job was due at, in a single pass.
+
+    Returns:
+        The times in [next_scheduled_time, now], oldest first, and the
+        first time after now.
+    """
+    fire_times = [next_scheduled_time]
+    schedule_iter = croniter(schedule, next_scheduled_time)
+    while (fire_time := schedule_iter.get_next(datetime.datetime)) <= now:
+        fire_times.append(fire_time)
+    return fire_times, fire_time
+
+
+def _get_executions(
+    job: models.Job, now: datetime.datetime
+) -> Tuple[int, Optional[datetime.datetime]]:
+    """Gets how many times to run a due job, given its policy.
+
+    Returns:
+        The number of executions and the time of the latest one.
+    """
+    policy = CatchUpPolicy(job.catch_up_policy)
+    grace_time = datetime.timedelta(seconds=CONFIG_CLASS.JOB_MISFIRE_GRACE_TIME)
+
+    if policy is CatchUpPolicy.COALESCE:
+        # Aggregate the missed runs into 1.
+        last_scheduled_time = job.next_scheduled_time
+        job.next_scheduled_time = croniter(job.schedule, now).get_next(
+            datetime.datetime
+        )
+        return 1, last_scheduled_time
+
+    if policy is CatchUpPolicy.SKIP:
+        # Only the latest due time can still be run on time, thus no
+        # need to go over the ones that were missed.
+        latest = croniter(job.schedule, now).get_prev(datetime.datetime)
+        latest = max(latest, job.next_scheduled_time)
+        job.next_scheduled_time = croniter(job.schedule, now).get_next(
+            datetime.datetime
+        )
+        if now - latest > grace_time:
+            logger.info(f"Skipping the missed runs of job {job.uuid}.")
+            return 0, None
+        return 1, latest
+
+    fire_times, job.next_scheduled_time = get_fire_times(
+        job.schedule, job.next_scheduled_time, now
+    )
+    if len(fire_times) > CONFIG_CLASS.JOB_CATCH_UP_MAX_EXECUTIONS:
+        logger.warning(
+            f"Job {job.uuid} missed {len(fire_times)} runs, only catching up on the "
+            f"latest {CONFIG_CLASS.JOB_CATCH_UP_MAX_EXECUTIONS}."
+        )
+        fire_times = fire_times[-CONFIG_CLASS.JOB_CATCH_UP_MAX_EXECUTIONS :]
+    if len(fire_times) > 1:
+        logger.info(f"Catching up on {len(fire_times)} runs of job {job.uuid}.")
+    return len(fire_times), fire_times[-1]
+
+
+def schedule_job_run(job_uuid: str, now: datetime.datetime) -> None:
+    """Runs the job if it's due, commits.
+
+    Based on the type of job (recurring or not), sets the
+    next_scheduled_time. For recurring jobs the runs that were missed,
+    i.e. all due times up to `now`, are handled according to the catch
+    up policy of the job.
+    """
+    job = (
+        _get_query()
+        .with_for_update()
+        .filter(models.Job.uuid == job_uuid, models.Job.next_scheduled_time <= now)
+        .first()
+    )
+    # The job might have been paused or rescheduled in the meantime.
+    if job is None:
+        db.session.commit()
+        return
+
+    if job.schedule is not None:
+        executions, last_scheduled_time = _get_executions(job, now)
+    else:
+        # One time jobs are not rescheduled again.
+        executions, last_scheduled_time = 1, job.next_scheduled_time
+        job.next_scheduled_time = None
+
+    if executions > 0:
+        job.last_scheduled_time = last_scheduled_time
+        with TwoPhaseExecutor(db.session) as tpe:
+            logger.info(f"Scheduling job {job.uuid}.")
+            RunJob(tpe).transaction(job.uuid, executions=executions)
+
+    db.session.commit()
+
+
+class JobScheduler:
+    """Runs the jobs as they become due, see the module docstring.
+
+    Args:
+        app: Flask app to read config values from and to run in the
+            context of.
+    """
+
+    def __init__(self, app: Flask) -> None:
+        self._app = app
+        # Heap of (next_scheduled_time, job_uuid), entries that do not
+        # match `_next_scheduled_times` are stale and skipped.
+        self._heap: List[Tuple[datetime.datetime, str]] = []
+        self._next_scheduled_times: Dict[str, datetime.datetime] = {}
+
+    def start(self) -> None:
+        threading.Thread(target=self._run, name="job-scheduler", daemon=True).start()
+
+    def _run(self) -> None:
+        while True:
+            try:
+                with self._app.app_context():
+                    self._lead()
+            except Exception as e:
+                logger.error(f"Job scheduler failed: {e}")
+            finally:
+                with self._app.app_context():
+                    db.session.remove()
+            time.sleep(self._app.config["JOB_SCHEDULER_LEADER_RETRY_INTERVAL"])
+
+    def _lead(self) -> None:
+        """Schedules the jobs for as long as this is the leader."""
+        # A dedicated connection, the advisory lock and the LISTEN are
+        # bound to it.
+        connection = db.engine.raw_connection()
+        connection.detach()
+        try:
+            connection.connection.autocommit = True
+            cursor = connection.cursor()
+            cursor.execute("SELECT pg_try_advisory_lock(%s)", (JOB_SCHEDULER_LOCK,))
+            if not cursor.fetchone()[0]:
+                return
+
+            logger.info("Elected as the job scheduler leader.")
+            cursor.execute(f"LISTEN {JOB_SCHEDULE_CHANNEL}")
+            self._listen(connection.connection)
+        finally:
+            connection.close()
+
+    def _listen(self, connection) -> None:
+        resync_interval = self._app.config["JOB_SCHEDULER_RESYNC_INTERVAL"]
+        retry_interval = self._app.config["JOB_SCHEDULER_LEADER_RETRY_INTERVAL"]
+
+        self._load()
+        last_resync = time.monotonic()
+        while True:
+            timeout = resync_interval - (time.monotonic() - last_resync)
+            if utils.OrchestSettings()["PAUSED"]:
+                logger.debug("Orchest is paused, skipping job scheduling.")
+                timeout = min(timeout, retry_interval)
+            else:
+                self._run_due_jobs()
+                if self._heap:
+                    until_due = (
+                        self._heap[0][0] - datetime.datetime.now(datetime.timezone.utc)
+                    ).total_seconds()
+                    timeout = min(timeout, until_due)
+            # Release the snapshot, the session is idle while sleeping.
+            db.session.commit()
+
+            if select.select([connection], [], [], max(timeout, 0))[0]:
+                connection.poll()
+                changed = {notify.payload for notify in connection.notifies}
+                connection.notifies.clear()
+                self._refresh(changed)
+
+            if time.monotonic() - last_resync >= resync_interval:
+                self._load()
+                last_resync = time.monotonic()
+
+    def _push(self, job_uuid: str, next_scheduled_time: datetime.datetime) -> None:
+        if self._next_scheduled_times.get(job_uuid) == next_scheduled_time:
+            return
+        self._next_scheduled_times[job_uuid] = next_scheduled_time
+        heapq.heappush(self._heap, (next_scheduled_time, job_uuid))
+
+    def _load(self) -> None:
+        """Reloads the heap from the database."""
+        jobs = (
+            _get_query()
+            .with_entities(models.Job.uuid, models.Job.next_scheduled_time)
+            .all()
+        )
+        self._next_scheduled_times = dict(jobs)
+        self._heap = [(t, job_uuid) for job_uuid, t in jobs]
+        heapq.heapify(self._heap)
+        logger.debug(f"Loaded {len(self._heap)} scheduled jobs.")
+
+    def _refresh(self, job_uuids: Iterable[str]) -> None:
+        """Refreshes the entries of the given jobs."""
+        job_uuids = list(job_uuids)
+        jobs = dict(
+            _get_query()
+            .with_entities(models.Job.uuid, models.Job.next_scheduled_time)
+            .filter(models.Job.uuid.in_(job_uuids))
+            .all()
+        )
+        for job_uuid in job_uuids:
+            if job_uuid in jobs:
+                self._push(job_uuid, jobs[job_uuid])
+            else:
+                self._next_scheduled_times.pop(job_uuid, None)
+
+    def _pop_due(self, now: datetime.datetime) -> Optional[str]:
+        while self._heap and self._heap[0][0] <= now:
+            next_scheduled_time, job_uuid = heapq.heappop(self._heap)
+            if self._next_scheduled_times.get(job_uuid) == next_scheduled_time:
+                del self._next_scheduled_times[job_uuid]
+                return job_uuid
+        return None
+
+    def _run_due_jobs(self) -> None:
+        """Runs the due jobs.
+
+        Jobs that are more "behind" are run first. The new
+        next_scheduled_time of a job is pushed once it's notified.
+        """
+        now = datetime.datetime.now(datetime.timezone.utc)
+        while (job_uuid := self._pop_due(now)) is not None:
+            try:
+                schedule_job_run(job_uuid, now)
+            except Exception as e:
+                logger.error(f"Failed to schedule job {job_uuid}: {e}")
+                db.session.rollback()
+                # Retried later, the database still has it as due.
+                self._push(
+                    job_uuid,
+                    now
+                    + datetime.timedelta(
+                        seconds=self._app.config["JOB_SCHEDULER_LEADER_RETRY_INTERVAL"]
+                    ),
+                )
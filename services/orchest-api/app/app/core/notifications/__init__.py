@@ -15,6 +15,7 @@ from app import models
 from app import utils as app_utils
 from app.connections import db
 from app.core.notifications import analytics, webhooks
+from config import CONFIG_CLASS
 
 logger = app_utils.get_logger()
 
@@ -110,24 +111,19 @@ def process_notifications_deliveries_task() -> None:
         models.Delivery.scheduled_at <= datetime.datetime.now(datetime.timezone.utc),
     ]
 
-    # Note that we don't select for update here, said locking will
-    # happen on a single delivery basis.
-    webhook_deliveries = (
-        (db.session.query(models.Delivery.uuid))
-        .join(models.Webhook, models.Webhook.uuid == models.Delivery.deliveree)
-        .filter(*delivery_filter)
-        .order_by(models.Delivery.scheduled_at)
-        .all()
-    )
-
-    logger.info(f"Found {len(webhook_deliveries)} webhook deliveries to deliver.")
-
-    for delivery in webhook_deliveries:
+    # Keep going while there might be more due deliveries, failed ones
+    # are rescheduled in the future and thus not claimed again.
+    batch_size = CONFIG_CLASS.WEBHOOK_DELIVERIES_BATCH_SIZE
+    while True:
         try:
-            webhooks.deliver(delivery.uuid)
-        # Don't let failures affect other deliveries.
+            n_claimed = webhooks.deliver_batch(batch_size)
+        # Don't let failures affect analytics deliveries.
         except Exception as e:
             logger.error(e)
+            db.session.rollback()
+            break
+        if n_claimed < batch_size:
+            break
 
     analytics_deliveries = (
         (db.session.query(models.Delivery.uuid))
@@ -0,0 +1,119 @@
+"""Module to cache which subscribers are subscribed to which events.
+
+Every process keeps an index of all subscriptions, keyed by event type,
+project and job, together with a snapshot of the settings that affect
+deliveries. The index is reloaded whenever the version stored in
+`models.SubscriptionIndexVersion` differs from the one it was loaded
+at. Triggers bump the version on any change to subscribers,
+subscriptions or settings, e.g. through `webhooks.create_webhook`,
+`webhooks.update_webhook` or the deletion of a project, thus, looking
+up the subscribers of an event only takes a primary key query.
+"""
+import collections
+import threading
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from app import models
+from app import utils as app_utils
+from app.connections import db
+
+_Key = Tuple[str, Optional[str], Optional[str]]
+
+
+class IndexedSubscriber(NamedTuple):
+    uuid: str
+    type: str
+    is_analytics: bool
+
+
+class SubscriptionIndex:
+    def __init__(
+        self,
+        version: int,
+        subscribers: Dict[_Key, List[IndexedSubscriber]],
+        telemetry_disabled: bool,
+    ) -> None:
+        self.version = version
+        self.telemetry_disabled = telemetry_disabled
+        self._subscribers = subscribers
+
+    def get_subscribers(
+        self,
+        event_type: str,
+        project_uuid: Optional[str] = None,
+        job_uuid: Optional[str] = None,
+    ) -> List[IndexedSubscriber]:
+        """Gets all subscribers subscribed to an event.
+
+        Equivalent to
+        `notifications.get_subscribers_subscribed_to_event`.
+
+        Raises:
+            ValueError if the job_uuid is specified but project_uuid is
+            not.
+        """
+        if job_uuid is not None and project_uuid is None:
+            raise ValueError("If job_uuid is defind project_uuid must be as well.")
+
+        keys = [(event_type, None, None)]
+        if project_uuid is not None:
+            keys.append((event_type, project_uuid, None))
+        if job_uuid is not None:
+            keys.append((event_type, project_uuid, job_uuid))
+
+        subscribers: Dict[str, IndexedSubscriber] = {}
+        for key in keys:
+            for subscriber in self._subscribers.get(key, []):
+                subscribers[subscriber.uuid] = subscriber
+        return list(subscribers.values())
+
+
+_index: Optional[SubscriptionIndex] = None
+_lock = threading.Lock()
+
+
+def _load(version: int) -> SubscriptionIndex:
+    analytics_type = models.AnalyticsSubscriber.__mapper__.polymorphic_identity
+    subscribers = {
+        uuid: IndexedSubscriber(uuid, type, type == analytics_type)
+        for uuid, type in db.session.query(
+            models.Subscriber.uuid, models.Subscriber.type
+        )
+    }
+
+    # Query the table rather than the models, which would filter on the
+    # type of subscription.
+    subscriptions = models.Subscription.__table__.c
+    index: Dict[_Key, List[IndexedSubscriber]] = collections.defaultdict(list)
+    for subscriber_uuid, event_type, project_uuid, job_uuid in db.session.query(
+        subscriptions.subscriber_uuid,
+        subscriptions.event_type,
+        subscriptions.project_uuid,
+        subscriptions.job_uuid,
+    ):
+        subscriber = subscribers[subscriber_uuid]
+        index[(event_type, project_uuid, job_uuid)].append(subscriber)
+        # A subscription to the events of a job of a project is also
+        # matched by any event of the project, like it is by
+        # `notifications.get_subscribers_subscribed_to_event`.
+        if job_uuid is not None:
+            index[(event_type, project_uuid, None)].append(subscriber)
+
+    return SubscriptionIndex(
+        version, dict(index), app_utils.OrchestSettings()["TELEMETRY_DISABLED"]
+    )
+
+
+def get() -> SubscriptionIndex:
+    """Gets the index, reloads it if it's outdated.
+
+    The version is read in the current transaction, thus changes made
+    by the transaction itself are accounted for.
+    """
+    global _index
+
+    version = db.session.query(models.SubscriptionIndexVersion.version).scalar()
+    with _lock:
+        if _index is None or _index.version != version:
+            _index = _load(version)
+        return _index
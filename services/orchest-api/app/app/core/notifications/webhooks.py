@@ -7,28 +7,48 @@ at least the following:
 - a way to deliver a given delivery using the subscriber, i.e.
     deliver(delivery_uuid).
 
+Webhook deliveries are delivered in batches, see deliver_batch(), so
+that a slow or unreachable webhook does not hold up the deliveries of
+the others.
+
+A webhook with a batch_size greater than 1 is a batched webhook: its
+deliveries are accumulated for up to `WEBHOOK_DELIVERIES_BATCH_WINDOW`
+seconds, or until batch_size of them are due, and are then POSTed at
+once as a JSON array of the payloads, which contain the uuids of the
+events. A batch is delivered or rescheduled as a whole.
+
 """
+import collections
+import concurrent.futures
 import datetime
 import hashlib
 import hmac
+import http.cookiejar
 import json
 import secrets
+import threading
 import uuid
-from typing import List, Optional, Set
+from typing import Dict, List, Optional, Set, Tuple
 
 import requests
 import validators
 from flask_restx import marshal
-from sqlalchemy.orm import exc, noload
+from requests.adapters import HTTPAdapter
+from sqlalchemy import func, or_
+from sqlalchemy.orm import exc, noload, undefer
 
 from app import errors as self_errors
 from app import models, schema
 from app import utils as app_utils
 from app.connections import db
 from app.core.notifications import utils as notification_utils
+from config import CONFIG_CLASS
 
 logger = app_utils.get_logger()
 
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
 
 def create_webhook(webhook_spec: dict) -> models.Webhook:
     """Adds a Webhook model to the db, does not commit.
@@ -55,7 +75,9 @@ def create_webhook(webhook_spec: dict) -> models.Webhook:
         verify_ssl=marshaled_webhook_spec["verify_ssl"],
         secret=secret,
         content_type=marshaled_webhook_spec["content_type"],
+        batch_size=marshaled_webhook_spec["batch_size"],
     )
+    _check_batch_size(webhook)
     db.session.add(webhook)
 
     db.session.flush()
@@ -153,15 +175,31 @@ def update_webhook(uuid: str, mutation: dict) -> None:
 
         setattr(webhook, key, value)
 
+    _check_batch_size(webhook)
 
-def _create_delivery_payload(delivery: models.Delivery) -> dict:
 
-    webhook = (
-        models.Webhook.query.options(noload(models.Webhook.subscriptions))
-        .filter(models.Webhook.uuid == delivery.deliveree)
-        .one()
-    )
+def _check_batch_size(webhook: models.Webhook) -> None:
+    max_batch_size = CONFIG_CLASS.WEBHOOK_MAX_BATCH_SIZE
+    if webhook.batch_size is None or not 1 <= webhook.batch_size <= max_batch_size:
+        raise ValueError(
+            f"Invalid batch_size: {webhook.batch_size}, it should be within the range "
+            f"[1, {max_batch_size}]."
+        )
+    if webhook.is_batched() and (
+        webhook.content_type != models.Webhook.ContentType.JSON.value
+        or webhook.is_slack_webhook()
+        or webhook.is_teams_webhook()
+        or webhook.is_discord_webhook()
+    ):
+        raise ValueError(
+            "Only webhooks with a json content type that are not Slack, Teams or "
+            "Discord webhooks can be batched."
+        )
+
 
+def _create_delivery_payload(
+    delivery: models.Delivery, webhook: models.Webhook
+) -> dict:
     payload = {
         "delivered_for": marshal(webhook, schema.webhook),
         "event": delivery.notification_payload,
@@ -204,7 +242,7 @@ def _inject_headers(
 def _prepare_request(
     delivery: models.Delivery, deliveree: models.Webhook
 ) -> requests.PreparedRequest:
-    payload = _create_delivery_payload(delivery)
+    payload = _create_delivery_payload(delivery, deliveree)
 
     # Prepare the request, then sign the body.
     if deliveree.content_type == models.Webhook.ContentType.URLENCODED.value:
@@ -216,15 +254,48 @@ def _prepare_request(
     elif deliveree.content_type == models.Webhook.ContentType.JSON.value:
         request = requests.Request("POST", deliveree.url, json=payload)
 
-    request = request.prepare()
+    return _sign_request(
+        request.prepare(), deliveree, payload["event"]["type"], delivery.uuid
+    )
+
+
+def _prepare_batch_request(
+    deliveries: List[models.Delivery], deliveree: models.Webhook
+) -> requests.PreparedRequest:
+    """Prepares the request of a batch of deliveries.
+
+    The body is a JSON array of the payloads of the deliveries. Since a
+    batch can contain events of different types and is made up again
+    when it's retried, the X-Orchest-Event header is "batch" and the
+    X-Orchest-Delivery header is a new uuid, events are to be
+    deduplicated through their uuid.
+    """
+    payload = [_create_delivery_payload(delivery, deliveree) for delivery in deliveries]
+    request = requests.Request("POST", deliveree.url, json=payload)
+    return _sign_request(request.prepare(), deliveree, "batch", str(uuid.uuid4()))
+
+
+def _prepare(
+    deliveries: List[models.Delivery], deliveree: models.Webhook
+) -> requests.PreparedRequest:
+    if deliveree.is_batched():
+        return _prepare_batch_request(deliveries, deliveree)
+    (delivery,) = deliveries
+    return _prepare_request(delivery, deliveree)
+
+
+def _sign_request(
+    request: requests.PreparedRequest,
+    deliveree: models.Webhook,
+    event_type: str,
+    delivery_uuid: str,
+) -> requests.PreparedRequest:
     body = request.body
     if not isinstance(body, bytes):
         body = body.encode("utf-8")
     signature = hmac.new(bytes(deliveree.secret, "utf-8"), body, hashlib.sha256)
 
-    _inject_headers(
-        request.headers, payload["event"]["type"], delivery.uuid, signature.hexdigest()
-    )
+    _inject_headers(request.headers, event_type, delivery_uuid, signature.hexdigest())
 
     return request
 
@@ -275,6 +346,81 @@ def send_test_ping_delivery(deliveree_uuid: str) -> Optional[requests.Response]:
         return None
 
 
+def _get_session() -> requests.Session:
+    """Gets the session shared by the deliveries of this process.
+
+    Connections are pooled per host and kept alive, thus consecutive
+    deliveries to a webhook reuse the same connections. Cookies are
+    never stored, they would otherwise leak across deliveries.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            session.cookies.set_policy(
+                http.cookiejar.DefaultCookiePolicy(allowed_domains=[])
+            )
+            adapter = HTTPAdapter(
+                pool_maxsize=CONFIG_CLASS.WEBHOOK_DELIVERIES_CONCURRENCY
+            )
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _session = session
+    return _session
+
+
+def _send(request: requests.PreparedRequest, verify_ssl: bool) -> None:
+    """Sends a delivery.
+
+    Raises:
+        DeliveryFailed: If the webhook did not respond with a 2xx.
+    """
+    response = _get_session().send(
+        request, verify=verify_ssl, timeout=CONFIG_CLASS.WEBHOOK_DELIVERY_TIMEOUT
+    )
+    if response.status_code < 200 or response.status_code > 299:
+        raise self_errors.DeliveryFailed(
+            f'Failed to deliver {request.headers["X-Orchest-Delivery"]}: '
+            f"{response.status_code}."
+        )
+
+
+def _send_in_order(
+    requests_: List[requests.PreparedRequest], verify_ssl: bool
+) -> List[Optional[Exception]]:
+    """Sends the deliveries to a webhook one after the other.
+
+    Once a delivery fails the remaining ones are not sent, the webhook
+    is then likely to be down or overloaded.
+
+    Returns:
+        For every delivery, None if it was delivered, otherwise the
+        reason it was not.
+    """
+    errors: List[Optional[Exception]] = [None] * len(requests_)
+    for i, request in enumerate(requests_):
+        try:
+            _send(request, verify_ssl)
+        except Exception as e:
+            errors[i:] = [e] * (len(requests_) - i)
+            break
+    return errors
+
+
+def _set_outcome(delivery: models.Delivery, error: Optional[Exception]) -> None:
+    if error is None:
+        logger.info(f"Delivered {delivery.uuid}.")
+        delivery.set_delivered()
+        # Not really useful to set_delivered() atm since it will
+        # get deleted, but we might add some collateral effects
+        # or other logic to set_delivered in the future.
+        db.session.delete(delivery)
+    else:
+        logger.error(error)
+        delivery.reschedule()
+        logger.info(f"Rescheduling {delivery.uuid} at {delivery.scheduled_at}.")
+
+
 def deliver(delivery_uuid: str) -> None:
     """Delivers a webhook delivery. Will commit to the database.
 
@@ -313,31 +459,156 @@ def deliver(delivery_uuid: str) -> None:
         logger.info(f"No need to deliver {delivery_uuid}.")
         return
 
-    deliveree = models.Webhook.query.filter(
-        models.Webhook.uuid == delivery.deliveree
-    ).first()
+    deliveree = (
+        models.Webhook.query.options(noload(models.Webhook.subscriptions))
+        .filter(models.Webhook.uuid == delivery.deliveree)
+        .first()
+    )
     if deliveree is None:
         raise ValueError("Deliveree of delivery isn't of type webhook.")
 
-    request = _prepare_request(delivery, deliveree)
+    request = _prepare([delivery], deliveree)
+    try:
+        _send(request, deliveree.verify_ssl)
+        error = None
+    except Exception as e:
+        error = e
+    _set_outcome(delivery, error)
+
+    db.session.commit()
+
+
+def _claim_batches(
+    now: datetime.datetime,
+) -> List[Tuple[models.Webhook, List[models.Delivery]]]:
+    """Claims the due deliveries of the batched webhooks.
 
-    with requests.Session() as session:
+    The deliveries of a batched webhook are claimed once the oldest due
+    one has been due for `WEBHOOK_DELIVERIES_BATCH_WINDOW` seconds, or
+    once a full batch is due. Up to
+    `WEBHOOK_DELIVERIES_MAX_CONCURRENCY_PER_DELIVEREE` batches are
+    claimed per webhook.
+
+    Returns:
+        The batches, oldest deliveries first.
+
+    """
+    due = [
+        models.Delivery.status.in_(["SCHEDULED", "RESCHEDULED"]),
+        models.Delivery.scheduled_at <= now,
+    ]
+    window_start = now - datetime.timedelta(
+        seconds=CONFIG_CLASS.WEBHOOK_DELIVERIES_BATCH_WINDOW
+    )
+    ready_webhooks = (
+        models.Webhook.query.join(
+            models.Delivery, models.Delivery.deliveree == models.Webhook.uuid
+        )
+        .options(noload(models.Webhook.subscriptions), undefer(models.Webhook.secret))
+        .filter(models.Webhook.batch_size > 1, *due)
+        .group_by(models.Webhook.uuid)
+        .having(
+            or_(
+                func.min(models.Delivery.scheduled_at) <= window_start,
+                func.count(models.Delivery.uuid) >= models.Webhook.batch_size,
+            )
+        )
+        .all()
+    )
+
+    max_batches = CONFIG_CLASS.WEBHOOK_DELIVERIES_MAX_CONCURRENCY_PER_DELIVEREE
+    batches = []
+    for webhook in ready_webhooks:
+        deliveries = (
+            models.Delivery.query.with_for_update(skip_locked=True)
+            .filter(models.Delivery.deliveree == webhook.uuid, *due)
+            .order_by(models.Delivery.scheduled_at)
+            .limit(webhook.batch_size * max_batches)
+            .all()
+        )
+        for i in range(0, len(deliveries), webhook.batch_size):
+            batches.append((webhook, deliveries[i : i + webhook.batch_size]))
+    return batches
+
+
+def deliver_batch(size: int) -> int:
+    """Delivers a batch of due webhook deliveries. Will commit.
+
+    Claims up to `size` due deliveries, oldest first, skipping the ones
+    that are locked by a concurrent worker, along with the deliveries
+    of the batched webhooks that are ready, see _claim_batches(). The
+    requests to a webhook are spread over at most
+    `WEBHOOK_DELIVERIES_MAX_CONCURRENCY_PER_DELIVEREE` lanes, each lane
+    being delivered in order, and the lanes of all webhooks are
+    delivered concurrently by `WEBHOOK_DELIVERIES_CONCURRENCY` threads.
+    Deliveries are otherwise performed and rescheduled like through
+    deliver(). The batch is committed as a whole, which releases the
+    claimed deliveries.
+
+    Args:
+        size: Max number of deliveries to claim, not counting the ones
+            of batched webhooks.
+
+    Returns:
+        The number of claimed deliveries.
+
+    """
+    now = datetime.datetime.now(datetime.timezone.utc)
+    claimed = [
+        (webhook, [delivery])
+        for delivery, webhook in db.session.query(models.Delivery, models.Webhook)
+        .join(models.Webhook, models.Webhook.uuid == models.Delivery.deliveree)
+        .options(noload(models.Webhook.subscriptions), undefer(models.Webhook.secret))
+        .filter(
+            models.Webhook.batch_size <= 1,
+            models.Delivery.status.in_(["SCHEDULED", "RESCHEDULED"]),
+            models.Delivery.scheduled_at <= now,
+        )
+        .order_by(models.Delivery.scheduled_at)
+        .limit(size)
+        .with_for_update(of=models.Delivery, skip_locked=True)
+        .all()
+    ]
+    claimed.extend(_claim_batches(now))
+    n_claimed = sum(len(deliveries) for _, deliveries in claimed)
+    logger.info(f"Claimed {n_claimed} webhook deliveries to deliver.")
+
+    # Deliveries are only sent from the worker threads, which do not
+    # touch the session.
+    max_lanes = CONFIG_CLASS.WEBHOOK_DELIVERIES_MAX_CONCURRENCY_PER_DELIVEREE
+    lanes: Dict[
+        Tuple[str, int], List[Tuple[List[models.Delivery], requests.PreparedRequest]]
+    ] = collections.defaultdict(list)
+    n_requests: Dict[str, int] = collections.Counter()
+    verify_ssl: Dict[str, bool] = {}
+    for webhook, deliveries in claimed:
         try:
-            response = session.send(request, verify=deliveree.verify_ssl, timeout=5)
-            if response.status_code >= 200 and response.status_code <= 299:
-                logger.info(f"Delivered {delivery_uuid}.")
-                delivery.set_delivered()
-                # Not really useful to set_delivered() atm since it will
-                # get deleted, but we might add some collateral effects
-                # or other logic to set_delivered in the future.
-                db.session.delete(delivery)
-            else:
-                raise self_errors.DeliveryFailed(
-                    f"Failed to deliver {delivery_uuid}: {response.status_code}."
-                )
+            request = _prepare(deliveries, webhook)
         except Exception as e:
-            logger.error(e)
-            delivery.reschedule()
-            logger.info(f"Rescheduling {delivery_uuid} at {delivery.scheduled_at}.")
+            for delivery in deliveries:
+                _set_outcome(delivery, e)
+            continue
+        lane = n_requests[webhook.uuid] % max_lanes
+        n_requests[webhook.uuid] += 1
+        lanes[(webhook.uuid, lane)].append((deliveries, request))
+        verify_ssl[webhook.uuid] = webhook.verify_ssl
+
+    if lanes:
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=min(len(lanes), CONFIG_CLASS.WEBHOOK_DELIVERIES_CONCURRENCY)
+        ) as executor:
+            futures = {
+                executor.submit(
+                    _send_in_order,
+                    [request for _, request in lane],
+                    verify_ssl[webhook_uuid],
+                ): lane
+                for (webhook_uuid, _), lane in lanes.items()
+            }
+            for future in concurrent.futures.as_completed(futures):
+                for (deliveries, _), error in zip(futures[future], future.result()):
+                    for delivery in deliveries:
+                        _set_outcome(delivery, error)
 
     db.session.commit()
+    return n_claimed
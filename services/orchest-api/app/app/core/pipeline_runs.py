@@ -10,13 +10,15 @@ perform a pipeline run given a Pipeline instance and some configuration
 parameters.
 
 """
+import collections
 import json
 import os
+import re
 import time
-from typing import Any, Dict, List, Set
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
 
 from celery.contrib.abortable import AbortableAsyncResult
-from kubernetes import client
+from kubernetes import client, watch
 
 import app.utils as utils
 from _orchest.internals import config as _config
@@ -25,8 +27,8 @@ from _orchest.internals.utils import get_step_and_kernel_volumes_and_volume_moun
 from app import models
 from app.apis.namespace_jobs import UpdateJobPipelineRun
 from app.apis.namespace_runs import UpdateInteractivePipelineRun
-from app.connections import db, k8s_core_api, k8s_custom_obj_api
-from app.core import pod_scheduling
+from app.connections import db, k8s_custom_obj_api
+from app.core import pod_scheduling, step_cache
 from app.core.pipelines import Pipeline, PipelineStep
 from app.types import RunConfig
 from config import CONFIG_CLASS
@@ -57,6 +59,11 @@ def _step_to_workflow_manifest_task(
         {"name": "ORCHEST_NAMESPACE", "value": _config.ORCHEST_NAMESPACE},
         {"name": "ORCHEST_CLUSTER", "value": _config.ORCHEST_CLUSTER},
     ]
+    fingerprint = step_cache.get_step_fingerprint(run_config, step.properties["uuid"])
+    if fingerprint is not None:
+        orchest_env_variables.append(
+            {"name": "ORCHEST_STEP_FINGERPRINT", "value": fingerprint}
+        )
     # Note that the order of concatenation matters, so that there is no
     # risk that the user overwrites internal variables accidentally.
     env_variables = user_env_variables + orchest_env_variables
@@ -65,9 +72,7 @@ def _step_to_workflow_manifest_task(
     # the container, and if the image is missing it will prompt a pull
     # which will fail because the FQDN can't be resolved by the local
     # engine on the node. K8S_TODO: fix this.
-    registry_ip = k8s_core_api.read_namespaced_service(
-        _config.REGISTRY, _config.ORCHEST_NAMESPACE
-    ).spec.cluster_ip
+    registry_ip = utils.get_registry_ip()
     # The image of the step is the registry address plus the image name.
     image = (
         registry_ip
@@ -76,6 +81,12 @@ def _step_to_workflow_manifest_task(
     )
 
     if _run_as_container_set(pipeline):
+        # The steps share the pod and thus its memory, which allows
+        # passing data through memory.
+        env_variables = env_variables + [
+            {"name": "ORCHEST_MEMORY_STORE_DIR", "value": _config.MEMORY_STORE_DIR}
+        ]
+
         # NOTE: In this case we don't run an initContainer to pre-pull
         # images.
         task = {
@@ -166,6 +177,22 @@ def _run_as_container_set(pipeline: Pipeline) -> bool:
     )
 
 
+_MEMORY_SIZE_UNITS = {"KB": 1000, "MB": 1000**2, "GB": 1000**3}
+
+
+def _get_memory_store_size_limit(pipeline: Pipeline) -> Optional[int]:
+    """Gets the size in bytes of the memory store of a run.
+
+    The size is given by the `data_passing_memory_size` setting of the
+    pipeline, e.g. "1GB", None is returned if it is missing or invalid.
+    """
+    size = pipeline.properties["settings"].get("data_passing_memory_size")
+    match = re.match(r"^(\d+(?:\.\d+)?)\s*(KB|MB|GB)$", str(size))
+    if match is None:
+        return None
+    return int(float(match.group(1)) * _MEMORY_SIZE_UNITS[match.group(2)])
+
+
 def _get_pipeline_argo_templates(
     entrypoint_name: str,
     volume_mounts: List[dict],
@@ -281,6 +308,18 @@ def _pipeline_to_workflow_manifest(
         container_pipeline_file=_config.PIPELINE_FILE,
         container_runtime_socket=_config.CONTAINER_RUNTIME_SOCKET,
     )
+    if _run_as_container_set(pipeline):
+        # Memory backed (tmpfs) volume that is only shared by the steps
+        # of this run and removed together with the pod. Without a size
+        # limit the tmpfs is as large as the memory of the node.
+        empty_dir = {"medium": "Memory"}
+        size_limit = _get_memory_store_size_limit(pipeline)
+        if size_limit is not None:
+            empty_dir["sizeLimit"] = str(size_limit)
+        volumes.append({"name": "memory-store", "emptyDir": empty_dir})
+        volume_mounts.append(
+            {"name": "memory-store", "mountPath": _config.MEMORY_STORE_DIR}
+        )
 
     # these parameters will be fed by _step_to_workflow_manifest_task
     entrypoint_name = "pipeline"
@@ -370,6 +409,19 @@ def _update_pipeline_run_status(
             UpdateJobPipelineRun(tpe).transaction(run.job_uuid, run_uuid, status)
 
 
+def fail_pending_pipeline_run(run_config: Dict[str, Any], run_uuid: str) -> None:
+    """Fails a run that never started, its steps are aborted."""
+    step_uuids = [
+        step.step_uuid
+        for step in db.session.query(models.PipelineRunStep.step_uuid).filter_by(
+            run_uuid=run_uuid
+        )
+    ]
+    utils.update_steps_status(run_uuid, step_uuids, "ABORTED")
+    db.session.commit()
+    _update_pipeline_run_status(run_config, run_uuid, "FAILURE")
+
+
 def _pipeline_has_reached_end_state(run_config: Dict[str, Any], run_uuid: str) -> bool:
     if AbortableAsyncResult(run_uuid).is_aborted():
         return True
@@ -383,149 +435,407 @@ def _pipeline_has_reached_end_state(run_config: Dict[str, Any], run_uuid: str) -
     return run is None or run.status in ["SUCCESS", "FAILURE", "ABORTED"]
 
 
-def run_pipeline_workflow(
-    session_uuid: str, task_id: str, pipeline: Pipeline, *, run_config: RunConfig
-):
-    _update_pipeline_run_status(run_config, task_id, "STARTED")
+# A watch is restarted after this many seconds, which bounds the time it
+# takes to notice that a run was aborted while its workflow is idle.
+_WORKFLOW_WATCH_TIMEOUT = 5
 
-    namespace = _config.ORCHEST_NAMESPACE
+# Minimum number of seconds between checks of whether a run was aborted
+# or deleted, which involves querying the db and the celery backend.
+_END_STATE_CHECK_INTERVAL = 2
 
-    steps_to_start = {step.properties["uuid"] for step in pipeline.steps}
-    steps_to_finish = set(steps_to_start)
-    had_failed_steps = False
-    run_as_container_set = _run_as_container_set(pipeline)
-    try:
-        manifest = _pipeline_to_workflow_manifest(
-            session_uuid, f"pipeline-run-task-{task_id}", pipeline, run_config
-        )
-        try:
-            k8s_custom_obj_api.create_namespaced_custom_object(
-                "argoproj.io", "v1alpha1", namespace, "workflows", body=manifest
-            )
-        # It's difficult to reproduce but it looks like that, on some
-        # cases during a restart, rabbitmq has given the task to the
-        # worker again, likely due to the worker losing connection (?).
-        # This makes it so that the workflow is not cancelled and failed
-        # unnecessarily.
-        except client.rest.ApiException as api_exception:
-            if not (
-                api_exception.status == 409 and "AlreadyExists" in api_exception.body
-            ):
-                raise api_exception
 
-        while steps_to_finish:
-            resp = k8s_custom_obj_api.get_namespaced_custom_object(
+def get_changed_nodes(
+    workflow: Dict[str, Any],
+    node_states: Dict[str, Tuple[Optional[str], Optional[str]]],
+) -> List[Dict[str, Any]]:
+    """Gets the nodes of the workflow that changed.
+
+    Args:
+        workflow: The Argo workflow.
+        node_states: The (phase, message) of every node of the workflow
+            as seen before, which is updated in place.
+
+    Returns:
+        The nodes of which the phase or message changed.
+    """
+    changed_nodes = []
+    nodes = workflow.get("status", {}).get("nodes", {})
+    for node_id, argo_node in nodes.items():
+        state = (argo_node.get("phase"), argo_node.get("message"))
+        if node_states.get(node_id) != state:
+            node_states[node_id] = state
+            changed_nodes.append(argo_node)
+    return changed_nodes
+
+
+def _watch_changed_workflow_nodes(
+    namespace: str, workflow_name: str
+) -> Iterator[List[Dict[str, Any]]]:
+    """Watches the workflow, yielding the nodes that changed.
+
+    Instead of polling the entire workflow, a watch is used which gets
+    notified of the changes to the workflow by the k8s API server. Only
+    the nodes of which the phase or message changed since the previous
+    notification are yielded. An empty list is yielded every
+    `_WORKFLOW_WATCH_TIMEOUT` seconds in case there were no changes, so
+    that the caller gets the chance to stop watching.
+
+    Raises:
+        Exception: If the workflow was deleted.
+    """
+    node_states: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
+    resource_version = None
+    while True:
+        kwargs = {
+            "field_selector": f"metadata.name={workflow_name}",
+            "timeout_seconds": _WORKFLOW_WATCH_TIMEOUT,
+        }
+        if resource_version is not None:
+            kwargs["resource_version"] = resource_version
+
+        try:
+            for event in watch.Watch().stream(
+                k8s_custom_obj_api.list_namespaced_custom_object,
                 "argoproj.io",
                 "v1alpha1",
                 namespace,
                 "workflows",
-                f"pipeline-run-task-{task_id}",
+                **kwargs,
+            ):
+                workflow = event["object"]
+                if event["type"] == "ERROR":
+                    # The resource version is too old, watch from the
+                    # current state of the workflow instead.
+                    resource_version = None
+                    break
+                if event["type"] == "DELETED":
+                    raise Exception(f"Workflow {workflow_name} was deleted.")
+
+                resource_version = workflow["metadata"]["resourceVersion"]
+                yield get_changed_nodes(workflow, node_states)
+        except client.rest.ApiException as e:
+            if e.status != 410:
+                raise
+            resource_version = None
+
+        yield []
+
+
+def _get_step_uuid(
+    argo_node: Dict[str, Any], run_as_container_set: bool
+) -> Optional[str]:
+    """Gets the UUID of the step that is run by the given node.
+
+    Returns:
+        The UUID of the step, or `None` if the node does not run a step.
+    """
+    if run_as_container_set:
+        if argo_node.get("type", "") != "Container":
+            return None
+
+        # Argo doesn't allow to work with templates for a
+        # containerSet. Thus we fall back to the name we
+        # gave to steps, which includes its uuid.
+        step_uuid = argo_node.get("displayName")
+        if step_uuid is None:
+            # Should never happen.
+            raise Exception(
+                f"Did not find `displayName` in Argo workflow node: {argo_node}."
             )
-            workflow_nodes: dict = resp.get("status", {}).get("nodes", {})
-            for argo_node in workflow_nodes.values():
-                if run_as_container_set:
-                    if argo_node.get("type", "") != "Container":
-                        continue
-
-                    # Argo doesn't allow to work with templates for a
-                    # containerSet. Thus we fall back to the name we
-                    # gave to steps, which includes its uuid.
-                    step_uuid = argo_node.get("displayName")
-                    if step_uuid is None:
-                        # Should never happen.
-                        raise Exception(
-                            "Did not find `displayName` in Argo workflow node:"
-                            f" {argo_node}."
-                        )
-                    else:
-                        step_uuid = step_uuid.replace("step-", "")
-
-                else:
-                    # The nodes includes the entire "pipeline" node.
-                    if argo_node["templateName"] != "step":
-                        continue
-                    # The step was not run because the workflow failed.
-                    if "inputs" not in argo_node:
-                        continue
-                    if argo_node.get("type", "") != "Pod":
-                        continue
-
-                    for param in argo_node["inputs"]["parameters"]:
-                        if param["name"] == "step_uuid":
-                            step_uuid = param["value"]
-                            break
-                    else:
-                        # Should never happen.
-                        raise Exception(
-                            "Did not find `step_uuid` in parameters of Argo node:"
-                            f" {argo_node}."
-                        )
-
-                pipeline_step = pipeline.get_step(step_uuid)
-                argo_node_status = argo_node["phase"]
-                argo_node_message = argo_node.get("message", "")
-                step_status_update = None
-
-                # Argo does not fail a step if the container is stuck in
-                # a waiting state. Doesn't look like the pull backoff
-                # behavior can be tuned.
-                if argo_node_status in ["Pending", "Running"] and (
-                    "ImagePullBackOff" in argo_node_message
-                    or "ErrImagePull" in argo_node_message
-                ):
-                    step_status_update = "FAILURE"
-
-                elif (
-                    argo_node_status == "Running"
-                    and step_uuid in steps_to_start
-                    # Strictly speaking only needed in single-node
-                    # context as otherwise Argo takes care of correctly
-                    # putting a Step in "Running".
-                    and _is_step_allowed_to_run(pipeline_step, steps_to_finish)
-                ):
-                    step_status_update = "STARTED"
-                    steps_to_start.remove(step_uuid)
-
-                elif (
-                    argo_node_status in ["Succeeded", "Failed", "Error"]
-                    and step_uuid in steps_to_finish
-                ):
-                    step_status_update = {
-                        "Succeeded": "SUCCESS",
-                        "Failed": "FAILURE",
-                        "Error": "FAILURE",
-                    }[argo_node_status]
-
-                if step_status_update is not None:
-                    if step_status_update == "FAILURE":
-                        had_failed_steps = True
-
-                    if step_status_update in ["FAILURE", "ABORTED", "SUCCESS"]:
-                        steps_to_finish.remove(step_uuid)
-                        if step_uuid in steps_to_start:
-                            steps_to_start.remove(step_uuid)
-
-                    utils.update_steps_status(task_id, [step_uuid], step_status_update)
-                    db.session.commit()
-
-            if not steps_to_finish or had_failed_steps:
-                break
+        return step_uuid.replace("step-", "")
+
+    # The nodes includes the entire "pipeline" node.
+    if argo_node["templateName"] != "step":
+        return None
+    # The step was not run because the workflow failed.
+    if "inputs" not in argo_node:
+        return None
+    if argo_node.get("type", "") != "Pod":
+        return None
+
+    for param in argo_node["inputs"]["parameters"]:
+        if param["name"] == "step_uuid":
+            return param["value"]
+
+    # Should never happen.
+    raise Exception(
+        f"Did not find `step_uuid` in parameters of Argo node: {argo_node}."
+    )
 
-            if _pipeline_has_reached_end_state(run_config, task_id):
-                logger.info(f"Run {task_id} was aborted or deleted, exiting task.")
-                break
 
-            time.sleep(0.25)
+class PipelineRunTracker:
+    """Drives the status transitions of the steps of a pipeline run.
+
+    The tracker is fed the nodes of the Argo workflow of the run that
+    changed and updates the status of the corresponding steps.
+
+    Args:
+        task_id: UUID of the pipeline run.
+        pipeline: The pipeline that is run.
+        run_as_container_set: Whether the steps of the pipeline are run
+            as a containerSet.
+
+    Attributes:
+        steps_to_start: UUIDs of the steps that have not started yet.
+        steps_to_finish: UUIDs of the steps that have not finished yet.
+        had_failed_steps: Whether any of the steps failed.
+    """
+
+    def __init__(
+        self, task_id: str, pipeline: Pipeline, run_as_container_set: bool
+    ) -> None:
+        self.task_id = task_id
+        self.pipeline = pipeline
+        self.run_as_container_set = run_as_container_set
+
+        self.steps_to_start = {step.properties["uuid"] for step in pipeline.steps}
+        self.steps_to_finish = set(self.steps_to_start)
+        self.had_failed_steps = False
+
+        # Running nodes of steps that are not yet allowed to run, which
+        # are reconsidered even if the nodes themselves don't change.
+        self._waiting_nodes: List[Dict[str, Any]] = []
+
+    @property
+    def is_done(self) -> bool:
+        """Whether no more steps are going to change status."""
+        return not self.steps_to_finish or self.had_failed_steps
+
+    def process_nodes(self, changed_nodes: List[Dict[str, Any]]) -> None:
+        """Updates the status of the steps given the changed nodes.
+
+        All status transitions of a call are applied at once, with one
+        statement per status, in a single transaction. Once the tracker
+        `is_done`, the transaction is left open for `finish` to commit
+        together with the status of the run.
+
+        Args:
+            changed_nodes: Nodes of the Argo workflow that changed since
+                the last call.
+        """
+        status_updates: Dict[str, List[str]] = collections.defaultdict(list)
+        nodes, self._waiting_nodes = self._waiting_nodes + changed_nodes, []
+        for argo_node in nodes:
+            step_uuid = _get_step_uuid(argo_node, self.run_as_container_set)
+            if step_uuid is None:
+                continue
+
+            pipeline_step = self.pipeline.get_step(step_uuid)
+            argo_node_status = argo_node["phase"]
+            argo_node_message = argo_node.get("message", "")
+            step_status_update = None
+
+            # Argo does not fail a step if the container is stuck in a
+            # waiting state. Doesn't look like the pull backoff behavior
+            # can be tuned.
+            if argo_node_status in ["Pending", "Running"] and (
+                "ImagePullBackOff" in argo_node_message
+                or "ErrImagePull" in argo_node_message
+            ):
+                step_status_update = "FAILURE"
+
+            elif (
+                argo_node_status == "Running"
+                and step_uuid in self.steps_to_start
+                # Strictly speaking only needed in single-node context
+                # as otherwise Argo takes care of correctly putting a
+                # Step in "Running".
+                and _is_step_allowed_to_run(pipeline_step, self.steps_to_finish)
+            ):
+                step_status_update = "STARTED"
+                self.steps_to_start.remove(step_uuid)
+
+            elif argo_node_status == "Running" and step_uuid in self.steps_to_start:
+                self._waiting_nodes.append(argo_node)
 
-        if steps_to_finish:
-            utils.update_steps_status(task_id, steps_to_finish, "ABORTED")
+            elif (
+                argo_node_status in ["Succeeded", "Failed", "Error"]
+                and step_uuid in self.steps_to_finish
+            ):
+                step_status_update = {
+                    "Succeeded": "SUCCESS",
+                    "Failed": "FAILURE",
+                    "Error": "FAILURE",
+                }[argo_node_status]
+
+            if step_status_update is not None:
+                if step_status_update == "FAILURE":
+                    self.had_failed_steps = True
+
+                if step_status_update in ["FAILURE", "ABORTED", "SUCCESS"]:
+                    self.steps_to_finish.remove(step_uuid)
+                    if step_uuid in self.steps_to_start:
+                        self.steps_to_start.remove(step_uuid)
+
+                status_updates[step_status_update].append(step_uuid)
+
+        # A step that started and finished within the same call is first
+        # set to STARTED, so that its started_time is set.
+        for status in ["STARTED", "SUCCESS", "FAILURE"]:
+            if status_updates[status]:
+                utils.update_steps_status(self.task_id, status_updates[status], status)
+
+        if status_updates and not self.is_done:
             db.session.commit()
 
-        pipeline_status = "SUCCESS" if not had_failed_steps else "FAILURE"
-        _update_pipeline_run_status(run_config, task_id, pipeline_status)
+    def finish(self, run_config: Dict[str, Any]) -> str:
+        """Aborts the steps that did not finish and ends the run.
+
+        Returns:
+            The status of the pipeline run, "SUCCESS" or "FAILURE".
+        """
+        if self.steps_to_finish:
+            utils.update_steps_status(self.task_id, self.steps_to_finish, "ABORTED")
+
+        # Committed together with the step status updates.
+        pipeline_status = "SUCCESS" if not self.had_failed_steps else "FAILURE"
+        _update_pipeline_run_status(run_config, self.task_id, pipeline_status)
+        return pipeline_status
+
+    def fail(self, run_config: Dict[str, Any]) -> None:
+        """Aborts the steps that did not finish and fails the run."""
+        # Any pending status updates might have been rolled back, thus
+        # all steps that are not in an end state are aborted.
+        db.session.rollback()
+        utils.update_steps_status(
+            self.task_id,
+            [step.properties["uuid"] for step in self.pipeline.steps],
+            "ABORTED",
+        )
+        db.session.commit()
+        _update_pipeline_run_status(run_config, self.task_id, "FAILURE")
+
+
+def get_workflow_name(task_id: str) -> str:
+    return f"pipeline-run-task-{task_id}"
+
+
+def _create_workflow(namespace: str, manifest: Dict[str, Any]) -> None:
+    try:
+        k8s_custom_obj_api.create_namespaced_custom_object(
+            "argoproj.io", "v1alpha1", namespace, "workflows", body=manifest
+        )
+    # It's difficult to reproduce but it looks like that, on some cases
+    # during a restart, rabbitmq has given the task to the worker again,
+    # likely due to the worker losing connection (?). This makes it so
+    # that the workflow is not cancelled and failed unnecessarily.
+    except client.rest.ApiException as api_exception:
+        if not (api_exception.status == 409 and "AlreadyExists" in api_exception.body):
+            raise api_exception
+
+
+# Label of the workflows of which the pipeline run is driven by the run
+# supervisor, see `app.core.run_supervisor`.
+SUPERVISED_RUN_LABEL = "supervised_run"
+
+# Annotation of supervised workflows containing what the run supervisor
+# needs to know about the run, see `start_pipeline_workflow`.
+SUPERVISED_RUN_ANNOTATION = "orchest.io/supervised-run"
+
+
+def start_pipeline_workflow(
+    session_uuid: str,
+    task_id: str,
+    pipeline: Pipeline,
+    *,
+    run_config: RunConfig,
+    job_uuid: Optional[str] = None,
+) -> None:
+    """Starts the workflow of a pipeline run without awaiting it.
+
+    The status of the steps of the run is driven, and the run is ended,
+    by the run supervisor, which finds the workflow through its label.
+
+    Args:
+        job_uuid: UUID of the job if the run is part of a job, in which
+            case the non-interactive session of the run is shut down
+            once the run has ended.
+    """
+    _update_pipeline_run_status(run_config, task_id, "STARTED")
+
+    try:
+        pipeline = step_cache.skip_cached_steps(task_id, pipeline, run_config)
+        if not pipeline.steps:
+            PipelineRunTracker(task_id, pipeline, False).finish(run_config)
+            return
+
+        manifest = _pipeline_to_workflow_manifest(
+            session_uuid, get_workflow_name(task_id), pipeline, run_config
+        )
+        manifest["metadata"]["labels"][SUPERVISED_RUN_LABEL] = "true"
+
+        # Only the structure and settings of the pipeline are needed to
+        # track the run, the annotations of an object are limited in
+        # size.
+        pipeline_skeleton = {
+            "name": pipeline.properties["name"],
+            "uuid": pipeline.properties["uuid"],
+            "settings": pipeline.properties["settings"],
+            "steps": {
+                step.properties["uuid"]: {
+                    "uuid": step.properties["uuid"],
+                    "incoming_connections": step.properties["incoming_connections"],
+                }
+                for step in pipeline.steps
+            },
+        }
+        manifest["metadata"]["annotations"] = {
+            SUPERVISED_RUN_ANNOTATION: json.dumps(
+                {
+                    "session_uuid": session_uuid,
+                    "session_type": run_config["session_type"],
+                    "project_uuid": run_config["project_uuid"],
+                    "pipeline_uuid": run_config["pipeline_uuid"],
+                    "project_dir": run_config["project_dir"],
+                    "job_uuid": job_uuid,
+                    "run_as_container_set": _run_as_container_set(pipeline),
+                    "pipeline": pipeline_skeleton,
+                }
+            )
+        }
+        _create_workflow(_config.ORCHEST_NAMESPACE, manifest)
+    except Exception as e:
+        logger.error(e)
+        PipelineRunTracker(task_id, pipeline, False).fail(run_config)
+        raise
+
+
+def run_pipeline_workflow(
+    session_uuid: str, task_id: str, pipeline: Pipeline, *, run_config: RunConfig
+):
+    _update_pipeline_run_status(run_config, task_id, "STARTED")
+
+    namespace = _config.ORCHEST_NAMESPACE
+    tracker = PipelineRunTracker(task_id, pipeline, _run_as_container_set(pipeline))
+    try:
+        # Cached steps are neither part of the workflow nor tracked.
+        pipeline = step_cache.skip_cached_steps(task_id, pipeline, run_config)
+        tracker = PipelineRunTracker(task_id, pipeline, _run_as_container_set(pipeline))
+        if not pipeline.steps:
+            tracker.finish(run_config)
+            return
+
+        manifest = _pipeline_to_workflow_manifest(
+            session_uuid, get_workflow_name(task_id), pipeline, run_config
+        )
+        _create_workflow(namespace, manifest)
+
+        last_end_state_check = time.monotonic()
+        for changed_nodes in _watch_changed_workflow_nodes(
+            namespace, get_workflow_name(task_id)
+        ):
+            tracker.process_nodes(changed_nodes)
+            if tracker.is_done:
+                break
+
+            if time.monotonic() - last_end_state_check >= _END_STATE_CHECK_INTERVAL:
+                last_end_state_check = time.monotonic()
+                if _pipeline_has_reached_end_state(run_config, task_id):
+                    logger.info(f"Run {task_id} was aborted or deleted, exiting task.")
+                    break
+
+        tracker.finish(run_config)
 
     except Exception as e:
         logger.error(e)
-        utils.update_steps_status(task_id, steps_to_finish, "ABORTED")
-        db.session.commit()
-        _update_pipeline_run_status(run_config, task_id, "FAILURE")
+        tracker.fail(run_config)
@@ -8,6 +8,7 @@ As a client of this module you are most likely interested in how to get
 a pipeline json to a Pipeline instance.
 
 """
+import collections
 import copy
 from typing import Any, Dict, Iterable, List, Optional, Set
 
@@ -74,6 +75,49 @@ def construct_pipeline(
     raise ValueError("Function not defined for specified run_type")
 
 
+def construct_job_run_pipeline(
+    pipeline_definition: PipelineDefinition,
+    pipeline_run_spec: Dict[str, Any],
+    run_parameters: Dict[str, Any],
+) -> "Pipeline":
+    """Constructs the pipeline of a run of a job.
+
+    Args:
+        pipeline_definition: a json description of the pipeline of the
+            job.
+        pipeline_run_spec: the pipeline run spec of the job, see
+            `construct_pipeline` for the `uuids` and `run_type`.
+        run_parameters: the parameters of the run, a mapping from step
+            UUID to step parameters, with the pipeline parameters under
+            the reserved key.
+
+    Returns:
+        The pipeline of the run. Only the steps of the given definition
+        are copied, the other values are shared.
+    """
+    # Set the pipeline parameters.
+    pipeline_def = {
+        **pipeline_definition,
+        "parameters": run_parameters.get(_config.PIPELINE_PARAMETERS_RESERVED_KEY, {}),
+        "steps": dict(pipeline_definition["steps"]),
+    }
+
+    # Set the steps parameters in the pipeline definition.
+    for step_uuid, step_parameters in run_parameters.items():
+        # One of the entries is not actually a step_uuid.
+        if step_uuid == _config.PIPELINE_PARAMETERS_RESERVED_KEY:
+            continue
+        if step_uuid in pipeline_def["steps"]:
+            pipeline_def["steps"][step_uuid] = {
+                **pipeline_def["steps"][step_uuid],
+                "parameters": step_parameters,
+            }
+
+    return construct_pipeline(
+        pipeline_run_spec["uuids"], pipeline_run_spec["run_type"], pipeline_def
+    )
+
+
 class PipelineStep:
     """A step of a pipeline.
 
@@ -125,6 +169,21 @@ class PipelineStep:
 
 
 class Pipeline:
+    """A pipeline, i.e. a directed acyclic graph of steps.
+
+    The steps are indexed by their UUID, the index is rebuilt whenever
+    `steps` is assigned to. Steps of a pipeline must not be added or
+    removed by mutating the `steps` list in place.
+
+    Args:
+        steps: the steps of the pipeline.
+        properties: properties of the pipeline, e.g. its name.
+
+    Attributes:
+        steps: see "Args" section.
+        properties: see "Args" section.
+    """
+
     def __init__(
         self, steps: List[PipelineStep], properties: PipelineProperties
     ) -> None:
@@ -138,6 +197,16 @@ class Pipeline:
         # See the sentinel property for explanation.
         self._sentinel: Optional[PipelineStep] = None
 
+    @property
+    def steps(self) -> List[PipelineStep]:
+        return self._steps
+
+    @steps.setter
+    def steps(self, steps: List[PipelineStep]) -> None:
+        self._steps = steps
+        self._steps_by_uuid = {step.properties["uuid"]: step for step in steps}
+        self._topological_order: Optional[List[PipelineStep]] = None
+
     @classmethod
     def from_json(cls, description: PipelineDefinition) -> "Pipeline":
         """Constructs a pipeline from a json description.
@@ -182,14 +251,49 @@ class Pipeline:
         return description
 
     def get_step(self, uuid: str) -> PipelineStep:
-        # NOTE: This is slow, although reasonable for small/medium size
-        # pipelines.
-        for step in self.steps:
-            if uuid == step.properties["uuid"]:
-                return step
-        else:
+        try:
+            return self._steps_by_uuid[uuid]
+        except KeyError:
             raise ValueError(f"Step with uuid '{uuid}' not in pipeline.")
 
+    def get_topological_order(self) -> List[PipelineStep]:
+        """Returns the steps such that parents precede their children.
+
+        Only the connections between steps of the pipeline are taken
+        into account. The order is computed once, until the steps of the
+        pipeline are changed.
+
+        Raises:
+            ValueError if the pipeline contains a cycle.
+        """
+        if self._topological_order is not None:
+            return self._topological_order
+
+        in_degree = {
+            uuid: sum(p.properties["uuid"] in self._steps_by_uuid for p in step.parents)
+            for uuid, step in self._steps_by_uuid.items()
+        }
+        queue = collections.deque(
+            step for step in self.steps if in_degree[step.properties["uuid"]] == 0
+        )
+        order = []
+        while queue:
+            step = queue.popleft()
+            order.append(step)
+            for child in step._children:
+                child_uuid = child.properties["uuid"]
+                if child_uuid not in in_degree:
+                    continue
+                in_degree[child_uuid] -= 1
+                if in_degree[child_uuid] == 0:
+                    queue.append(self._steps_by_uuid[child_uuid])
+
+        if len(order) != len(self.steps):
+            raise ValueError("Pipeline contains a cycle.")
+
+        self._topological_order = order
+        return order
+
     def get_environments(self) -> Set[str]:
         """Returns the set of UUIDs of the used environments.
 
@@ -231,32 +335,46 @@ class Pipeline:
 
         Returns:
             An induced pipeline by the set of steps (defined by the
-            given selection).
+            given selection). The properties of its steps share their
+            values with the steps of this pipeline.
         """
-        keep_steps = [
-            step for step in self.steps if step.properties["uuid"] in selection
-        ]
+        selection = set(selection)
 
         # Only keep connection to parents and children if these steps
         # are also included in the selection. In addition, to keep
         # consistency of the properties attributes of the steps, we
         # update the "incoming_connections" to be representative of the
         # new pipeline structure.
-        new_steps = []
-        for step in keep_steps:
-            # Take a deepcopy such that the properties of the new and
-            # original step do not point to the same object (since we
-            # want to update the "incoming_connections").
-            new_step = PipelineStep(copy.deepcopy(step.properties))
-            new_step.parents = [s for s in step.parents if s in keep_steps]
-            new_step._children = [s for s in step._children if s in keep_steps]
-            new_step.properties["incoming_connections"] = [
-                s.properties["uuid"] for s in new_step.parents
+        new_steps = {
+            step.properties["uuid"]: PipelineStep(
+                # A shallow copy, such that updating the
+                # "incoming_connections" doesn't affect the original
+                # step.
+                {
+                    **step.properties,
+                    "incoming_connections": [
+                        s.properties["uuid"]
+                        for s in step.parents
+                        if s.properties["uuid"] in selection
+                    ],
+                }
+            )
+            for step in self.steps
+            if step.properties["uuid"] in selection
+        }
+        for new_step in new_steps.values():
+            step = self._steps_by_uuid[new_step.properties["uuid"]]
+            new_step.parents = [
+                new_steps[uuid] for uuid in new_step.properties["incoming_connections"]
+            ]
+            new_step._children = [
+                new_steps[s.properties["uuid"]]
+                for s in step._children
+                if s.properties["uuid"] in selection
             ]
-            new_steps.append(new_step)
 
-        properties = copy.deepcopy(self.properties)
-        return Pipeline(steps=new_steps, properties=properties)
+        properties = copy.copy(self.properties)
+        return Pipeline(steps=list(new_steps.values()), properties=properties)
 
     def convert_to_induced_subgraph(self, selection: List[str]) -> None:
         """Converts the pipeline to a subpipeline.
@@ -265,6 +383,7 @@ class Pipeline:
             Exactly the same as `get_induced_subgraph` except that it
             modifies the underlying `Pipeline` object inplace.
         """
+        selection = set(selection)
         self.steps = [
             step for step in self.steps if step.properties["uuid"] in selection
         ]
@@ -272,8 +391,12 @@ class Pipeline:
         # Removing connection from steps to "non-existing" steps, i.e.
         # steps that are not included in the selection.
         for step in self.steps:
-            step.parents = [s for s in step.parents if s in self.steps]
-            step._children = [s for s in step._children if s in self.steps]
+            step.parents = [
+                s for s in step.parents if s.properties["uuid"] in selection
+            ]
+            step._children = [
+                s for s in step._children if s.properties["uuid"] in selection
+            ]
 
     def incoming(self, selection: Iterable[str], inclusive: bool = False) -> "Pipeline":
         """Returns a new Pipeline of all ancestors of the selection.
@@ -299,6 +422,7 @@ class Pipeline:
         # kwarg `inclusive` the steps from the selection itself will
         # either be included or excluded.
         steps = set()
+        selection = set(selection)
 
         # Essentially a BFS where its stack gets initialized with
         # multiple root nodes.
@@ -311,11 +435,12 @@ class Pipeline:
 
             # Create a new Pipeline step that is a copy of the step. For
             # consistency also update the properties attribute and make
-            # it point to a new object.
-            new_properties = copy.deepcopy(step.properties)
-            new_properties["incoming_connections"] = [
-                s.properties["uuid"] for s in step.parents
-            ]
+            # it point to a new object, which shares its values with the
+            # original properties.
+            new_properties = {
+                **step.properties,
+                "incoming_connections": [s.properties["uuid"] for s in step.parents],
+            }
             new_step = PipelineStep(new_properties, step.parents)
 
             # NOTE: the childrens list has to be updated, since the
@@ -335,8 +460,8 @@ class Pipeline:
         if inclusive:
             steps_to_be_included = steps
         else:
-            steps_to_be_included = steps - set(
-                step for step in self.steps if step.properties["uuid"] in selection
+            steps_to_be_included = set(
+                step for step in steps if step.properties["uuid"] not in selection
             )
 
             # We have to go over the children again to make sure they
@@ -346,7 +471,7 @@ class Pipeline:
                     s for s in step._children if s in steps_to_be_included
                 ]
 
-        properties = copy.deepcopy(self.properties)
+        properties = copy.copy(self.properties)
         return Pipeline(steps=list(steps_to_be_included), properties=properties)
 
     def __repr__(self) -> str:
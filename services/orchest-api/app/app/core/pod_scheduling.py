@@ -179,7 +179,20 @@ def _should_constrain_to_nodes_with_image(
 
 
 def _get_image_information(image: str) -> Tuple[bool, bool, Optional[List[str]]]:
-    """Returns (built in Orchest, in registry, nodes with image)."""
+    """Returns (built in Orchest, in registry, nodes with image).
+
+    Cached for a short time, a pipeline run, or the runs of a job, will
+    otherwise query the same information for every step.
+    """
+    return _get_image_information_cached_with_ttl(
+        image, ttl_period=int(time.time() // 2)
+    )
+
+
+@lru_cache(maxsize=128)
+def _get_image_information_cached_with_ttl(
+    image: str, ttl_period: int
+) -> Tuple[bool, bool, Optional[List[str]]]:
     if "orchest-env" in image:
         proj_uuid, env_uuid, tag = _utils.env_image_name_to_proj_uuid_env_uuid_tag(
             image
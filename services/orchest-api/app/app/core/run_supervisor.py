@@ -0,0 +1,335 @@
+"""Module to supervise all pipeline runs from a single process.
+
+By default, every pipeline run occupies a celery worker for as long as
+the run takes, which is mostly spent waiting on the Argo workflow of
+the run. When `RUN_SUPERVISOR_ENABLED` is set, the celery tasks only
+create the workflow of a run, labeled as supervised, and return.
+
+The run supervisor is a single asyncio process that then takes over:
+
+* It watches all supervised workflows through one k8s watch, which
+  runs in a thread and hands the events to the event loop.
+* It drives the status transitions of the steps of every run, see
+  `PipelineRunTracker`.
+* It checks, for all runs at once, whether runs were aborted.
+* It ends runs, i.e. updates their status, deletes their workflow,
+  applies the data retention policies and, for job runs, ends their
+  non-interactive session.
+
+The event loop only coordinates, the database work of the above is
+done in a single thread so that it doesn't block the loop while the
+state of the runs is still changed by one thread at a time.
+
+Everything the supervisor needs to know about a run is stored on its
+workflow, so that a restarted supervisor picks up the runs that are
+ongoing.
+
+Run it through `python -m app.core.run_supervisor`.
+"""
+import asyncio
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from kubernetes import client, watch
+
+from _orchest.internals import config as _config
+from app import create_app, models, utils
+from app.connections import db, k8s_custom_obj_api
+from app.core import data_retention, session_pool
+from app.core.pipeline_runs import (
+    SUPERVISED_RUN_ANNOTATION,
+    SUPERVISED_RUN_LABEL,
+    PipelineRunTracker,
+    get_changed_nodes,
+)
+from app.core.pipelines import Pipeline
+from config import CONFIG_CLASS
+
+logger = utils.get_logger()
+
+# A watch is restarted after this many seconds.
+_WATCH_TIMEOUT = 60
+
+
+class _SupervisedRun:
+    """A pipeline run that is supervised.
+
+    Args:
+        workflow: The Argo workflow of the run.
+
+    Attributes:
+        task_id: UUID of the pipeline run.
+        info: What is stored on the workflow about the run, see
+            `app.core.pipeline_runs.start_pipeline_workflow`.
+        pipeline: The pipeline that is run, only containing its steps
+            and settings.
+        tracker: Drives the status transitions of the steps.
+        node_states: The (phase, message) of the nodes of the workflow
+            as last seen.
+    """
+
+    def __init__(self, workflow: Dict[str, Any]) -> None:
+        self.workflow_name = workflow["metadata"]["name"]
+        self.task_id = workflow["metadata"]["name"].replace("pipeline-run-task-", "")
+        self.info = json.loads(
+            workflow["metadata"]["annotations"][SUPERVISED_RUN_ANNOTATION]
+        )
+        self.pipeline = Pipeline.from_json(self.info["pipeline"])
+        self.tracker = PipelineRunTracker(
+            self.task_id, self.pipeline, self.info["run_as_container_set"]
+        )
+        self.node_states: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
+
+    @property
+    def run_config(self) -> Dict[str, Any]:
+        return {
+            "session_type": self.info["session_type"],
+            "project_dir": self.info["project_dir"],
+            "pipeline_uuid": self.info["pipeline_uuid"],
+        }
+
+
+class RunSupervisor:
+    """Supervises all pipeline runs of which the workflow is labeled.
+
+    All state changes, and the database work that goes with them,
+    happen in a single thread. The k8s watch and the blocking clean up
+    of ended runs happen in other threads.
+    """
+
+    def __init__(self, app) -> None:
+        self._app = app
+        self._runs: Dict[str, _SupervisedRun] = {}
+        # Workflows of runs that have ended, but are not yet deleted.
+        self._ended: Set[str] = set()
+        self._state_executor = ThreadPoolExecutor(max_workers=1)
+        self._clean_up_executor = ThreadPoolExecutor()
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        self._events: asyncio.Queue = asyncio.Queue()
+
+        threading.Thread(
+            target=self._watch_workflows, args=(loop,), daemon=True
+        ).start()
+        await asyncio.gather(self._process_events(), self._check_end_states())
+
+    def _watch_workflows(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Puts the events of all supervised workflows in the queue.
+
+        The first events of a watch without a resource version are the
+        ADDED events of all existing workflows, thus runs that started
+        before the supervisor did are picked up.
+        """
+        resource_version = None
+        while True:
+            kwargs = {
+                "label_selector": f"{SUPERVISED_RUN_LABEL}=true",
+                "timeout_seconds": _WATCH_TIMEOUT,
+            }
+            if resource_version is not None:
+                kwargs["resource_version"] = resource_version
+
+            try:
+                for event in watch.Watch().stream(
+                    k8s_custom_obj_api.list_namespaced_custom_object,
+                    "argoproj.io",
+                    "v1alpha1",
+                    _config.ORCHEST_NAMESPACE,
+                    "workflows",
+                    **kwargs,
+                ):
+                    if event["type"] == "ERROR":
+                        # The resource version is too old, watch from
+                        # the current state of the workflows instead.
+                        resource_version = None
+                        break
+                    resource_version = event["object"]["metadata"]["resourceVersion"]
+                    loop.call_soon_threadsafe(self._events.put_nowait, event)
+            except client.rest.ApiException as e:
+                if e.status != 410:
+                    logger.error(f"Failed to watch workflows: {e}")
+                resource_version = None
+            except Exception as e:
+                logger.error(f"Failed to watch workflows: {e}")
+                resource_version = None
+
+    async def _in_state_thread(self, func, *args) -> None:
+        """Runs a function in the thread that changes the state."""
+
+        def in_app_context():
+            with self._app.app_context():
+                func(*args)
+
+        await asyncio.get_running_loop().run_in_executor(
+            self._state_executor, in_app_context
+        )
+
+    async def _process_events(self) -> None:
+        while True:
+            event = await self._events.get()
+            try:
+                await self._in_state_thread(self._process_event, event)
+            except Exception as e:
+                logger.error(f"Failed to process workflow event: {e}")
+
+    def _process_event(self, event: Dict[str, Any]) -> None:
+        workflow = event["object"]
+        workflow_name = workflow["metadata"]["name"]
+
+        if event["type"] == "DELETED":
+            run = self._runs.get(workflow_name)
+            if run is not None:
+                logger.info(f"Workflow of run {run.task_id} was deleted.")
+                self._end_run(run)
+            self._ended.discard(workflow_name)
+            return
+
+        if workflow_name in self._ended:
+            return
+
+        run = self._runs.get(workflow_name)
+        if run is None:
+            run = _SupervisedRun(workflow)
+            self._runs[workflow_name] = run
+
+        try:
+            run.tracker.process_nodes(get_changed_nodes(workflow, run.node_states))
+        except Exception as e:
+            logger.error(e)
+            run.tracker.fail(run.run_config)
+            self._end_run(run, update_status=False)
+            return
+
+        if run.tracker.is_done:
+            self._end_run(run)
+
+    async def _check_end_states(self) -> None:
+        """Ends the runs that were aborted or deleted.
+
+        Also reconsiders the steps that are waiting on their parents.
+        """
+        while True:
+            await asyncio.sleep(CONFIG_CLASS.RUN_SUPERVISOR_END_STATE_CHECK_INTERVAL)
+            try:
+                await self._in_state_thread(self._check_runs)
+            except Exception as e:
+                logger.error(f"Failed to check the state of the runs: {e}")
+
+    def _check_runs(self) -> None:
+        if not self._runs:
+            return
+
+        for run in list(self._runs.values()):
+            run.tracker.process_nodes([])
+            if run.tracker.is_done:
+                self._end_run(run)
+
+        for task_id in _get_runs_in_end_state(self._runs.values()):
+            run = self._runs.get(f"pipeline-run-task-{task_id}")
+            if run is not None:
+                logger.info(f"Run {task_id} was aborted or deleted.")
+                self._end_run(run)
+
+    def _end_run(self, run: _SupervisedRun, update_status: bool = True) -> None:
+        del self._runs[run.workflow_name]
+        self._ended.add(run.workflow_name)
+        if update_status:
+            try:
+                run.tracker.finish(run.run_config)
+            except Exception as e:
+                logger.error(e)
+                run.tracker.fail(run.run_config)
+
+        self._clean_up_executor.submit(self._clean_up, run)
+
+    def _clean_up(self, run: _SupervisedRun) -> None:
+        """Cleans up after a run has ended, blocking."""
+        try:
+            k8s_custom_obj_api.delete_namespaced_custom_object(
+                "argoproj.io",
+                "v1alpha1",
+                _config.ORCHEST_NAMESPACE,
+                "workflows",
+                run.workflow_name,
+            )
+        except client.rest.ApiException as e:
+            if e.status != 404:
+                logger.error(f"Failed to delete workflow {run.workflow_name}: {e}")
+
+        with self._app.app_context():
+            try:
+                self._apply_retention(run)
+            finally:
+                db.session.remove()
+
+    def _apply_retention(self, run: _SupervisedRun) -> None:
+        # Clean up the data that the steps passed to each other, now
+        # that none of them is running anymore.
+        try:
+            data_retention.apply_run_retention(run.pipeline, run.run_config)
+        except Exception as e:
+            logger.error(f"Failed to apply data retention: {e}")
+
+        job_uuid = run.info["job_uuid"]
+        if job_uuid is None:
+            return
+
+        try:
+            session_pool.end_session(run.info["session_uuid"])
+        except Exception as e:
+            logger.error(f"Failed to end session of run {run.task_id}: {e}")
+
+        try:
+            data_retention.apply_job_retention(
+                run.pipeline, run.info["project_uuid"], job_uuid
+            )
+        except Exception as e:
+            logger.error(f"Failed to apply data retention of job {job_uuid}: {e}")
+
+
+def _get_runs_in_end_state(runs: Iterable[_SupervisedRun]) -> List[str]:
+    """Gets the UUIDs of the runs that were aborted or deleted.
+
+    Queries the status of all runs at once, per type of run.
+    """
+    task_ids = {"interactive": [], "noninteractive": []}
+    for run in runs:
+        task_ids[run.info["session_type"]].append(run.task_id)
+
+    ended = []
+    for session_type, model in [
+        ("interactive", models.InteractivePipelineRun),
+        ("noninteractive", models.NonInteractivePipelineRun),
+    ]:
+        if not task_ids[session_type]:
+            continue
+        ongoing = {
+            run.uuid
+            for run in db.session.query(model.uuid)
+            .filter(
+                model.uuid.in_(task_ids[session_type]),
+                model.status.not_in(["SUCCESS", "FAILURE", "ABORTED"]),
+            )
+            .all()
+        }
+        ended.extend(uuid for uuid in task_ids[session_type] if uuid not in ongoing)
+    # Release the connection, it's not needed until the next check.
+    db.session.commit()
+    return ended
+
+
+def main() -> None:
+    if not CONFIG_CLASS.RUN_SUPERVISOR_ENABLED:
+        logger.info("The run supervisor is not enabled, exiting.")
+        return
+
+    app = create_app(CONFIG_CLASS, use_db=True, register_api=False)
+    logger.info("Starting the run supervisor.")
+    asyncio.run(RunSupervisor(app).run())
+
+
+if __name__ == "__main__":
+    main()
@@ -23,14 +23,11 @@ from typing import Callable, Optional
 
 import sqlalchemy
 from apscheduler.schedulers.background import BackgroundScheduler
-from croniter import croniter
 from flask.app import Flask
 from sqlalchemy import desc
-from sqlalchemy.orm import load_only
 
 from _orchest.internals.two_phase_executor import TwoPhaseExecutor, TwoPhaseFunction
 from app import models, utils
-from app.apis.namespace_jobs import RunJob
 from app.connections import db
 from app.core import environments
 
@@ -41,6 +38,9 @@ class SchedulerJobType(enum.Enum):
     CLEANUP_OLD_SCHEDULER_JOB_RECORDS = "CLEANUP_OLD_SCHEDULER_JOB_RECORDS"
     PROCESS_IMAGES_FOR_DELETION = "PROCESS_IMAGES_FOR_DELETION"
     PROCESS_NOTIFICATIONS_DELIVERIES = "PROCESS_NOTIFICATIONS_DELIVERIES"
+    REAP_IDLE_JOB_SESSIONS = "REAP_IDLE_JOB_SESSIONS"
+    # Job runs are scheduled by `app.core.job_scheduler`, kept so that
+    # the records of when they were polled for are cleaned up.
     SCHEDULE_JOB_RUNS = "SCHEDULE_JOB_RUNS"
 
 
@@ -65,11 +65,6 @@ def add_recurring_jobs_to_scheduler(
             "interval": app.config["CLEANUP_OLD_SCHEDULER_JOB_RECORDS_INTERVAL"],
             "job_func": jobs.handle_cleanup_old_scheduler_job_records,
         },
-        "schedule job runs": {
-            "allowed_to_run": True,
-            "interval": app.config["SCHEDULER_INTERVAL"],
-            "job_func": jobs.handle_schedule_job_runs,
-        },
         "process images for deletion": {
             "allowed_to_run": True,
             "interval": app.config["IMAGES_DELETION_INTERVAL"],
@@ -80,6 +75,11 @@ def add_recurring_jobs_to_scheduler(
             "interval": app.config["NOTIFICATIONS_DELIVERIES_INTERVAL"],
             "job_func": jobs.handle_process_notifications_deliveries,
         },
+        "reap idle job sessions": {
+            "allowed_to_run": True,
+            "interval": app.config["REAP_IDLE_JOB_SESSIONS_INTERVAL"],
+            "job_func": jobs.handle_reap_idle_job_sessions,
+        },
     }
 
     for name, job in recurring_jobs.items():
@@ -130,26 +130,6 @@ class Jobs:
             app,
         )
 
-    def handle_schedule_job_runs(self, app: Flask, interval: int = 0) -> None:
-        """Handles checking for job runs to be scheduled.
-
-        The schedule is defined by the given interval. E.g.
-        `interval=15` will cause this job to run if 15 seconds have
-        passed since the previous run.
-
-        Args:
-            interval: How much time should have passed after the
-                previous execution of this job (in seconds). And thus an
-                `interval=0` will execute the job right away.
-
-        """
-        return self._handle_recurring_scheduler_job(
-            SchedulerJobType.SCHEDULE_JOB_RUNS.value,
-            interval,
-            schedule_job_runs,
-            app,
-        )
-
     def handle_process_images_for_deletion(self, app: Flask, interval: int = 0) -> None:
         """Handles processing images for deletion."""
         return self._handle_recurring_scheduler_job(
@@ -170,6 +150,15 @@ class Jobs:
             app,
         )
 
+    def handle_reap_idle_job_sessions(self, app: Flask, interval: int = 0) -> None:
+        """Handles shutting down idle sessions of jobs."""
+        return self._handle_recurring_scheduler_job(
+            SchedulerJobType.REAP_IDLE_JOB_SESSIONS.value,
+            interval,
+            reap_idle_job_sessions,
+            app,
+        )
+
     @staticmethod
     def _handle_recurring_scheduler_job(
         job_type: str, interval: int, handle_func: Callable, app: Flask
@@ -297,108 +286,6 @@ def cleanup_old_scheduler_job_records(app, task_uuid: str) -> None:
         notify_scheduled_job_succeeded(task_uuid)
 
 
-def schedule_job_runs(app, task_uuid: str) -> None:
-    """Checks for job runs to be scheduled.
-
-    The scheduler works by checking for which jobs are due to be run by
-    querying the database, which acts as the ground truth. The column of
-    interest to decide if a job should be scheduled is the
-    next_scheduled_time column, which is a UTC timestamp confronted with
-    the current UTC time.
-
-    Given a job that should have been run at time X, if Orchest was not
-    running at that time, the scheduler will run the job.  Given a
-    recurring job that should have been run at time X, if Orchest was
-    not running at that time, the scheduler will run the job and set the
-    next_scheduled_time accordingly, in a way that all job runs that
-    have been missed will be scheduled. For example, given a recurring
-    job with cron string "* * * * *" (runs every minute),
-    next_scheduled_time set to 12:00, if Orchest was offline and it's
-    started at 12:10 the scheduler will schedule the job run of 12:00,
-    and will set the next_scheduled_time to 12:01, which will in turn
-    trigger another scheduling, which will set the next_scheduled_time
-    to 12:02, etc., all the way up to being on par with all the runs
-    that should have been scheduled. This way all job runs that were
-    missed will be scheduled and run.
-
-    """
-
-    logger = logging.getLogger("job-scheduler")
-
-    now = datetime.datetime.now(datetime.timezone.utc)
-
-    with app.app_context():
-
-        if utils.OrchestSettings()["PAUSED"]:
-            logger.info("Orchest is paused, skipping job scheduling.")
-            return
-
-        query = (
-            models.Job.query.options(
-                load_only(
-                    "uuid",
-                    "schedule",
-                    "next_scheduled_time",
-                )
-            ).filter(models.Job.status.in_(["PENDING", "STARTED"]))
-            # Filter out jobs that do not have to run anymore.
-            .filter(models.Job.next_scheduled_time.isnot(None))
-            # Jobs which have next_scheduled_time before now need to to
-            # be scheduled.
-            .filter(now > models.Job.next_scheduled_time)
-            # Order by time difference descending, so that the job which
-            # is more "behind" gets scheduled first.
-            .order_by(desc(now - models.Job.next_scheduled_time))
-        )
-
-        jobs_to_run = query.all()
-
-        if jobs_to_run:
-            logger.info(f"found {len(jobs_to_run)} jobs to run")
-
-        # Use one transaction per job, so errors in one job do not
-        # hinder the others.
-        for job in jobs_to_run:
-            try:
-                job = query.with_for_update().filter_by(uuid=job.uuid).first()
-                # The job might have been paused in this tiny time
-                # window.
-                if job is None:
-                    continue
-
-                # Based on the type of Job (recurring or not) set the
-                # status and next_scheduled_time. Note that for
-                # recurring jobs the next scheduled time is computed
-                # starting from "now", this assumes that the scheduler
-                # runs every N seconds where N < 60; otherwise some runs
-                # might be lost. If such assumption cannot be made, the
-                # first time the scheduler runs (after boot) the
-                # calculation must be made using "now" to aggregate lost
-                # jobs into 1, while all other scheduler calls need to
-                # use the current value of next_scheduled_time as a
-                # base.  Note: we maintain correctness even if the
-                # scheduler runs past the minute the job was scheduled
-                # for.
-                job.last_scheduled_time = job.next_scheduled_time
-                if job.schedule is not None:
-                    job.next_scheduled_time = croniter(job.schedule, now).get_next(
-                        datetime.datetime
-                    )
-                else:
-                    # One time jobs are not rescheduled again.
-                    job.next_scheduled_time = None
-
-                with TwoPhaseExecutor(db.session) as tpe:
-                    logger.info(f"Scheduling job {job.uuid}.")
-                    RunJob(tpe).transaction(job.uuid)
-
-                db.session.commit()
-            except Exception as e:
-                logger.error(e)
-
-        notify_scheduled_job_succeeded(task_uuid)
-
-
 def process_images_for_deletion(app, task_uuid: str) -> None:
     """Processes built images to find inactive ones.
 
@@ -459,6 +346,16 @@ def process_notification_deliveries(app, task_uuid: str) -> None:
         res.forget()
 
 
+def reap_idle_job_sessions(app, task_uuid: str) -> None:
+    with app.app_context():
+        app.logger.debug("Sending reap idle job sessions task.")
+        celery = app.config["CELERY"]
+        res = celery.send_task(
+            name="app.core.tasks.reap_idle_job_sessions", task_id=task_uuid
+        )
+        res.forget()
+
+
 def notify_scheduled_job_succeeded(uuid: str) -> None:
     models.SchedulerJob.query.with_for_update().filter(
         models.SchedulerJob.uuid == uuid
@@ -0,0 +1,259 @@
+"""Module to reuse non-interactive sessions across the runs of a job.
+
+Every job run normally launches its own non-interactive session, i.e.
+its user services, and shuts it down once the run is done. For jobs
+that run often and have services that are slow to start this
+dominates the duration of a run.
+
+When a pipeline has the `reuse_job_sessions` setting enabled, the
+session of a job run is instead released to a pool once the run is
+done, and leased by the next run of the same job that has the same
+service configuration. Sessions are only leased by one run at a time.
+Idle sessions are shut down by `reap_idle_sessions` once they have not
+been used for `JOB_SESSION_IDLE_TTL` seconds, or once their job has
+ended.
+
+Since a pooled session is not tied to a run, steps get the uuid of the
+pooled session, e.g. `ORCHEST_SESSION_UUID`, to reach the services.
+Note that the logs of the services are written to the directory of
+the run that launched the session.
+"""
+import datetime
+import hashlib
+import json
+import uuid
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import or_
+
+from app import models, utils
+from app.connections import db
+from app.core.sessions import launch, shutdown
+from app.types import NonInteractiveSessionConfig, PipelineDefinition, SessionType
+
+logger = utils.get_logger()
+
+
+def is_enabled(
+    pipeline_definition: PipelineDefinition,
+    session_config: NonInteractiveSessionConfig,
+) -> bool:
+    """Whether the session of a job run should be pooled.
+
+    Only sessions with services can be pooled, without services a
+    session has nothing to reuse. Services that bind the project
+    directory can't be reused since they would keep seeing the
+    directory of the run that launched them.
+    """
+    if not pipeline_definition.get("settings", {}).get("reuse_job_sessions", False):
+        return False
+
+    services = _get_services(session_config)
+    return bool(services) and not any(
+        "/project-dir" in service.get("binds", {}) for service in services.values()
+    )
+
+
+def _get_services(session_config: NonInteractiveSessionConfig) -> Dict[str, Any]:
+    return {
+        name: service
+        for name, service in session_config.get("services", {}).items()
+        if SessionType.NONINTERACTIVE.value in service["scope"]
+    }
+
+
+def get_config_hash(session_config: NonInteractiveSessionConfig) -> str:
+    """Hashes what the services of a session are launched with."""
+    config = {
+        "services": _get_services(session_config),
+        "env_uuid_to_image": session_config["env_uuid_to_image"],
+        "user_env_variables": session_config.get("user_env_variables", {}),
+    }
+    return hashlib.sha256(
+        json.dumps(config, sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+
+def _lease(job_uuid: str, config_hash: str, run_uuid: str) -> Optional[str]:
+    session = (
+        models.PooledSession.query.with_for_update(skip_locked=True)
+        .filter(
+            models.PooledSession.job_uuid == job_uuid,
+            models.PooledSession.config_hash == config_hash,
+            models.PooledSession.leased_by.is_(None),
+        )
+        .first()
+    )
+    if session is None:
+        db.session.commit()
+        return None
+
+    session.leased_by = run_uuid
+    session.last_used_time = datetime.datetime.now(datetime.timezone.utc)
+    db.session.commit()
+    return session.uuid
+
+
+def acquire(
+    job_uuid: str,
+    run_uuid: str,
+    session_config: NonInteractiveSessionConfig,
+    should_abort: Optional[Callable] = None,
+) -> str:
+    """Leases an idle session of the job or launches a new one.
+
+    Args:
+        job_uuid: UUID of the job.
+        run_uuid: UUID of the pipeline run that will use the session.
+        session_config: See `sessions.launch`.
+        should_abort: See `sessions.launch`.
+
+    Returns:
+        The UUID of the session, to be released through `release`.
+
+    """
+    config_hash = get_config_hash(session_config)
+    session_uuid = _lease(job_uuid, config_hash, run_uuid)
+    if session_uuid is not None:
+        logger.info(f"Run {run_uuid} is reusing session {session_uuid}.")
+        return session_uuid
+
+    session_uuid = str(uuid.uuid4())
+    db.session.add(
+        models.PooledSession(
+            uuid=session_uuid,
+            job_uuid=job_uuid,
+            config_hash=config_hash,
+            leased_by=run_uuid,
+        )
+    )
+    db.session.commit()
+
+    logger.info(f"Run {run_uuid} is launching pooled session {session_uuid}.")
+    try:
+        launch(session_uuid, SessionType.NONINTERACTIVE, session_config, should_abort)
+    except Exception:
+        discard(session_uuid)
+        raise
+
+    # The launch was interrupted, the session is not ready to be reused.
+    if should_abort is not None and should_abort():
+        discard(session_uuid)
+
+    return session_uuid
+
+
+@contextmanager
+def pooled_noninteractive_session(
+    job_uuid: str,
+    run_uuid: str,
+    session_config: NonInteractiveSessionConfig,
+    should_abort: Optional[Callable] = None,
+) -> None:
+    """Leases a session of the job for the duration of the context.
+
+    Exiting the context releases the session.
+
+    Args:
+        See args of "acquire".
+
+    Yields:
+        The UUID of the session.
+
+    """
+    session_uuid = acquire(job_uuid, run_uuid, session_config, should_abort)
+    try:
+        yield session_uuid
+    finally:
+        release(session_uuid)
+
+
+def release(session_uuid: str) -> bool:
+    """Makes a session available to the next run of its job.
+
+    Returns:
+        False if the session is not pooled.
+
+    """
+    updated = models.PooledSession.query.filter(
+        models.PooledSession.uuid == session_uuid
+    ).update(
+        {
+            "leased_by": None,
+            "last_used_time": datetime.datetime.now(datetime.timezone.utc),
+        }
+    )
+    db.session.commit()
+    return updated > 0
+
+
+def discard(session_uuid: str) -> None:
+    """Shuts down a pooled session, e.g. one in an unknown state."""
+    models.PooledSession.query.filter(
+        models.PooledSession.uuid == session_uuid
+    ).delete()
+    db.session.commit()
+    shutdown(session_uuid)
+
+
+def end_session(session_uuid: str) -> None:
+    """Ends the use of a session by a job run.
+
+    Pooled sessions are released, other sessions are shut down.
+    """
+    if not release(session_uuid):
+        shutdown(session_uuid)
+
+
+def reap_idle_sessions(ttl: int) -> List[str]:
+    """Shuts down the pooled sessions that are no longer needed.
+
+    These are the idle sessions that haven't been used for `ttl`
+    seconds or of which the job has ended or was deleted. Sessions
+    leased by runs that have ended, e.g. because the worker running
+    them died, are considered idle.
+
+    Returns:
+        The UUIDs of the sessions that were shut down.
+
+    """
+    ended_run = (
+        db.session.query(models.NonInteractivePipelineRun)
+        .filter(
+            models.NonInteractivePipelineRun.uuid == models.PooledSession.leased_by,
+            models.NonInteractivePipelineRun.status.not_in(["PENDING", "STARTED"]),
+        )
+        .exists()
+    )
+    active_job = (
+        db.session.query(models.Job)
+        .filter(
+            models.Job.uuid == models.PooledSession.job_uuid,
+            models.Job.status.in_(["PENDING", "STARTED", "PAUSED"]),
+        )
+        .exists()
+    )
+    expired = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(
+        seconds=ttl
+    )
+    sessions = (
+        models.PooledSession.query.with_for_update(skip_locked=True)
+        .filter(
+            or_(models.PooledSession.leased_by.is_(None), ended_run),
+            or_(models.PooledSession.last_used_time < expired, ~active_job),
+        )
+        .all()
+    )
+    session_uuids = [session.uuid for session in sessions]
+    for session in sessions:
+        db.session.delete(session)
+    db.session.commit()
+
+    for session_uuid in session_uuids:
+        logger.info(f"Shutting down idle pooled session {session_uuid}.")
+        try:
+            shutdown(session_uuid)
+        except Exception as e:
+            logger.error(f"Failed to shut down pooled session {session_uuid}: {e}")
+    return session_uuids
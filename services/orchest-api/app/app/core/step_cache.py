@@ -0,0 +1,230 @@
+"""Module to skip the steps of which the output is cached.
+
+When the `cache_step_outputs` setting of a pipeline is enabled, every
+step of an interactive run gets a fingerprint: a hash of the file of
+the step, its parameters, the parameters of the pipeline, the image of
+its environment, the environment variables and the fingerprints of its
+parents. A step only gets a fingerprint if all its parents are part of
+the run and have one, otherwise its inputs could be outputs of a
+previous run that are not described by the fingerprints.
+
+The SDK links the output of a step into the cache directory of the
+pipeline, i.e. `.orchest/pipelines/<pipeline_uuid>/cache/<step_uuid>`,
+under its fingerprint, which is passed to the step as
+`ORCHEST_STEP_FINGERPRINT`. Only the most recent output of a step is
+kept.
+
+A step is cached if a step with the same fingerprint has succeeded
+before and its output is in the cache. Its output is then restored to
+the data directory, its status is set to CACHED and it is not part of
+the workflow of the run. Steps that output to memory or that do not
+output anything are thus never cached.
+"""
+import hashlib
+import json
+import os
+import subprocess
+from typing import Dict, List, Optional
+
+from _orchest.internals import config as _config
+from _orchest.internals import utils as _utils
+from app import models, utils
+from app.connections import db
+from app.core.data_retention import get_data_dir
+from app.core.pipelines import Pipeline
+from app.types import RunConfig
+
+logger = utils.get_logger()
+
+
+def get_cache_dir(project_dir: str, pipeline_uuid: str) -> str:
+    """Gets the directory the SDK caches the outputs of steps in."""
+    return os.path.join(
+        project_dir, _config.STEP_CACHE_PATH.format(pipeline_uuid=pipeline_uuid)
+    )
+
+
+def is_enabled(pipeline: Pipeline, run_config: RunConfig) -> bool:
+    return run_config["session_type"] == "interactive" and bool(
+        pipeline.properties.get("settings", {}).get("cache_step_outputs", False)
+    )
+
+
+def _hash_file(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def get_fingerprints(
+    pipeline: Pipeline,
+    run_config: RunConfig,
+    incoming_connections: Dict[str, List[str]],
+) -> Dict[str, str]:
+    """Computes the fingerprints of the steps of a run.
+
+    Args:
+        pipeline: The pipeline that is run.
+        run_config: The configuration of the run.
+        incoming_connections: The parents of every step in the complete
+            pipeline, the steps of `pipeline` might be an induced
+            subgraph of it.
+
+    Returns:
+        The fingerprints of the steps that have one.
+    """
+    pipeline_dir = os.path.join(
+        run_config["project_dir"], os.path.dirname(run_config["pipeline_path"])
+    )
+    fingerprints: Dict[str, str] = {}
+    for step in pipeline.get_topological_order():
+        step_uuid = step.properties["uuid"]
+        parents = incoming_connections.get(step_uuid)
+        if parents is None or any(parent not in fingerprints for parent in parents):
+            continue
+
+        try:
+            file_hash = _hash_file(
+                os.path.join(pipeline_dir, step.properties["file_path"])
+            )
+        except OSError:
+            continue
+
+        description = {
+            "file": file_hash,
+            "parameters": step.properties.get("parameters", {}),
+            "pipeline_parameters": pipeline.get_params(),
+            "image": run_config["env_uuid_to_image"].get(
+                step.properties["environment"]
+            ),
+            "env_variables": run_config.get("user_env_variables", {}),
+            "parents": [fingerprints[parent] for parent in parents],
+        }
+        fingerprints[step_uuid] = hashlib.sha256(
+            json.dumps(description, sort_keys=True, default=str).encode()
+        ).hexdigest()
+    return fingerprints
+
+
+def _get_incoming_connections(run_config: RunConfig) -> Dict[str, List[str]]:
+    """Gets the parents of the steps from the pipeline file."""
+    path = os.path.join(run_config["project_dir"], run_config["pipeline_path"])
+    try:
+        with open(path, "r") as f:
+            steps = json.load(f)["steps"]
+        return {
+            step_uuid: step["incoming_connections"] for step_uuid, step in steps.items()
+        }
+    except (OSError, ValueError, KeyError) as e:
+        logger.warning(f"Failed to read {path}, not caching steps: {e}")
+        return {}
+
+
+def _restore_output(cache_dir: str, data_dir: str) -> bool:
+    """Restores a cached output by hardlinking its files.
+
+    Linking is safe since the SDK never writes to the files of an
+    output in place, it replaces them. Falls back to copying, e.g. if
+    the cache and the data directory are on different file systems.
+    """
+    if not os.path.isfile(os.path.join(cache_dir, "HEAD")):
+        return False
+
+    os.makedirs(os.path.dirname(data_dir), exist_ok=True)
+    if os.path.lexists(data_dir):
+        _utils.rmtree(data_dir)
+    exit_code = subprocess.call(
+        ["cp", "-rl", cache_dir, data_dir], stderr=subprocess.DEVNULL
+    )
+    if exit_code == 0:
+        return True
+
+    _utils.rmtree(data_dir, ignore_errors=True)
+    try:
+        _utils.copytree(cache_dir, data_dir)
+    except OSError as e:
+        logger.warning(f"Failed to restore {cache_dir}: {e}")
+        return False
+    return True
+
+
+def skip_cached_steps(
+    task_id: str, pipeline: Pipeline, run_config: RunConfig
+) -> Pipeline:
+    """Restores the output of the cached steps of a run.
+
+    Records the fingerprints of the steps of the run and passes them to
+    the steps through `run_config["step_fingerprints"]`. Commits.
+
+    Args:
+        task_id: UUID of the pipeline run.
+        pipeline: The pipeline that is run.
+        run_config: The configuration of the run, which is updated in
+            place.
+
+    Returns:
+        The pipeline formed by the steps that are not cached.
+    """
+    if not is_enabled(pipeline, run_config):
+        return pipeline
+
+    fingerprints = get_fingerprints(
+        pipeline, run_config, _get_incoming_connections(run_config)
+    )
+    if not fingerprints:
+        return pipeline
+
+    db.session.bulk_update_mappings(
+        models.PipelineRunStep,
+        [
+            {"run_uuid": task_id, "step_uuid": step_uuid, "fingerprint": fingerprint}
+            for step_uuid, fingerprint in fingerprints.items()
+        ],
+    )
+
+    succeeded = {
+        row.fingerprint
+        for row in db.session.query(models.PipelineRunStep.fingerprint)
+        .filter(
+            models.PipelineRunStep.fingerprint.in_(list(fingerprints.values())),
+            models.PipelineRunStep.status.in_(["SUCCESS", "CACHED"]),
+        )
+        .distinct()
+    }
+
+    cache_dir = get_cache_dir(run_config["project_dir"], run_config["pipeline_uuid"])
+    data_dir = get_data_dir(run_config["project_dir"], run_config["pipeline_uuid"])
+    cached = [
+        step_uuid
+        for step_uuid, fingerprint in fingerprints.items()
+        if fingerprint in succeeded
+        and _restore_output(
+            os.path.join(cache_dir, step_uuid, fingerprint),
+            os.path.join(data_dir, step_uuid),
+        )
+    ]
+    if cached:
+        logger.info(f"Skipping {len(cached)} cached steps of run {task_id}.")
+        utils.update_steps_status(task_id, cached, "CACHED")
+    db.session.commit()
+
+    run_config["step_fingerprints"] = {
+        step_uuid: fingerprint
+        for step_uuid, fingerprint in fingerprints.items()
+        if step_uuid not in cached
+    }
+    if not cached:
+        return pipeline
+
+    cached = set(cached)
+    return pipeline.get_induced_subgraph(
+        step.properties["uuid"]
+        for step in pipeline.steps
+        if step.properties["uuid"] not in cached
+    )
+
+
+def get_step_fingerprint(run_config: RunConfig, step_uuid: str) -> Optional[str]:
+    return run_config.get("step_fingerprints", {}).get(step_uuid)
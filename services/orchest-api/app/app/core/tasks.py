@@ -12,18 +12,30 @@ from celery.utils.log import get_task_logger
 from kubernetes import client
 
 from _orchest.internals import config as _config
-from _orchest.internals.utils import copytree
+from _orchest.internals.utils import materialize_run_dir, replace_file
 from app import create_app
 from app import errors as self_errors
 from app import models, utils
 from app.connections import db, k8s_core_api, k8s_custom_obj_api
-from app.core import environments, notifications, pod_scheduling, registry, scheduler
+from app.core import (
+    data_retention,
+    environments,
+    notifications,
+    pod_scheduling,
+    registry,
+    scheduler,
+    session_pool,
+)
 from app.core.environment_image_builds import build_environment_image_task
 from app.core.jupyter_image_builds import build_jupyter_image_task
-from app.core.pipeline_runs import run_pipeline_workflow
-from app.core.pipelines import Pipeline
-from app.core.sessions import launch_noninteractive_session
-from app.types import PipelineDefinition, RunConfig
+from app.core.pipeline_runs import (
+    fail_pending_pipeline_run,
+    run_pipeline_workflow,
+    start_pipeline_workflow,
+)
+from app.core.pipelines import Pipeline, construct_job_run_pipeline
+from app.core.sessions import launch, launch_noninteractive_session
+from app.types import PipelineDefinition, RunConfig, SessionType
 from config import CONFIG_CLASS
 
 logger = get_task_logger(__name__)
@@ -50,6 +62,65 @@ def dispose_of_existing_db_pool(**kwargs):
         print("Disposed of existing db connection pool.")
 
 
+# Number of seconds after which the start of a supervised run is first
+# retried when the maximum number of parallel runs has been reached.
+_RUN_SLOT_RETRY_INTERVAL = 2
+
+
+def _has_free_run_slot(session_type: str) -> bool:
+    """Tells if another supervised run of the given type can start.
+
+    Supervised runs don't occupy a celery worker until they end, thus
+    the parallelism settings are enforced by counting the started runs
+    instead. Concurrent workers could still exceed the limit by at most
+    their concurrency.
+    """
+    if session_type == "interactive":
+        model = models.InteractivePipelineRun
+        max_parallelism = os.environ.get("MAX_INTERACTIVE_RUNS_PARALLELISM")
+    else:
+        model = models.NonInteractivePipelineRun
+        max_parallelism = os.environ.get("MAX_JOB_RUNS_PARALLELISM")
+
+    if max_parallelism is None:
+        return True
+
+    with application.app_context():
+        started_runs = model.query.filter(model.status == "STARTED").count()
+    return started_runs < int(max_parallelism)
+
+
+def _wait_for_run_slot(task, task_id: str, session_type: str) -> bool:
+    """Waits, by retrying the task, until a supervised run can start.
+
+    The task is retried with an exponential backoff. The run fails if
+    no run slot frees up within `RUN_SLOT_MAX_RETRIES` retries.
+
+    Returns:
+        True if the run can start, False if it was aborted or failed
+        while waiting.
+    """
+    if AbortableAsyncResult(task_id).is_aborted():
+        return False
+    if _has_free_run_slot(session_type):
+        return True
+
+    retries = task.request.retries
+    if retries >= CONFIG_CLASS.RUN_SLOT_MAX_RETRIES:
+        logger.error(f"Run {task_id} failed, no run slot freed up in time.")
+        with application.app_context():
+            fail_pending_pipeline_run({"session_type": session_type}, task_id)
+        return False
+
+    raise task.retry(
+        countdown=min(
+            _RUN_SLOT_RETRY_INTERVAL * 2**retries,
+            CONFIG_CLASS.RUN_SLOT_MAX_RETRY_INTERVAL,
+        ),
+        max_retries=None,
+    )
+
+
 @celery.task(bind=True, base=AbortableTask)
 def run_pipeline(
     self,
@@ -89,6 +160,17 @@ def run_pipeline(
     # session = run_pipeline.session
     task_id = task_id if task_id is not None else self.request.id
 
+    if CONFIG_CLASS.RUN_SUPERVISOR_ENABLED:
+        if not _wait_for_run_slot(self, task_id, run_config["session_type"]):
+            return "SUCCESS"
+
+        # The run supervisor ends the run and deletes its workflow.
+        with application.app_context():
+            start_pipeline_workflow(
+                session_uuid, task_id, pipeline, run_config=run_config
+            )
+        return "SUCCESS"
+
     try:
         with application.app_context():
             run_pipeline_workflow(
@@ -99,14 +181,26 @@ def run_pipeline(
         raise
     finally:
         # We get here either because the task was successful or was
-        # aborted, in any case, delete the workflow.
-        k8s_custom_obj_api.delete_namespaced_custom_object(
-            "argoproj.io",
-            "v1alpha1",
-            _config.ORCHEST_NAMESPACE,
-            "workflows",
-            f"pipeline-run-task-{task_id}",
-        )
+        # aborted, in any case, delete the workflow. There is none if
+        # all steps were cached.
+        try:
+            k8s_custom_obj_api.delete_namespaced_custom_object(
+                "argoproj.io",
+                "v1alpha1",
+                _config.ORCHEST_NAMESPACE,
+                "workflows",
+                f"pipeline-run-task-{task_id}",
+            )
+        except client.rest.ApiException as e:
+            if e.status != 404:
+                raise
+
+    # Clean up the data that the steps passed to each other, now that
+    # none of them is running anymore.
+    try:
+        data_retention.apply_run_retention(pipeline, run_config)
+    except Exception as e:
+        logger.error(f"Failed to apply data retention: {e}")
 
     # The celery task has completed successfully. This is not related to
     # the success or failure of the pipeline itself.
@@ -118,8 +212,9 @@ def start_non_interactive_pipeline_run(
     self,
     job_uuid,
     project_uuid,
-    pipeline_definition: PipelineDefinition,
+    pipeline_definition: Optional[PipelineDefinition],
     run_config: Dict[str, Union[str, Dict[str, str]]],
+    run_parameters: Optional[Dict[str, Any]] = None,
 ) -> str:
     """Starts a non-interactive pipeline run.
 
@@ -128,7 +223,9 @@ def start_non_interactive_pipeline_run(
     Args:
         job_uuid: UUID of the job.
         project_uuid: UUID of the project.
-        pipeline_definition: A json description of the pipeline.
+        pipeline_definition: A json description of the pipeline. If
+            `None`, then it is constructed from the definition of the
+            job given the `run_parameters`.
         run_config: Configuration of the run for the compute backend.
             Example: {
                 'userdir_pvc': 'userdir-pvc',
@@ -139,10 +236,31 @@ def start_non_interactive_pipeline_run(
                 }
             }
 
+        run_parameters: The parameters of the run, see
+            `pipelines.construct_job_run_pipeline`.
+
     Returns:
         Status of the pipeline run. "FAILURE" or "SUCCESS".
 
     """
+    if CONFIG_CLASS.RUN_SUPERVISOR_ENABLED and not _wait_for_run_slot(
+        self, self.request.id, "noninteractive"
+    ):
+        return "SUCCESS"
+
+    if pipeline_definition is None:
+        with application.app_context():
+            job = (
+                models.Job.query.with_entities(
+                    models.Job.pipeline_definition, models.Job.pipeline_run_spec
+                )
+                .filter_by(uuid=job_uuid)
+                .one()
+            )
+        pipeline_definition = construct_job_run_pipeline(
+            job.pipeline_definition, job.pipeline_run_spec, run_parameters or {}
+        ).to_dict()
+
     pipeline_uuid = pipeline_definition["uuid"]
 
     snapshot_dir = utils.get_job_snapshot_path(project_uuid, pipeline_uuid, job_uuid)
@@ -150,10 +268,10 @@ def start_non_interactive_pipeline_run(
         project_uuid, pipeline_uuid, job_uuid, self.request.id
     )
 
-    # Copy the contents of `snapshot_dir` to the new (not yet existing
-    # folder) `run_dir`. No need to use_gitignore since the snapshot
-    # was copied with use_gitignore=True.
-    copytree(snapshot_dir, run_dir, use_gitignore=False)
+    # Materialize the contents of `snapshot_dir` in the new (not yet
+    # existing folder) `run_dir`. No need to use_gitignore since the
+    # snapshot was copied with use_gitignore=True.
+    materialize_run_dir(snapshot_dir, run_dir, CONFIG_CLASS.JOB_RUN_DIR_STRATEGY)
 
     # Update the `run_config` for the interactive pipeline run. The
     # pipeline run should execute on the `run_dir` as its
@@ -173,10 +291,12 @@ def start_non_interactive_pipeline_run(
 
     # Overwrite the `pipeline.json`, that was copied from the snapshot,
     # with the new `pipeline.json` that contains the new parameters for
-    # every step.
+    # every step. The file is replaced since it might be shared with
+    # the snapshot.
     pipeline_json = os.path.join(run_dir, run_config["pipeline_path"])
-    with open(pipeline_json, "w") as f:
-        json.dump(pipeline_definition, f, indent=4, sort_keys=True)
+    replace_file(
+        pipeline_json, json.dumps(pipeline_definition, indent=4, sort_keys=True)
+    )
 
     # Note that run_config contains user_env_variables, which is of
     # interest for the session_config.
@@ -186,19 +306,79 @@ def start_non_interactive_pipeline_run(
     session_config["services"] = pipeline_definition.get("services", {})
     session_config["env_uuid_to_image"] = run_config["env_uuid_to_image"]
 
+    def should_abort() -> bool:
+        return AbortableAsyncResult(self.request.id).is_aborted()
+
     with application.app_context():
-        with launch_noninteractive_session(
-            session_uuid,
-            session_config,
-            lambda: AbortableAsyncResult(session_uuid).is_aborted(),
-        ):
+        reuse_session = session_pool.is_enabled(pipeline_definition, session_config)
+
+        if CONFIG_CLASS.RUN_SUPERVISOR_ENABLED:
+            # The run supervisor ends the run, applies the data
+            # retention policies and ends the session.
+            run_session_uuid = None
+            try:
+                if reuse_session:
+                    # Discards the session itself if it fails.
+                    session_uuid = session_pool.acquire(
+                        job_uuid, self.request.id, session_config, should_abort
+                    )
+                    run_config["session_uuid"] = session_uuid
+                    run_session_uuid = session_uuid
+                else:
+                    # Set before launching, a failed launch still has
+                    # to be shut down to clean up its resources.
+                    run_session_uuid = session_uuid
+                    launch(
+                        session_uuid,
+                        SessionType.NONINTERACTIVE,
+                        session_config,
+                        should_abort,
+                    )
+                utils.ensure_logs_directory(run_dir, pipeline_uuid)
+                start_pipeline_workflow(
+                    session_uuid,
+                    self.request.id,
+                    Pipeline.from_json(pipeline_definition),
+                    run_config=run_config,
+                    job_uuid=job_uuid,
+                )
+            except Exception:
+                # Otherwise the run would keep taking a run slot.
+                db.session.rollback()
+                fail_pending_pipeline_run(
+                    {"session_type": "noninteractive"}, self.request.id
+                )
+                if run_session_uuid is not None:
+                    session_pool.end_session(run_session_uuid)
+                raise
+            return "SUCCESS"
+
+        if reuse_session:
+            session = session_pool.pooled_noninteractive_session(
+                job_uuid, self.request.id, session_config, should_abort
+            )
+        else:
+            session = launch_noninteractive_session(
+                session_uuid, session_config, should_abort
+            )
+
+        with session as pooled_session_uuid:
+            if pooled_session_uuid is not None:
+                run_config["session_uuid"] = pooled_session_uuid
             status = run_pipeline(
                 pipeline_definition,
                 run_config,
-                session_uuid,
+                run_config["session_uuid"],
                 task_id=self.request.id,
             )
 
+        try:
+            data_retention.apply_job_retention(
+                Pipeline.from_json(pipeline_definition), project_uuid, job_uuid
+            )
+        except Exception as e:
+            logger.error(f"Failed to apply data retention of job {job_uuid}: {e}")
+
     return status
 
 
@@ -395,6 +575,19 @@ def process_notifications_deliveries(self):
     return "SUCCESS"
 
 
+@celery.task(bind=True, base=AbortableTask)
+def reap_idle_job_sessions(self):
+    with application.app_context():
+        try:
+            session_pool.reap_idle_sessions(CONFIG_CLASS.JOB_SESSION_IDLE_TTL)
+            scheduler.notify_scheduled_job_succeeded(self.request.id)
+        except Exception as e:
+            logger.error(e)
+            scheduler.notify_scheduled_job_failed(self.request.id)
+            raise e
+    return "SUCCESS"
+
+
 @celery.task(bind=True, base=AbortableTask)
 def git_import(
     self,
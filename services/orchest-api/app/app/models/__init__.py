@@ -21,6 +21,7 @@ from app.models._core import (
     PipelineRun,
     PipelineRunInUseImage,
     PipelineRunStep,
+    PooledSession,
     Project,
     SchedulerJob,
     Setting,
@@ -53,5 +54,6 @@ from app.models._events import (
     ProjectUpdateEvent,
     Subscriber,
     Subscription,
+    SubscriptionIndexVersion,
     Webhook,
 )
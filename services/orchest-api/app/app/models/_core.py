@@ -702,6 +702,13 @@ class Job(BaseModel):
         db.Integer, nullable=False, server_default=text("-1")
     )
 
+    # What to do with the runs of the (cron) job that were missed, see
+    # `app.types.CatchUpPolicy`. Coalescing is what the scheduler did
+    # before the policy existed, thus existing jobs default to it.
+    catch_up_policy = db.Column(
+        db.String(15), nullable=False, server_default=text("'coalesce'")
+    )
+
     images_in_use = db.relationship(
         "JobInUseImage",
         lazy="select",
@@ -802,6 +809,8 @@ class PipelineRunStep(BaseModel):
     status = db.Column(db.String(15), unique=False, nullable=True)
     started_time = db.Column(db.DateTime, unique=False, nullable=True)
     finished_time = db.Column(db.DateTime, unique=False, nullable=True)
+    # Hash of the inputs of the step, see `app.core.step_cache`.
+    fingerprint = db.Column(db.String(64), unique=False, nullable=True, index=True)
 
     def __repr__(self):
         return f"<{self.__class__.__name__}: {self.run_uuid}.{self.step_uuid}>"
@@ -1211,6 +1220,43 @@ class Snapshot(BaseModel):
     )
 
 
+class PooledSession(BaseModel):
+    """A non-interactive session that is reused by the runs of a job.
+
+    See `app.core.session_pool`.
+    """
+
+    __tablename__ = "pooled_sessions"
+    __table_args__ = (
+        Index(
+            "ix_pooled_sessions_job_uuid_config_hash",
+            "job_uuid",
+            "config_hash",
+        ),
+    )
+
+    # Not the uuid of any run, the session outlives the runs using it.
+    uuid = db.Column(db.String(36), primary_key=True)
+
+    # Not a foreign key, the session must be shut down before its record
+    # is deleted, which the reaper takes care of.
+    job_uuid = db.Column(db.String(36), nullable=False)
+
+    # Hash of the configuration of the services of the session, only
+    # runs with the same configuration can reuse the session.
+    config_hash = db.Column(db.String(64), nullable=False)
+
+    # UUID of the pipeline run that is using the session, null when the
+    # session is idle.
+    leased_by = db.Column(db.String(36), nullable=True)
+
+    last_used_time = db.Column(
+        TIMESTAMP(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+    )
+
+
 class ClusterNode(BaseModel):
     """To track where some operations took place or where images are.
 
@@ -1351,6 +1351,14 @@ class Webhook(Subscriber):
 
     content_type = db.Column(db.String(50), nullable=True)
 
+    # Max number of events delivered at once, as a JSON array, if
+    # greater than 1. See `app.core.notifications.webhooks`. Not null,
+    # other subscribers in the table get the default.
+    batch_size = db.Column(db.Integer, nullable=False, server_default="1")
+
+    def is_batched(self) -> bool:
+        return self.batch_size > 1
+
     def is_slack_webhook(self) -> bool:
         return self.url.startswith("https://hooks.slack.com/")
 
@@ -1494,6 +1502,23 @@ Index(
 ),
 
 
+class SubscriptionIndexVersion(_core_models.BaseModel):
+    """Version of the subscription index, see
+    `app.core.notifications.subscription_index`.
+
+    Single row table. Triggers on the subscribers, subscriptions and
+    settings tables set the version to the id of the transaction that
+    changed them, so that a version is never reused, not even by a
+    transaction that is rolled back.
+    """
+
+    __tablename__ = "subscription_index_version"
+
+    id = db.Column(db.Integer, primary_key=True)
+
+    version = db.Column(db.BigInteger, nullable=False)
+
+
 class Delivery(_core_models.BaseModel):
     """Essentially, a transactional outbox for notifications.
 
@@ -13,6 +13,7 @@ from flask_restx import Model, Namespace, fields
 
 from app import errors as self_errors
 from app import models, utils
+from app.types import CatchUpPolicy
 
 dictionary = Model("Dictionary", {})
 
@@ -339,7 +340,7 @@ pipeline_run_pipeline_step = Model(
         "status": fields.String(
             required=True,
             description="Status of the step",
-            enum=_task_statuses,
+            enum=_task_statuses + ["CACHED"],
         ),
         "started_time": fields.String(
             required=True, description="Time at which the step started executing"
@@ -347,6 +348,10 @@ pipeline_run_pipeline_step = Model(
         "finished_time": fields.String(
             required=True, description="Time at which the step finished executing"
         ),
+        "fingerprint": fields.String(
+            required=False,
+            description="Hash of the inputs of the step, if its output is cached",
+        ),
     },
 )
 
@@ -460,6 +465,14 @@ job_parameters_update = Model(
                 "are in an end state that are over this number will be deleted."
             ),
         ),
+        "catch_up_policy": fields.String(
+            required=False,
+            description=(
+                "What to do with the runs of a cron job that were missed: run them "
+                "all, coalesce them into one run or skip them."
+            ),
+            enum=[policy.value for policy in CatchUpPolicy],
+        ),
     },
 )
 
@@ -585,6 +598,15 @@ job_spec = Model(
                 "are in an end state that are over this number will be deleted."
             ),
         ),
+        "catch_up_policy": fields.String(
+            required=False,
+            description=(
+                "What to do with the runs of a cron job that were missed: run them "
+                "all, coalesce them into one run or skip them. Defaults to "
+                "coalesce."
+            ),
+            enum=[policy.value for policy in CatchUpPolicy],
+        ),
         "snapshot_uuid": fields.String(
             required=True, description="UUID of the snapshot"
         ),
@@ -652,6 +674,14 @@ job = Model(
                 "are in an end state that are over this number will be deleted."
             ),
         ),
+        "catch_up_policy": fields.String(
+            required=True,
+            description=(
+                "What to do with the runs of a cron job that were missed: run them "
+                "all, coalesce them into one run or skip them."
+            ),
+            enum=[policy.value for policy in CatchUpPolicy],
+        ),
         "pipeline_run_status_counts": fields.Raw(
             required=False, description="Aggregate of the job pipeline run statuses."
         ),
@@ -953,6 +983,15 @@ webhook_spec = subscriber_spec.inherit(
                 models.Webhook.ContentType.URLENCODED.value,
             ],
         ),
+        "batch_size": fields.Integer(
+            required=False,
+            default=1,
+            description=(
+                "Max number of events delivered at once, as a JSON array of the "
+                "payloads, deliveries are batched if greater than 1. Only json "
+                "webhooks can be batched."
+            ),
+        ),
     },
 )
 
@@ -975,6 +1014,14 @@ webhook_mutation = Model(
                 models.Webhook.ContentType.URLENCODED.value,
             ],
         ),
+        "batch_size": fields.Integer(
+            required=False,
+            description=(
+                "Max number of events delivered at once, as a JSON array of the "
+                "payloads, deliveries are batched if greater than 1. Only json "
+                "webhooks can be batched."
+            ),
+        ),
         "subscriptions": fields.List(
             fields.Nested(subscription_spec),
             required=False,
@@ -1038,6 +1085,14 @@ webhook = subscriber.inherit(
                 models.Webhook.ContentType.URLENCODED.value,
             ],
         ),
+        "batch_size": fields.Integer(
+            required=True,
+            description=(
+                "Max number of events delivered at once, as a JSON array of the "
+                "payloads, deliveries are batched if greater than 1. Only json "
+                "webhooks can be batched."
+            ),
+        ),
     },
 )
 
@@ -30,6 +30,10 @@ class PipelineSettings(TypedDict):
     auto_eviction: bool
     data_passing_memory_size: str  # 1GB and similar.
     max_steps_parallelism: int
+    data_retention_keep_last_n: Optional[int]
+    data_retention_max_bytes: Optional[int]
+    reuse_job_sessions: Optional[bool]
+    cache_step_outputs: Optional[bool]
 
 
 class ServiceDefinition(TypedDict):
@@ -71,6 +75,8 @@ class RunConfig(TypedDict):
     session_type: str  # interactive, noninteractive
     session_uuid: str
     user_env_variables: Dict[str, str]
+    # Step UUID -> fingerprint, see `app.core.step_cache`.
+    step_fingerprints: Optional[Dict[str, str]]
 
 
 class SessionType(Enum):
@@ -78,6 +84,22 @@ class SessionType(Enum):
     NONINTERACTIVE = "noninteractive"
 
 
+class CatchUpPolicy(str, Enum):
+    """What to do with the runs of a cron job that were missed.
+
+    Runs are missed when they were due for longer than
+    `JOB_MISFIRE_GRACE_TIME`, e.g. because Orchest was not running.
+    """
+
+    # Run all missed runs at once, up to `JOB_CATCH_UP_MAX_EXECUTIONS`.
+    ALL = "all"
+    # Run the missed runs as one run. The default, it's what the
+    # scheduler did before the policy existed.
+    COALESCE = "coalesce"
+    # Don't run the missed runs.
+    SKIP = "skip"
+
+
 class SessionConfig(TypedDict):
     env_uuid_to_image: Dict[str, str]
     userdir_pvc: str
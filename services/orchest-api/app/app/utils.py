@@ -6,6 +6,7 @@ import uuid
 from collections import ChainMap
 from copy import deepcopy
 from datetime import datetime
+from functools import lru_cache
 from typing import Any, Container, Dict, Iterable, List, Optional, Set, Tuple, Union
 from urllib.parse import urlparse
 
@@ -313,7 +314,19 @@ def get_jupyter_server_image_to_use() -> str:
         return f"docker.io/orchest/jupyter-server:{CONFIG_CLASS.ORCHEST_VERSION}"
 
 
+# The ClusterIP of the registry only changes when its service is
+# recreated, it's cached to not query the k8s API for every image name.
+_REGISTRY_IP_TTL = 60
+
+
 def get_registry_ip() -> str:
+    return _get_registry_ip_cached_with_ttl(
+        ttl_period=int(time.time() // _REGISTRY_IP_TTL)
+    )
+
+
+@lru_cache(maxsize=1)
+def _get_registry_ip_cached_with_ttl(ttl_period: int) -> str:
     return k8s_core_api.read_namespaced_service(
         _config.REGISTRY, _config.ORCHEST_NAMESPACE
     ).spec.cluster_ip
@@ -856,6 +869,25 @@ def extract_domain_name(url: str) -> str:
     return f"{parsed_url.scheme}://{parsed_url.netloc}"
 
 
+def bulk_insert(
+    model: type, rows: List[Dict[str, Any]], chunk_size: int = 1000
+) -> None:
+    """Inserts the rows through multi-row INSERTs, doesn't commit.
+
+    Contrary to adding objects to the session, this doesn't create and
+    track an object for every row, which matters when inserting
+    thousands of rows. Column defaults are applied, but polymorphic
+    identities are not, i.e. they need to be part of the rows.
+
+    Args:
+        model: Model of the rows.
+        rows: The values of the rows, every row must have the same keys.
+        chunk_size: Maximum number of rows inserted by a statement.
+    """
+    for i in range(0, len(rows), chunk_size):
+        db.session.execute(insert(model).values(rows[i : i + chunk_size]))
+
+
 def upsert_cluster_node(name: str) -> None:
     stmt = insert(models.ClusterNode).values(
         [
@@ -32,6 +32,26 @@ class Config:
     # Whether Orchest is running on single-node. This in turn determines
     # how pipeline runs are executed; in 1 pod or 1 pod per step.
     SINGLE_NODE = os.environ.get("SINGLE_NODE") == "TRUE"
+
+    # Whether pipeline runs are tracked and ended by the run supervisor,
+    # see `app.core.run_supervisor`, instead of by the celery task that
+    # started the run.
+    RUN_SUPERVISOR_ENABLED = os.environ.get("ORCHEST_RUN_SUPERVISOR") == "TRUE"
+    # How often the run supervisor checks whether runs were aborted.
+    RUN_SUPERVISOR_END_STATE_CHECK_INTERVAL = 2
+    # While the maximum number of parallel runs is reached, starting a
+    # supervised run is retried with an exponential backoff up to this
+    # many seconds. The run fails after this many retries, i.e. when it
+    # has waited for about a day.
+    RUN_SLOT_MAX_RETRY_INTERVAL = 30
+    RUN_SLOT_MAX_RETRIES = 24 * 60 * 2
+    # How the directory of a job run is created from the job snapshot,
+    # see `_orchest.internals.utils.materialize_run_dir`.
+    JOB_RUN_DIR_STRATEGY = os.environ.get("ORCHEST_JOB_RUN_DIR_STRATEGY", "reflink")
+    # Seconds after which an idle session of a job, which is kept to be
+    # reused by the runs of the job, is shut down, see
+    # `app.core.session_pool`.
+    JOB_SESSION_IDLE_TTL = 15 * 60
     ORCHEST_VERSION = os.environ["ORCHEST_VERSION"]
     # must be uppercase
     SQLALCHEMY_DATABASE_URI = "postgresql://postgres@orchest-database/orchest_api"
@@ -52,7 +72,29 @@ class Config:
     CLEANUP_OLD_SCHEDULER_JOB_RECORDS_INTERVAL = 5 * 60
     IMAGES_DELETION_INTERVAL = 2 * 60
     NOTIFICATIONS_DELIVERIES_INTERVAL = 1
-    SCHEDULER_INTERVAL = 10
+    REAP_IDLE_JOB_SESSIONS_INTERVAL = 60
+
+    # How often the job scheduler tries to become the leader, and
+    # reloads all scheduled jobs, see `app.core.job_scheduler`.
+    JOB_SCHEDULER_LEADER_RETRY_INTERVAL = 10
+    JOB_SCHEDULER_RESYNC_INTERVAL = 5 * 60
+    # Seconds after which a due run of a cron job is considered missed,
+    # see `app.types.CatchUpPolicy`.
+    JOB_MISFIRE_GRACE_TIME = 60
+    # Max number of missed runs of a cron job that are caught up on at
+    # once with the "all" catch up policy, older ones are skipped.
+    JOB_CATCH_UP_MAX_EXECUTIONS = 1000
+
+    # Webhook deliveries are claimed in batches and sent concurrently,
+    # see `app.core.notifications.webhooks.deliver_batch`.
+    WEBHOOK_DELIVERIES_BATCH_SIZE = 200
+    WEBHOOK_DELIVERIES_CONCURRENCY = 32
+    WEBHOOK_DELIVERIES_MAX_CONCURRENCY_PER_DELIVEREE = 4
+    WEBHOOK_DELIVERY_TIMEOUT = 5
+    # How long the deliveries of a batched webhook are accumulated for,
+    # and its max batch_size.
+    WEBHOOK_DELIVERIES_BATCH_WINDOW = 10
+    WEBHOOK_MAX_BATCH_SIZE = 1000
 
     GPU_ENABLED_INSTANCE = _config.GPU_ENABLED_INSTANCE
 
@@ -108,6 +150,7 @@ class Config:
         "app.core.tasks.registry_garbage_collection": {"queue": "builds"},
         "app.core.tasks.process_notifications_deliveries": {"queue": "deliveries"},
         "app.core.tasks.git_import": {"queue": "other-tasks"},
+        "app.core.tasks.reap_idle_job_sessions": {"queue": "other-tasks"},
     }
 
 
@@ -0,0 +1,53 @@
+"""Add subscription_index_version and the triggers that bump it
+
+Revision ID: 165ee1858c7b
+Revises: 597b07cffd07
+Create Date: 2026-10-17 08:37:19.326299
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "165ee1858c7b"
+down_revision = "597b07cffd07"
+branch_labels = None
+depends_on = None
+
+_TABLES = ["subscribers", "subscriptions", "settings"]
+
+
+def upgrade():
+    op.create_table(
+        "subscription_index_version",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("version", sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk_subscription_index_version")),
+    )
+    op.execute("INSERT INTO subscription_index_version (id, version) VALUES (1, 0);")
+    op.execute(
+        """
+        CREATE FUNCTION bump_subscription_index_version() RETURNS trigger AS $$
+        BEGIN
+            UPDATE subscription_index_version SET version = txid_current()
+            WHERE version <> txid_current();
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    for table in _TABLES:
+        op.execute(
+            f"""
+            CREATE TRIGGER {table}_bump_subscription_index_version
+            AFTER INSERT OR UPDATE OR DELETE ON {table}
+            FOR EACH ROW EXECUTE PROCEDURE bump_subscription_index_version();
+            """
+        )
+
+
+def downgrade():
+    for table in _TABLES:
+        op.execute(f"DROP TRIGGER {table}_bump_subscription_index_version ON {table};")
+    op.execute("DROP FUNCTION bump_subscription_index_version();")
+    op.drop_table("subscription_index_version")
@@ -0,0 +1,31 @@
+"""Add Job.catch_up_policy
+
+Revision ID: 597b07cffd07
+Revises: c43226cdfbeb
+Create Date: 2026-10-17 08:31:47.043146
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "597b07cffd07"
+down_revision = "c43226cdfbeb"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        "jobs",
+        sa.Column(
+            "catch_up_policy",
+            sa.String(length=15),
+            server_default=sa.text("'coalesce'"),
+            nullable=False,
+        ),
+    )
+
+
+def downgrade():
+    op.drop_column("jobs", "catch_up_policy")
@@ -0,0 +1,26 @@
+"""Add Webhook.batch_size
+
+Revision ID: a0f3138fdfa1
+Revises: 165ee1858c7b
+Create Date: 2026-10-17 08:39:34.914337
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "a0f3138fdfa1"
+down_revision = "165ee1858c7b"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        "subscribers",
+        sa.Column("batch_size", sa.Integer(), server_default="1", nullable=False),
+    )
+
+
+def downgrade():
+    op.drop_column("subscribers", "batch_size")
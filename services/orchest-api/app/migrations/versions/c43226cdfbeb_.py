@@ -0,0 +1,45 @@
+"""Notify the job scheduler of changes to the schedule of jobs
+
+Revision ID: c43226cdfbeb
+Revises: f12f40b5c5fe
+Create Date: 2026-10-17 09:02:11.514218
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "c43226cdfbeb"
+down_revision = "f12f40b5c5fe"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # The channel is app.core.job_scheduler.JOB_SCHEDULE_CHANNEL.
+    op.execute(
+        """
+        CREATE FUNCTION notify_job_schedule_changed() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                PERFORM pg_notify('job_schedule_changed', OLD.uuid);
+            ELSE
+                PERFORM pg_notify('job_schedule_changed', NEW.uuid);
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER jobs_schedule_changed
+        AFTER INSERT OR DELETE OR UPDATE OF status, schedule, next_scheduled_time
+        ON jobs
+        FOR EACH ROW EXECUTE PROCEDURE notify_job_schedule_changed();
+        """
+    )
+
+
+def downgrade():
+    op.execute("DROP TRIGGER jobs_schedule_changed ON jobs;")
+    op.execute("DROP FUNCTION notify_job_schedule_changed();")
@@ -0,0 +1,35 @@
+"""empty message
+
+Revision ID: f12f40b5c5fe
+Revises: fb14c5ea3090
+Create Date: 2026-10-17 08:25:46.325846
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "f12f40b5c5fe"
+down_revision = "fb14c5ea3090"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        "pipeline_run_steps",
+        sa.Column("fingerprint", sa.String(length=64), nullable=True),
+    )
+    op.create_index(
+        op.f("ix_pipeline_run_steps_fingerprint"),
+        "pipeline_run_steps",
+        ["fingerprint"],
+        unique=False,
+    )
+
+
+def downgrade():
+    op.drop_index(
+        op.f("ix_pipeline_run_steps_fingerprint"), table_name="pipeline_run_steps"
+    )
+    op.drop_column("pipeline_run_steps", "fingerprint")
@@ -0,0 +1,46 @@
+"""empty message
+
+Revision ID: fb14c5ea3090
+Revises: 4d5dab2f4bda
+Create Date: 2026-10-17 08:18:47.220913
+
+"""
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "fb14c5ea3090"
+down_revision = "4d5dab2f4bda"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "pooled_sessions",
+        sa.Column("uuid", sa.String(length=36), nullable=False),
+        sa.Column("job_uuid", sa.String(length=36), nullable=False),
+        sa.Column("config_hash", sa.String(length=64), nullable=False),
+        sa.Column("leased_by", sa.String(length=36), nullable=True),
+        sa.Column(
+            "last_used_time",
+            postgresql.TIMESTAMP(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("uuid", name=op.f("pk_pooled_sessions")),
+    )
+    op.create_index(
+        "ix_pooled_sessions_job_uuid_config_hash",
+        "pooled_sessions",
+        ["job_uuid", "config_hash"],
+        unique=False,
+    )
+
+
+def downgrade():
+    op.drop_index(
+        "ix_pooled_sessions_job_uuid_config_hash", table_name="pooled_sessions"
+    )
+    op.drop_table("pooled_sessions")
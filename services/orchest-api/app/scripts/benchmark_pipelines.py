@@ -0,0 +1,104 @@
+"""Benchmarks the operations on large pipelines.
+
+Generates random pipelines with thousands of steps and times the
+operations that are done when starting and tracking a pipeline run, e.g.
+constructing the pipeline for a partial run and looking up every step.
+
+Run from the app directory:
+
+    python -m scripts.benchmark_pipelines --steps 1000 2000 5000
+
+"""
+import argparse
+import random
+import time
+from typing import Any, Callable, Dict, List
+
+from app.core.pipelines import Pipeline, construct_pipeline
+
+
+def _generate_pipeline_definition(
+    n_steps: int, max_parents: int, seed: int
+) -> Dict[str, Any]:
+    """Generates a random DAG, steps only connect to earlier steps."""
+    rng = random.Random(seed)
+    uuids = [f"step-{i}" for i in range(n_steps)]
+    steps = {}
+    for i, uuid in enumerate(uuids):
+        n_parents = rng.randint(0, min(i, max_parents))
+        steps[uuid] = {
+            "uuid": uuid,
+            "title": uuid,
+            "file_path": f"{uuid}.py",
+            "environment": "environment-uuid",
+            "incoming_connections": rng.sample(uuids[:i], n_parents),
+            "parameters": {"a": list(range(10)), "b": {"c": "d"}},
+        }
+    return {
+        "name": "benchmark",
+        "uuid": "pipeline-uuid",
+        "settings": {},
+        "parameters": {},
+        "services": {},
+        "steps": steps,
+    }
+
+
+def _time(f: Callable[[], Any], repeat: int) -> float:
+    """Returns the best time, in milliseconds, out of `repeat` calls."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        f()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def _benchmark(n_steps: int, max_parents: int, repeat: int) -> List[str]:
+    definition = _generate_pipeline_definition(n_steps, max_parents, seed=n_steps)
+    pipeline = Pipeline.from_json(definition)
+    uuids = list(definition["steps"])
+    selection = uuids[::2]
+
+    def get_all_steps():
+        for uuid in uuids:
+            pipeline.get_step(uuid)
+
+    def topological_order():
+        # Reset the order cached by the pipeline.
+        pipeline.steps = pipeline.steps
+        pipeline.get_topological_order()
+
+    timings = {
+        "from_json": lambda: Pipeline.from_json(definition),
+        "get_step (all)": get_all_steps,
+        "selection": lambda: construct_pipeline(selection, "selection", definition),
+        "incoming": lambda: construct_pipeline(uuids[-10:], "incoming", definition),
+        "topological order": topological_order,
+    }
+    return [
+        f"{n_steps:>6} {name:<20} {_time(f, repeat):>10.2f} ms"
+        for name, f in timings.items()
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--steps", type=int, nargs="+", default=[1000, 2000, 5000])
+    parser.add_argument(
+        "--max-parents",
+        type=int,
+        default=3,
+        help="Maximum number of incoming connections of a step.",
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'steps':>6} {'operation':<20} {'time':>13}")
+    for n_steps in args.steps:
+        for line in _benchmark(n_steps, args.max_parents, args.repeat):
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
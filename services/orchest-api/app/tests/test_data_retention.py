@@ -0,0 +1,51 @@
+import json
+import os
+
+import pytest
+
+from app.core import data_retention
+from app.core.pipelines import Pipeline
+
+
+@pytest.fixture
+def pipeline():
+    with open("tests/input_operations/pipeline.json", "r") as f:
+        description = json.load(f)
+
+    return Pipeline.from_json(description)
+
+
+def _output(data_dir, step_uuid, size, mtime):
+    step_dir = os.path.join(data_dir, step_uuid)
+    os.makedirs(step_dir)
+    with open(os.path.join(step_dir, step_uuid), "wb") as f:
+        f.write(b"0" * size)
+    head = os.path.join(step_dir, "HEAD")
+    with open(head, "w") as f:
+        f.write("metadata")
+    os.utime(head, (mtime, mtime))
+
+
+def test_remove_consumed_outputs(pipeline, tmp_path):
+    for i in range(1, 7):
+        _output(str(tmp_path), f"uuid-{i}", 10, i)
+
+    data_retention.remove_consumed_outputs(str(tmp_path), pipeline)
+
+    # Only the outputs of steps without children are kept.
+    assert sorted(os.listdir(tmp_path)) == ["uuid-3", "uuid-5", "uuid-6"]
+
+
+def test_enforce_max_bytes(tmp_path):
+    for i in range(1, 4):
+        # HEAD files are 8 bytes.
+        _output(str(tmp_path), f"uuid-{i}", 92, i)
+
+    data_retention.enforce_max_bytes(str(tmp_path), 250)
+    assert sorted(os.listdir(tmp_path)) == ["uuid-2", "uuid-3"]
+
+    data_retention.enforce_max_bytes(str(tmp_path), 200)
+    assert sorted(os.listdir(tmp_path)) == ["uuid-2", "uuid-3"]
+
+    data_retention.enforce_max_bytes(str(tmp_path), 0)
+    assert os.listdir(tmp_path) == []
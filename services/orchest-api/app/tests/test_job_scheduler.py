@@ -0,0 +1,58 @@
+import datetime
+from types import SimpleNamespace
+
+import pytest
+
+from app.core import job_scheduler
+
+_NOW = datetime.datetime(2022, 1, 1, 14, 0, 30, tzinfo=datetime.timezone.utc)
+_DOWN_SINCE = datetime.datetime(2022, 1, 1, 12, 0, tzinfo=datetime.timezone.utc)
+
+
+def _job(policy, schedule="* * * * *", next_scheduled_time=_DOWN_SINCE):
+    return SimpleNamespace(
+        uuid="job-uuid",
+        schedule=schedule,
+        catch_up_policy=policy,
+        next_scheduled_time=next_scheduled_time,
+    )
+
+
+def test_get_fire_times():
+    fire_times, next_fire_time = job_scheduler.get_fire_times(
+        "* * * * *", _DOWN_SINCE, _NOW
+    )
+    assert len(fire_times) == 121
+    assert fire_times[0] == _DOWN_SINCE
+    assert fire_times[-1] == _NOW.replace(second=0)
+    assert next_fire_time == _NOW.replace(minute=1, second=0)
+
+
+@pytest.mark.parametrize(
+    "policy, expected_executions",
+    [("all", 121), ("coalesce", 1), ("skip", 1)],
+)
+def test_catch_up_policies(policy, expected_executions):
+    job = _job(policy)
+    executions, _ = job_scheduler._get_executions(job, _NOW)
+
+    assert executions == expected_executions
+    assert job.next_scheduled_time == _NOW.replace(minute=1, second=0)
+
+
+def test_skip_policy_skips_late_runs():
+    job = _job("skip", schedule="0 * * * *")
+    executions, _ = job_scheduler._get_executions(
+        job, _NOW + datetime.timedelta(minutes=5)
+    )
+
+    assert executions == 0
+    assert job.next_scheduled_time == _NOW.replace(hour=15, second=0)
+
+
+def test_all_policy_is_capped(monkeypatch):
+    monkeypatch.setattr(job_scheduler.CONFIG_CLASS, "JOB_CATCH_UP_MAX_EXECUTIONS", 10)
+    executions, last_scheduled_time = job_scheduler._get_executions(_job("all"), _NOW)
+
+    assert executions == 10
+    assert last_scheduled_time == _NOW.replace(second=0)
@@ -65,6 +65,34 @@ def test_pipeline_sentinel(pipeline):
     case.assertCountEqual(pipeline.sentinel._children, correct_children)
 
 
+def test_pipeline_get_step(pipeline):
+    assert pipeline.get_step("uuid-4").properties["name"] == "step-4"
+
+    with pytest.raises(ValueError):
+        pipeline.get_step("uuid-7")
+
+    subgraph = pipeline.get_induced_subgraph(["uuid-2", "uuid-4"])
+    assert subgraph.get_step("uuid-4").parents == [subgraph.get_step("uuid-2")]
+    with pytest.raises(ValueError):
+        subgraph.get_step("uuid-1")
+
+
+def test_pipeline_topological_order(pipeline):
+    order = [step.properties["uuid"] for step in pipeline.get_topological_order()]
+
+    assert sorted(order) == [f"uuid-{i}" for i in range(1, 7)]
+    for step in pipeline.steps:
+        for parent in step.parents:
+            assert order.index(parent.properties["uuid"]) < order.index(
+                step.properties["uuid"]
+            )
+
+    # Connections to steps outside of the pipeline are ignored.
+    incoming = pipeline.incoming(["uuid-3"], inclusive=True)
+    order = [step.properties["uuid"] for step in incoming.get_topological_order()]
+    assert order == ["uuid-1", "uuid-2", "uuid-3"]
+
+
 def test_pipeline_get_induced_subgraph(pipeline):
     subgraph = pipeline.get_induced_subgraph(["uuid-2", "uuid-4", "uuid-6"])
     steps = {step.properties["name"]: step for step in subgraph.steps}
@@ -0,0 +1,25 @@
+import json
+
+import pytest
+
+from app.core import pipeline_runs
+from app.core.pipelines import Pipeline
+
+
+@pytest.mark.parametrize(
+    "size, expected",
+    [
+        ("1GB", 10**9),
+        ("1.5 MB", 1500000),
+        ("100KB", 100000),
+        ("1TB", None),
+        (None, None),
+    ],
+)
+def test_get_memory_store_size_limit(size, expected):
+    with open("tests/input_operations/pipeline.json", "r") as f:
+        description = json.load(f)
+    description["settings"] = {"data_passing_memory_size": size}
+
+    pipeline = Pipeline.from_json(description)
+    assert pipeline_runs._get_memory_store_size_limit(pipeline) == expected
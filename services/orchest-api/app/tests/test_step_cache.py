@@ -0,0 +1,95 @@
+import json
+
+import pytest
+
+from app.core import step_cache
+from app.core.pipelines import Pipeline
+
+
+@pytest.fixture
+def description(tmp_path):
+    with open("tests/input_operations/pipeline.json", "r") as f:
+        description = json.load(f)
+
+    for step_uuid, step in description["steps"].items():
+        step["file_path"] = f"{step_uuid}.py"
+        step["environment"] = "env-uuid"
+        (tmp_path / step["file_path"]).write_text(f"print('{step_uuid}')")
+    return description
+
+
+@pytest.fixture
+def run_config(tmp_path):
+    return {
+        "env_uuid_to_image": {"env-uuid": "image:1"},
+        "pipeline_path": "pipeline.orchest",
+        "project_dir": str(tmp_path),
+        "session_type": "interactive",
+        "user_env_variables": {},
+    }
+
+
+def _get_fingerprints(description, run_config, step_uuids=None):
+    incoming_connections = {
+        step_uuid: step["incoming_connections"]
+        for step_uuid, step in description["steps"].items()
+    }
+    pipeline = Pipeline.from_json(description)
+    if step_uuids is not None:
+        pipeline = pipeline.get_induced_subgraph(step_uuids)
+    return step_cache.get_fingerprints(pipeline, run_config, incoming_connections)
+
+
+def test_get_fingerprints(description, run_config, tmp_path):
+    fingerprints = _get_fingerprints(description, run_config)
+    assert sorted(fingerprints) == [f"uuid-{i}" for i in range(1, 7)]
+    assert fingerprints == _get_fingerprints(description, run_config)
+
+    # A change to a step changes the fingerprints of its descendants.
+    (tmp_path / "uuid-4.py").write_text("print('changed')")
+    changed = _get_fingerprints(description, run_config)
+    assert {
+        step_uuid
+        for step_uuid in fingerprints
+        if fingerprints[step_uuid] != changed[step_uuid]
+    } == {"uuid-4", "uuid-5"}
+
+    run_config["env_uuid_to_image"]["env-uuid"] = "image:2"
+    changed = _get_fingerprints(description, run_config)
+    assert all(fingerprints[s] != changed[s] for s in fingerprints)
+
+
+def test_get_fingerprints_partial_run(description, run_config):
+    fingerprints = _get_fingerprints(description, run_config)
+
+    # The inputs of steps of which a parent is not part of the run
+    # are unknown.
+    partial = _get_fingerprints(description, run_config, ["uuid-2", "uuid-3", "uuid-6"])
+    assert partial == {"uuid-6": fingerprints["uuid-6"]}
+
+
+def test_is_enabled(description, run_config):
+    pipeline = Pipeline.from_json(description)
+    assert not step_cache.is_enabled(pipeline, run_config)
+
+    pipeline.properties["settings"]["cache_step_outputs"] = True
+    assert step_cache.is_enabled(pipeline, run_config)
+
+    run_config["session_type"] = "noninteractive"
+    assert not step_cache.is_enabled(pipeline, run_config)
+
+
+def test_restore_output(tmp_path):
+    cache_dir = tmp_path / "cache" / "step" / "fingerprint"
+    cache_dir.mkdir(parents=True)
+    (cache_dir / "HEAD").write_text("head")
+    (cache_dir / "step.PICKLE").write_bytes(b"data")
+    data_dir = tmp_path / "data" / "step"
+    data_dir.mkdir(parents=True)
+    (data_dir / "stale").write_text("stale")
+
+    assert step_cache._restore_output(str(cache_dir), str(data_dir))
+    assert sorted(p.name for p in data_dir.iterdir()) == ["HEAD", "step.PICKLE"]
+    assert (data_dir / "step.PICKLE").samefile(cache_dir / "step.PICKLE")
+
+    assert not step_cache._restore_output(str(tmp_path / "missing"), str(data_dir))
@@ -0,0 +1,45 @@
+import pytest
+
+from app.core.notifications.subscription_index import (
+    IndexedSubscriber,
+    SubscriptionIndex,
+)
+
+_EVENT = "project:one-off-job:started"
+_A = IndexedSubscriber("a", "webhook", False)
+_B = IndexedSubscriber("b", "webhook", False)
+_C = IndexedSubscriber("c", "analytics", True)
+
+
+@pytest.fixture
+def index():
+    return SubscriptionIndex(
+        1,
+        {
+            (_EVENT, None, None): [_C],
+            (_EVENT, "project", None): [_A, _B],
+            (_EVENT, "project", "job"): [_B],
+        },
+        telemetry_disabled=False,
+    )
+
+
+@pytest.mark.parametrize(
+    "project_uuid, job_uuid, expected",
+    [
+        (None, None, {"c"}),
+        ("project", None, {"a", "b", "c"}),
+        ("project", "job", {"a", "b", "c"}),
+        ("other-project", None, {"c"}),
+    ],
+)
+def test_get_subscribers(index, project_uuid, job_uuid, expected):
+    subscribers = index.get_subscribers(_EVENT, project_uuid, job_uuid)
+
+    assert len(subscribers) == len(expected)
+    assert {sub.uuid for sub in subscribers} == expected
+
+
+def test_get_subscribers_requires_project(index):
+    with pytest.raises(ValueError):
+        index.get_subscribers(_EVENT, job_uuid="job")
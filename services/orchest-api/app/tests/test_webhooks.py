@@ -0,0 +1,61 @@
+import hashlib
+import hmac
+import json
+
+import requests
+
+from app import errors, models
+from app.core.notifications import webhooks
+
+
+def _request(delivery_uuid):
+    request = requests.Request("POST", "http://webhook.local").prepare()
+    request.headers["X-Orchest-Delivery"] = delivery_uuid
+    return request
+
+
+def test_send_in_order_stops_at_failure(monkeypatch):
+    sent = []
+
+    def send(request, verify_ssl):
+        sent.append(request.headers["X-Orchest-Delivery"])
+        if len(sent) == 2:
+            raise errors.DeliveryFailed("Failed to deliver: 500.")
+
+    monkeypatch.setattr(webhooks, "_send", send)
+
+    results = webhooks._send_in_order([_request(str(i)) for i in range(4)], True)
+
+    assert sent == ["0", "1"]
+    assert results[0] is None
+    assert all(isinstance(e, errors.DeliveryFailed) for e in results[1:])
+
+
+def test_prepare_batch_request():
+    webhook = models.Webhook(
+        uuid="webhook-uuid",
+        type="webhook",
+        url="http://webhook.local/events",
+        name="webhook",
+        verify_ssl=True,
+        secret="secret",
+        content_type=models.Webhook.ContentType.JSON.value,
+        batch_size=10,
+    )
+    deliveries = [
+        models.Delivery(
+            uuid=str(i), notification_payload={"type": "project:created", "uuid": i}
+        )
+        for i in range(3)
+    ]
+
+    request = webhooks._prepare_batch_request(deliveries, webhook)
+
+    payload = json.loads(request.body)
+    assert [p["event"]["uuid"] for p in payload] == [0, 1, 2]
+    assert all("url" not in p["delivered_for"] for p in payload)
+    assert request.headers["X-Orchest-Event"] == "batch"
+    assert (
+        request.headers["X-Hub-Signature"]
+        == hmac.new(b"secret", request.body, hashlib.sha256).hexdigest()
+    )
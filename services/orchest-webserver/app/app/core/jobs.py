@@ -12,6 +12,7 @@ from werkzeug.utils import safe_join
 import app.utils as utils
 from _orchest.internals import analytics
 from _orchest.internals import config as _config
+from _orchest.internals import snapshot_store
 from _orchest.internals import utils as _utils
 from app import error
 from app.config import CONFIG_CLASS as config
@@ -362,7 +363,7 @@ def create_job_directory(job_uuid: str, pipeline_uuid: str, project_uuid: str) -
         utils.project_uuid_to_path(project_uuid),
     )
 
-    _utils.copytree(project_dir, snapshot_path, use_gitignore=True)
+    snapshot_store.create_snapshot(project_dir, snapshot_path, use_gitignore=True)
     return _create_snapshot_record_for_job(job_uuid, pipeline_uuid, project_uuid)
 
 
@@ -381,6 +382,8 @@ def remove_job_directory(
 
     if os.path.isdir(job_path):
         _utils.rmtree(job_path, ignore_errors=True)
+        # Removes the files that were only part of this job's snapshot.
+        snapshot_store.collect_garbage()
 
     # Clean up parent directory if this job removal created empty
     # directories.
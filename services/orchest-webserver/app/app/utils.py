@@ -14,6 +14,7 @@ from werkzeug.utils import safe_join
 
 from _orchest.internals import compat as _compat
 from _orchest.internals import config as _config
+from _orchest.internals import snapshot_store
 from _orchest.internals import utils as _utils
 from _orchest.internals.utils import is_services_definition_valid, rmtree
 from app import error
@@ -489,6 +490,7 @@ def remove_project_jobs_directories(project_uuid):
 
     if os.path.isdir(project_jobs_path):
         rmtree(project_jobs_path, ignore_errors=True)
+        snapshot_store.collect_garbage()
 
 
 def get_ipynb_template(language: str):
@@ -42,7 +42,7 @@ export const SystemStatusIcon = ({
         value={animate ? undefined : 70}
       />
     );
-  } else if (status === "SUCCESS") {
+  } else if (status === "SUCCESS" || status === "CACHED") {
     return <CheckCircleOutlineOutlined fontSize={size} color="success" />;
   } else if (status === "ABORTED") {
     return <BlockOutlined fontSize={size} color="warning" />;
@@ -168,4 +168,4 @@ export const createStepRunStates = (run: PipelineRun) =>
   );
 
 const hasStepRunEnded = (status: PipelineStepStatus) =>
-  status === "FAILURE" || status === "SUCCESS";
+  status === "FAILURE" || status === "SUCCESS" || status === "CACHED";
@@ -39,6 +39,7 @@ export type NotificationSubscriber =
       name: string;
       verify_ssl: boolean;
       content_type: ContentType;
+      batch_size: number;
       secret: string;
     })
   | (NotificationSubscriberBase & {
@@ -263,6 +263,7 @@ export type PipelineStepStatus =
   | "IDLE"
   | "STARTED"
   | "SUCCESS"
+  | "CACHED"
   | "FAILURE"
   | "ABORTED"
   | "PENDING";
@@ -282,6 +283,7 @@ export type PipelineRunStep = {
   status: PipelineStepStatus;
   started_time: string;
   finished_time: string;
+  fingerprint?: string;
 };
 
 export type PipelineRunStatus =
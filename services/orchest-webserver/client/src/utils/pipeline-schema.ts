@@ -32,6 +32,12 @@ export const pipelineSchema = {
         max_steps_parallelism: {
           type: "integer",
         },
+        data_retention_keep_last_n: {
+          type: "integer",
+        },
+        data_retention_max_bytes: {
+          type: "integer",
+        },
       },
       type: "object",
     },
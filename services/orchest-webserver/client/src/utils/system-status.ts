@@ -16,6 +16,7 @@ export type SystemStatus =
   | "PAUSED"
   | "ABORTED"
   | "SUCCESS"
+  | "CACHED"
   | "SCHEDULED"
   | "FAILURE";
 
@@ -24,7 +25,10 @@ export type StatusFlavor = "job" | "pipeline" | "build";
 export const isRunning = (status: SystemStatus) => status === "STARTED";
 
 export const hasEnded = (status: SystemStatus) =>
-  status === "ABORTED" || status === "SUCCESS" || status === "FAILURE";
+  status === "ABORTED" ||
+  status === "SUCCESS" ||
+  status === "CACHED" ||
+  status === "FAILURE";
 
 export const statusTitle = (status: SystemStatus, flavor: StatusFlavor) => {
   if (status === "IDLE") {
@@ -60,6 +64,7 @@ export const statusColor = (status: SystemStatus | undefined) => {
     case "FAILURE":
       return red["700"];
     case "SUCCESS":
+    case "CACHED":
       return green["800"];
     default:
       return grey["600"];